@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+
+"""
+Report the memory used per recorded event by the traces of the tasks, the
+processors and the scheduler (typed columns), and by the former monitors
+storing a [date, event] record and an event object per event, with the
+JobEvent, ProcEvent and SchedulerEvent classes using __slots__ or a dict.
+
+Usage: benchmark_event_memory.py [duration_ms]
+"""
+
+import os
+import sys
+import tracemalloc
+
+# Use the SimSo of this source tree, even if it is not installed.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+
+from simso.core.Trace import Trace
+from simso.core import Model
+from simso.configuration import Configuration
+
+
+def configuration(duration):
+    conf = Configuration()
+    conf.duration = duration * conf.cycles_per_ms
+    for i, (period, wcet) in enumerate([(7, 3), (12, 3), (20, 5), (25, 4),
+                                        (40, 9), (10, 2), (8, 2)]):
+        conf.add_task(name="T{}".format(i + 1), identifier=i + 1,
+                      period=period, activation_date=0, wcet=wcet,
+                      deadline=period)
+    for i in range(2):
+        conf.add_processor(name="CPU {}".format(i + 1), identifier=i + 1)
+    conf.scheduler_info.clas = "simso.schedulers.RM"
+    conf.check_all()
+    return conf
+
+
+def traces(model):
+    return ([task.monitor for task in model.task_list] +
+            [proc.monitor for proc in model.processors] +
+            [model.scheduler.monitor])
+
+
+def recorded_events(model):
+    events = []
+    for trace in traces(model):
+        events.extend(trace)
+    return events
+
+
+def trace_bytes_per_event(model):
+    size = 0
+    count = 0
+    for trace in traces(model):
+        size += sum(sys.getsizeof(getattr(trace, '_' + name))
+                    for name, _ in Trace.COLUMNS)
+        size += sys.getsizeof(trace.payloads)
+        count += len(trace)
+    return size / count
+
+
+def slots(cls):
+    return [name for klass in cls.__mro__
+            for name in getattr(klass, '__slots__', ())]
+
+
+def with_dict(cls, cache={}):
+    """
+    Subclass of `cls` with a __dict__, like the classes without __slots__.
+    """
+    if cls not in cache:
+        cache[cls] = type(cls.__name__, (cls,), {})
+    return cache[cls]
+
+
+def bytes_per_event(events, make_class):
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    copies = []
+    for date, evt in events:
+        copy = object.__new__(make_class(type(evt)))
+        for name in slots(type(evt)):
+            if hasattr(evt, name):
+                setattr(copy, name, getattr(evt, name))
+        copies.append([date, copy])
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return size / len(copies)
+
+
+def main(argv):
+    duration = int(argv[1]) if len(argv) > 1 else 1000
+    model = Model(configuration(duration))
+    model.run_model()
+    events = recorded_events(model)
+
+    with_dicts = bytes_per_event(events, with_dict)
+    with_slots = bytes_per_event(events, lambda cls: cls)
+    print("{} recorded events".format(len(events)))
+    print("monitor, dict-backed events: {:.1f} bytes/event"
+          .format(with_dicts))
+    print("monitor, __slots__ events:   {:.1f} bytes/event"
+          .format(with_slots))
+    print("trace columns:               {:.1f} bytes/event"
+          .format(trace_bytes_per_event(model)))
+
+main(sys.argv)
@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+
+"""
+Compare the events per second of the discrete-event kernels of SimSo on the
+same configurations.
+
+Usage: benchmark_kernels.py [duration_ms]
+"""
+
+import os
+import sys
+import time
+
+# Use the SimSo of this source tree, even if it is not installed.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+
+from simso.core import Model
+from simso.core.kernel import kernels
+from simso.configuration import Configuration
+from simso.generator.task_generator import gen_randfixedsum, \
+    gen_periods_discrete, gen_tasksets
+
+SCHEDULERS = ["simso.schedulers.RM", "simso.schedulers.G_FL",
+              "simso.schedulers.P_EDF"]
+PROCESSORS = [1, 4, 16]
+
+
+def configuration(scheduler, n_proc, duration):
+    n_tasks = 3 * n_proc + 1
+    utilizations = gen_randfixedsum(1, 0.75 * n_proc, n_tasks)
+    periods = gen_periods_discrete(n_tasks, 1, [5, 8, 10, 20, 25, 40])
+    taskset = gen_tasksets(utilizations, periods)[0]
+
+    conf = Configuration()
+    conf.duration = duration * conf.cycles_per_ms
+    for i, (wcet, period) in enumerate(taskset):
+        conf.add_task(name="T{}".format(i), identifier=i + 1, period=period,
+                      activation_date=0, wcet=wcet, deadline=period)
+    for i in range(n_proc):
+        conf.add_processor(name="CPU {}".format(i), identifier=i + 1)
+    conf.scheduler_info.clas = scheduler
+    conf.check_all()
+    return conf
+
+
+def run(conf, kernel):
+    """
+    Return the number of events executed and the events per second. The
+    rate is measured between the first and the last progress callbacks so
+    that the computation of the results is not taken into account.
+    """
+    ticks = []
+
+    def on_tick(_):
+        ticks.append((model.kernel.event_count, time.perf_counter()))
+
+    model = Model(conf, callback=on_tick, kernel=kernel)
+    model.run_model()
+    (first_count, first_time), (last_count, last_time) = ticks[0], ticks[-1]
+    return (model.kernel.event_count,
+            (last_count - first_count) / (last_time - first_time))
+
+
+def main(argv):
+    duration = int(argv[1]) if len(argv) > 1 else 1000
+
+    print("{:<24}{:>6}{:>10}".format("scheduler", "procs", "events") +
+          "".join("{:>14}".format(name) for name in kernels))
+    for scheduler in SCHEDULERS:
+        for n_proc in PROCESSORS:
+            conf = configuration(scheduler, n_proc, duration)
+            rates = []
+            for kernel in kernels:
+                count, rate = run(conf, kernel)
+                rates.append(rate)
+            print("{:<24}{:>6}{:>10}".format(scheduler, n_proc, count) +
+                  "".join("{:>12.0f}/s".format(rate) for rate in rates))
+
+main(sys.argv)
@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+
+"""
+Time the post-processing of a simulation with many tasks: the analysis done
+by Results and the iteration over Results.tasks_event, compared with the
+former merge that scanned every task for each event.
+
+Usage: benchmark_results.py [n_tasks [duration_s [n_proc]]]
+
+The default is a 1000-task, 1-hour simulated run on 8 processors (the
+simulation itself takes several minutes). The former merge being far too
+slow at that scale, it is only timed on the first events.
+"""
+
+import os
+import sys
+import time
+from itertools import islice
+
+# Use the SimSo of this source tree, even if it is not installed.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+
+from simso.core import Model
+from simso.configuration import Configuration
+from simso.generator.task_generator import gen_randfixedsum, \
+    gen_periods_loguniform, gen_tasksets
+
+
+SCAN_EVENTS = 20000
+
+
+def configuration(n_tasks, duration, n_proc):
+    utilizations = gen_randfixedsum(1, 0.7 * n_proc, n_tasks)
+    periods = gen_periods_loguniform(n_tasks, 1, 1000, 10000, True)
+    taskset = gen_tasksets(utilizations, periods)[0]
+
+    conf = Configuration()
+    conf.cycles_per_ms = 1000
+    conf.duration = duration * 1000 * conf.cycles_per_ms
+    for i, (wcet, period) in enumerate(taskset):
+        conf.add_task(name="T{}".format(i), identifier=i + 1, period=period,
+                      activation_date=0, wcet=wcet, deadline=period)
+    for i in range(n_proc):
+        conf.add_processor(name="CPU {}".format(i), identifier=i + 1)
+    conf.scheduler_info.clas = "simso.schedulers.RM"
+    conf.check_all()
+    return conf
+
+
+def scan_tasks_event(model):
+    """
+    The former Results.tasks_event: O(tasks) per event.
+    """
+    monitors = {}
+    indices = {}
+    for task in model.task_list:
+        monitors[task] = task.monitor
+        indices[task] = 0
+
+    while True:
+        m = None
+        for task in model.task_list:
+            if indices[task] < len(monitors[task]):
+                evt = monitors[task][indices[task]]
+                if m is None or evt[1].id_ < m[0][1].id_:
+                    m = (evt, task)
+        if m is None:
+            break
+        indices[m[1]] += 1
+        yield m
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(argv):
+    n_tasks = int(argv[1]) if len(argv) > 1 else 1000
+    duration = float(argv[2]) if len(argv) > 2 else 3600
+    n_proc = int(argv[3]) if len(argv) > 3 else 8
+
+    model = Model(configuration(n_tasks, duration, n_proc))
+    print("simulation + results: {:.2f}s".format(timed(model.run_model)))
+    results = model.results
+    n_events = sum(len(task.monitor) for task in model.task_list)
+    print("{} tasks, {} job events".format(n_tasks, n_events))
+
+    def analyze():
+        results.observation_window = results.observation_window
+    print("results analysis:     {:.2f}s".format(timed(analyze)))
+    elapsed = timed(lambda: sum(1 for _ in results.tasks_event()))
+    print("tasks_event (heap):   {:.2f}s, {:.1f}us/event".format(
+        elapsed, elapsed / n_events * 1e6))
+    n_scan = min(n_events, SCAN_EVENTS)
+    elapsed = timed(lambda: sum(1 for _ in islice(scan_tasks_event(model),
+                                                  n_scan)))
+    print("tasks_event (scan):   {:.2f}s estimated, {:.1f}us/event "
+          "(first {} events)".format(elapsed / n_scan * n_events,
+                                     elapsed / n_scan * 1e6, n_scan))
+
+main(sys.argv)
@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+
+"""
+Check that the results extrapolated in steady state mode (the summary, the
+totals and the load read on Results) are those of the full simulation, for
+stateless and for stateful schedulers. The steady state must be detected
+for the first ones; it must either not be detected or give the same results
+for the others.
+
+Usage: check_steady_state.py [duration_ms]
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+# Use the SimSo of this source tree, even if it is not installed.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+from simso.core import Model
+from simso.configuration import Configuration
+
+TASKS = [(2, 10), (3, 15), (5, 20), (4, 30), (6, 40)]
+CHECKS = [("simso.schedulers.RM", 2, True),
+          ("simso.schedulers.EDF_mono", 1, True),
+          ("simso.schedulers.G_FL", 2, True),
+          ("simso.schedulers.P_RM", 2, True),
+          ("simso.schedulers.BF", 1, False),
+          ("simso.schedulers.BF", 2, False),
+          ("simso.schedulers.PD2", 2, False)]
+
+
+def configuration(scheduler, n_proc, duration):
+    conf = Configuration()
+    conf.duration = duration * conf.cycles_per_ms
+    scale = n_proc * 1.2
+    for i, (wcet, period) in enumerate(TASKS):
+        conf.add_task(name="T{}".format(i), identifier=i + 1, period=period,
+                      activation_date=0, wcet=wcet * scale, deadline=period,
+                      abort_on_miss=True)
+    for i in range(n_proc):
+        conf.add_processor(name="CPU {}".format(i), identifier=i + 1)
+    conf.scheduler_info.clas = scheduler
+    conf.check_all()
+    return conf
+
+
+def metrics(conf, **kwargs):
+    model = Model(conf, **kwargs)
+    # Some schedulers print their decisions.
+    with contextlib.redirect_stdout(io.StringIO()):
+        model.run_model()
+    results = model.results
+    detected = results.steady_state is not None
+    totals = (results.total_migrations, results.total_preemptions,
+              results.total_task_migrations, results.total_task_resumptions,
+              results.total_exceeded_count, results.total_timers,
+              [(proc.identifier, load, overhead)
+               for proc, load, overhead in results.calc_load()])
+    return (results.summary().to_dict(), totals), detected
+
+
+def main(argv):
+    duration = int(argv[1]) if len(argv) > 1 else 2000
+    failures = 0
+    for scheduler, n_proc, expected in CHECKS:
+        conf = configuration(scheduler, n_proc, duration)
+        reference, _ = metrics(conf)
+        for streaming in (False, True):
+            result, detected = metrics(conf, steady_state=True,
+                                       streaming=streaming)
+            ok = result == reference and (detected or not expected)
+            failures += not ok
+            print("{:<24} {} cpu(s) streaming={!s:<5} detected={!s:<5} {}"
+                  .format(scheduler, n_proc, streaming, detected,
+                          "ok" if ok else "MISMATCH"))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
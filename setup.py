@@ -17,7 +17,7 @@ setup(
         'Topic :: Scientific/Engineering',
         'Development Status :: 5 - Production/Stable'
     ],
-    packages=find_packages(),
+    packages=find_packages(exclude=['tests', 'tests.*']),
     install_requires=[
         'SimPy==2.3.1',
         'numpy>=1.6'
@@ -0,0 +1,216 @@
+# coding=utf-8
+
+"""
+Run many simulations in parallel, for instance to evaluate schedulers on a
+large number of generated task sets.
+
+The configurations are dispatched by chunks to a pool of worker processes.
+Each run gets its own seed, derived from a base seed and from its rank in
+the batch, so that the results do not depend on the number of workers nor
+on the order in which the runs end. Only a compact summary of the results
+of each run is sent back to the parent process.
+
+Example::
+
+    from simso.batch import run_batch
+
+    for summary in run_batch(configurations, workers=8, timeout=60):
+        if summary.status == 'ok':
+            print(summary.results.total_exceeded_count)
+
+With `stop_on_miss`, the runs stop at the first deadline miss, which is
+enough to compute an acceptance ratio::
+
+    summaries = run_batch(configurations, stop_on_miss=True)
+    ratio = sum(s.status == 'ok' for s in summaries) / len(summaries)
+"""
+
+import copy
+import multiprocessing
+import random
+import signal
+import time
+import traceback
+import numpy
+from simso.configuration import Configuration
+from simso.core import Model
+from simso.core.results import DeadlineMiss
+
+
+class BatchTimeout(Exception):
+    """
+    Raised in a worker when a run exceeds its timeout.
+    """
+    pass
+
+
+class RunSummary(object):
+    """
+    Outcome of a run of a batch. It only contains picklable data:
+
+        - `index`: Rank of the configuration in the batch.
+        - `seed`: Seed used for the run.
+        - `status`: 'ok', 'miss' (a job missed its deadline, with \
+        `stop_on_miss`), 'timeout' or 'error'.
+        - `error`: Traceback of the error, if any.
+        - `elapsed`: Wall-clock duration of the run, in seconds.
+        - `results`: The :class:`ResultsSummary \
+        <simso.core.results.ResultsSummary>` of the run, None if the run \
+        did not succeed.
+        - `deadline_miss`: :meth:`Summary \
+        <simso.core.results.DeadlineMiss.summary>` of the deadline miss \
+        that stopped the run, if any.
+    """
+    def __init__(self, index, seed, status, error=None, elapsed=0.0,
+                 results=None, deadline_miss=None):
+        self.index = index
+        self.seed = seed
+        self.status = status
+        self.error = error
+        self.elapsed = elapsed
+        self.results = results
+        self.deadline_miss = deadline_miss
+
+    def __repr__(self):
+        return "RunSummary(index={}, seed={}, status={!r})".format(
+            self.index, self.seed, self.status)
+
+
+def run_seeds(count, seed=0):
+    """
+    Return the seeds of `count` runs, derived from `seed`.
+    """
+    children = numpy.random.SeedSequence(seed).spawn(count)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def simulate(configuration, seed=None, cache=None, stop_on_miss=False):
+    """
+    Run the simulation of `configuration` and return the
+    :class:`ResultsSummary <simso.core.results.ResultsSummary>` of its
+    results (None if the simulation did not advance).
+
+    Args:
+        - `configuration`: A :class:`Configuration \
+        <simso.configuration.Configuration>` or the name of a configuration \
+        file.
+        - `seed`: Seed of the random number generators, None to leave them \
+        as they are. It is also used as the seed of the configuration, \
+        from which the random streams of the tasks are derived, unless the \
+        configuration has its own seed.
+        - `cache`: A :class:`ResultCache <simso.cache.ResultCache>` where \
+        the summary is looked up before running the simulation and stored \
+        after.
+        - `stop_on_miss`: If True, the simulation stops at the first \
+        deadline miss and its :class:`DeadlineMiss \
+        <simso.core.results.DeadlineMiss>` is returned instead. The cache \
+        is then not used.
+    """
+    if not isinstance(configuration, Configuration):
+        configuration = Configuration(configuration)
+    if stop_on_miss:
+        cache = None
+    if seed is not None and configuration.seed is None:
+        configuration = copy.copy(configuration)
+        configuration.seed = seed
+    if cache is not None:
+        key = cache.key(configuration, seed)
+        results = cache.get(key)
+        if results is not None:
+            return results
+    if seed is not None:
+        random.seed(seed)
+        numpy.random.seed(seed)
+    model = Model(configuration, streaming=True, stop_on_miss=stop_on_miss)
+    miss = model.run_model()
+    if miss is not None:
+        return miss
+    results = model.results.summary() if model.results else None
+    if cache is not None and results is not None:
+        cache.put(key, results)
+    return results
+
+
+def _on_alarm(signum, frame):
+    raise BatchTimeout()
+
+
+def _run(job):
+    """
+    Run a simulation in a worker and return its RunSummary.
+    """
+    index, configuration, seed, timeout, cache, stop_on_miss = job
+    start = time.perf_counter()
+    if timeout:
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        results = simulate(configuration, seed, cache, stop_on_miss)
+        if isinstance(results, DeadlineMiss):
+            return RunSummary(index, seed, 'miss',
+                              elapsed=time.perf_counter() - start,
+                              deadline_miss=results.summary())
+        return RunSummary(index, seed, 'ok',
+                          elapsed=time.perf_counter() - start,
+                          results=results)
+    except BatchTimeout:
+        return RunSummary(index, seed, 'timeout',
+                          elapsed=time.perf_counter() - start)
+    except Exception:
+        return RunSummary(index, seed, 'error', traceback.format_exc(),
+                          elapsed=time.perf_counter() - start)
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def run_batch(configs, workers=None, chunksize=None, timeout=None, seed=0,
+              callback=None, cache=None, stop_on_miss=False):
+    """
+    Run a simulation for each configuration and return the list of their
+    :class:`RunSummary`, in the order of the configurations.
+
+    Args:
+        - `configs`: Sequence of :class:`Configuration \
+        <simso.configuration.Configuration>` objects or of configuration \
+        file names.
+        - `workers`: Number of worker processes (by default, the number of \
+        CPUs). With 1 worker, the simulations run in the calling process.
+        - `chunksize`: Number of configurations sent at once to a worker. \
+        By default, about four chunks per worker.
+        - `timeout`: Maximum duration of a run in seconds (wall-clock), \
+        None for no limit.
+        - `seed`: Base seed from which the seed of each run is derived.
+        - `callback`: Function called with each RunSummary as soon as the \
+        run ends (the runs may end in any order).
+        - `cache`: A :class:`ResultCache <simso.cache.ResultCache>` shared \
+        by the workers: the runs whose configuration and seed were already \
+        simulated are not simulated again.
+        - `stop_on_miss`: If True, each run stops at its first deadline \
+        miss (its status is then 'miss').
+    """
+    configs = list(configs)
+    seeds = run_seeds(len(configs), seed)
+    jobs = [(index, configuration, seeds[index], timeout, cache,
+             stop_on_miss)
+            for index, configuration in enumerate(configs)]
+    workers = workers or multiprocessing.cpu_count()
+    if chunksize is None:
+        chunksize = max(1, len(jobs) // (workers * 4))
+
+    summaries = [None] * len(jobs)
+
+    def collect(summary):
+        summaries[summary.index] = summary
+        if callback:
+            callback(summary)
+
+    if workers == 1:
+        for job in jobs:
+            collect(_run(job))
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            for summary in pool.imap_unordered(_run, jobs, chunksize):
+                collect(summary)
+    return summaries
@@ -0,0 +1,284 @@
+# coding=utf-8
+
+"""
+On-disk cache of the results of simulations.
+
+A result is stored under a key computed from the content of the
+configuration (tasks, processors, caches, scheduler, execution time model,
+duration...), from the content of the files it refers to (scheduler source,
+execution time traces) and from the seed of the run, so that re-running an
+experiment only simulates the configurations that changed. The size of the
+cache is bounded: the least recently used results are evicted first.
+
+Example::
+
+    from simso.cache import ResultCache
+    from simso.batch import run_batch, simulate
+
+    cache = ResultCache("~/.cache/simso")
+    summary = simulate(configuration, seed=1, cache=cache)
+    summaries = run_batch(configurations, cache=cache)
+"""
+
+import hashlib
+import json
+import os
+import types
+from enum import Enum
+import numpy
+import simso
+from simso.core.Caches import Cache
+from simso.core.results import ResultsSummary
+
+
+# Estimated size of the cache directories in this process: directory ->
+# [size in bytes, number of results stored since the last scan].
+_sizes = {}
+
+# Attributes that are derived from other ones or only used by the editor.
+_IGNORED_ATTRIBUTES = {'_csdp', '_stack_file', 'shared_with',
+                       'fields_types'}
+
+
+def _sorted(values):
+    return sorted(values, key=lambda x: json.dumps(x, sort_keys=True))
+
+
+def _describe(obj):
+    return {'class': _canonical(type(obj)),
+            'attributes': dict((k, _canonical(v))
+                               for k, v in vars(obj).items()
+                               if k not in _IGNORED_ATTRIBUTES)}
+
+
+def _canonical(value):
+    """
+    Return a representation of `value` made of JSON types only, that does
+    not depend on the identity of the objects.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Enum):
+        return "{}.{}".format(type(value).__name__, value.name)
+    if isinstance(value, numpy.generic):
+        return value.item()
+    if isinstance(value, numpy.ndarray):
+        return value.tolist()
+    if isinstance(value, dict):
+        return _sorted([_canonical(k), _canonical(v)]
+                       for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return [_canonical(x) for x in value]
+    if isinstance(value, (set, frozenset)):
+        return _sorted(_canonical(x) for x in value)
+    if isinstance(value, (type, types.FunctionType)):
+        return "{}.{}".format(value.__module__, value.__qualname__)
+    if isinstance(value, Cache):
+        # The caches are described once in the list of the caches.
+        return {'cache': value.identifier}
+    return _describe(value)
+
+
+def _file_digest(filename):
+    """
+    Digest of the content of `filename`, None if it cannot be read.
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except IOError:
+        return None
+    return digest.hexdigest()
+
+
+def _scheduler(scheduler_info):
+    description = _describe(scheduler_info)
+    if scheduler_info.filename and not scheduler_info.clas:
+        # The scheduler is defined by the content of its file.
+        source = _file_digest(scheduler_info.filename)
+        if source is not None:
+            description['source'] = source
+    return description
+
+
+def _traces(task_info_list):
+    """
+    Digests of the files of samples of the tasks using a 'trace'
+    distribution of execution times.
+    """
+    traces = {}
+    for task_info in task_info_list:
+        distribution = getattr(task_info, 'et_distribution', None)
+        if distribution and distribution.get('name') == 'trace':
+            traces[str(task_info.identifier)] = _file_digest(
+                distribution['filename'])
+    return traces
+
+
+def configuration_hash(configuration, seed=None):
+    """
+    Return a hexadecimal digest identifying the simulation of
+    `configuration` with the seed `seed`.
+    """
+    description = {
+        'version': simso.__version__,
+        'seed': _canonical(seed),
+        'etm': configuration.etm,
+        'duration': configuration.duration,
+        'cycles_per_ms': configuration.cycles_per_ms,
+        'memory_access_time': configuration.memory_access_time,
+        'penalty_preemption': configuration.penalty_preemption,
+        'penalty_migration': configuration.penalty_migration,
+        'apriori_et_list': _canonical(
+            getattr(configuration, 'apriori_et_list', [])),
+        'tasks': _canonical(configuration.task_info_list),
+        'processors': _canonical(configuration.proc_info_list),
+        'caches': [_describe(cache) for cache in configuration.caches_list],
+        'scheduler': _scheduler(configuration.scheduler_info)
+    }
+    if configuration.seed is not None:
+        description['configuration_seed'] = configuration.seed
+    traces = _traces(configuration.task_info_list)
+    if traces:
+        description['traces'] = traces
+    data = json.dumps(description, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class ResultCache(object):
+    """
+    Directory of :class:`ResultsSummary
+    <simso.core.results.ResultsSummary>` objects stored as JSON files named
+    after their key. The cache can be shared by several processes.
+
+    The size of the cache is estimated by each process from a scan of the
+    directory and from the size of the results it stores, so that storing a
+    result does not list the whole directory. The directory is scanned
+    again, and the least recently used results evicted, when the estimate
+    exceeds `max_size` or after :attr:`SCAN_INTERVAL` results, to take into
+    account the results stored by the other processes.
+    """
+    # Maximum number of results stored by a process between two scans.
+    SCAN_INTERVAL = 256
+    # Fraction of max_size kept when results are evicted, so that the next
+    # results are stored without scanning the directory again.
+    EVICT_TARGET = 0.9
+
+    def __init__(self, directory, max_size=1 << 30):
+        """
+        Args:
+            - `directory`: Directory of the cache, created if needed.
+            - `max_size`: Maximum size of the cache, in bytes. When it is \
+            exceeded, the least recently used results are removed (the \
+            results stored by the other processes since the last scan may \
+            exceed it temporarily).
+        """
+        self.directory = os.path.expanduser(directory)
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, configuration, seed=None):
+        """
+        Key of the results of `configuration` simulated with `seed`.
+        """
+        return configuration_hash(configuration, seed)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    def get(self, key):
+        """
+        Return the summary stored under `key`, None if there is none.
+        """
+        path = self._path(key)
+        try:
+            summary = ResultsSummary.load_json(path)
+        except (IOError, ValueError, KeyError):
+            return None
+        try:
+            # The modification date is used as the date of last use.
+            os.utime(path)
+        except OSError:
+            pass
+        return summary
+
+    def put(self, key, summary):
+        """
+        Store `summary` under `key`, then evict the least recently used
+        results if the cache is too large.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            summary.save_json(tmp)
+            size = os.path.getsize(tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+        estimate = _sizes.get(self.directory)
+        if estimate is None or estimate[1] >= self.SCAN_INTERVAL:
+            self.evict()
+            return
+        estimate[0] += size
+        estimate[1] += 1
+        if estimate[0] > self.max_size:
+            self.evict()
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def _entries(self):
+        entries = []
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.endswith('.json'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    @property
+    def size(self):
+        """
+        Total size of the stored results, in bytes.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """
+        If the cache is larger than max_size, remove the least recently used
+        results until its size is below EVICT_TARGET * max_size.
+        """
+        entries = self._entries()
+        size = sum(size for _, size, _ in entries)
+        if size > self.max_size:
+            target = self.EVICT_TARGET * self.max_size
+            for _, entry_size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                size -= entry_size
+                if size <= target:
+                    break
+        _sizes[self.directory] = [size, 0]
+
+    def clear(self):
+        """
+        Remove all the stored results.
+        """
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        _sizes[self.directory] = [0, 0]
@@ -10,6 +10,7 @@ from simso.core.Scheduler import SchedulerInfo
 from simso.core import Scheduler
 from simso.core.Task import TaskInfo
 from simso.core.Processor import ProcInfo
+from simso.core.etm.Sampler import samplers, sampler_parameters
 from simso.utils.MixedCriticality import CritLevel
 
 from .GenerateConfiguration import generate
@@ -37,6 +38,11 @@ class Configuration(object):
     The configuration class store all the details about a system. An instance
     of this class will be passed to the constructor of the
     :class:`Model <simso.core.Model.Model>` class.
+
+    If `seed` is not None, the random execution time models draw the
+    execution times of each task from its own `numpy.random.Generator`,
+    derived from this seed (see :mod:`simso.core.etm.Sampler`). Otherwise,
+    they use the global `random` module.
     """
     def __init__(self, filename=None):
         """
@@ -57,6 +63,8 @@ class Configuration(object):
             self._scheduler_info = parser.scheduler_info
             self.penalty_preemption = parser.penalty_preemption
             self.penalty_migration = parser.penalty_migration
+            self.seed = parser.seed
+            self.apriori_et_list = []
         else:
             self.etm = "wcet"
             self.duration = 100000000
@@ -71,6 +79,7 @@ class Configuration(object):
             self.proc_data_fields = {}
             self.memory_access_time = 100
             self._scheduler_info = SchedulerInfo()
+            self.seed = None
         self.calc_penalty_cache()
         self._set_filename(filename)
 
@@ -136,8 +145,13 @@ class Configuration(object):
             "A scheduler is needed."
         assert issubclass(cls, Scheduler), \
             "Must inherits from Scheduler."
-        assert self._scheduler_info.overhead >= 0, \
-            "An overhead must not be negative."
+        for overhead in (self._scheduler_info.overhead,
+                         self._scheduler_info.overhead_activate,
+                         self._scheduler_info.overhead_terminate):
+            assert overhead >= 0, \
+                "An overhead must not be negative."
+            assert float(overhead).is_integer(), \
+                "An overhead must be a whole number of cycles."
 
     def check_processors(self):
         # At least one processor:
@@ -169,6 +183,10 @@ class Configuration(object):
                 "Context Save overhead can't be negative."
             assert proc.cl_overhead >= 0, \
                 "Context Load overhead can't be negative."
+            assert (float(proc.cs_overhead).is_integer() and
+                    float(proc.cl_overhead).is_integer()), \
+                "Context Save and Load overheads must be whole numbers of " \
+                "cycles."
 
     def check_tasks(self):
         assert len(self._task_info_list) > 0, "At least one task is needed."
@@ -217,6 +235,39 @@ class Configuration(object):
                 # stack ok
                 assert task.csdp, "Stack not found or empty."
 
+            if self.etm == "trace":
+                assert (task.et_distribution and
+                        task.et_distribution.get('name') == 'trace'), \
+                    "The task {} has no execution time trace.".format(
+                        task.name)
+
+            if task.et_distribution is not None:
+                self.check_et_distribution(task)
+
+    def check_et_distribution(self, task):
+        distribution = task.et_distribution
+        name = distribution.get('name')
+        assert name in samplers, \
+            "Unknown execution time distribution '{}' for the task {}; " \
+            "supported distributions are: {}.".format(
+                name, task.name, ', '.join(sorted(samplers)))
+
+        accepted, required = sampler_parameters(name)
+        params = set(distribution) - {'name'}
+        assert params <= accepted, \
+            "Unknown parameter(s) {} of the '{}' distribution of the task " \
+            "{}.".format(', '.join(sorted(params - accepted)), name,
+                         task.name)
+        assert required <= params, \
+            "Missing parameter(s) {} of the '{}' distribution of the task " \
+            "{}.".format(', '.join(sorted(required - params)), name,
+                         task.name)
+
+        if name == 'trace':
+            assert os.path.isfile(distribution['filename']), \
+                "Execution time trace '{}' of the task {} not found.".format(
+                    distribution['filename'], task.name)
+
     def check_caches(self):
         for index, cache in enumerate(self._caches_list):
             # Id unique :
@@ -282,7 +333,8 @@ class Configuration(object):
                  abort_on_miss=True, period=10, activation_date=0,
                  n_instr=0, mix=0.5, stack_file="", custom_etm=None, apriori_et=[], wcet=0, acet=0,
                  et_stddev=0, deadline=10, base_cpi=1.0, followed_by=None,
-                 list_activation_dates=[], criticality_level=None, preemption_cost=0, data=None):
+                 list_activation_dates=[], criticality_level=None, preemption_cost=0, data=None,
+                 et_distribution=None):
         """
         Helper method to create a TaskInfo and add it to the list of tasks.
         """
@@ -302,7 +354,7 @@ class Configuration(object):
                         activation_date, n_instr, mix,
                         (stack_file, self.cur_dir), custom_etm, apriori_et, wcet, acet, et_stddev,
                         deadline, base_cpi, followed_by, list_activation_dates,
-                        criticality_level, preemption_cost, data)
+                        criticality_level, preemption_cost, data, et_distribution)
         self.task_info_list.append(task)
         return task
 
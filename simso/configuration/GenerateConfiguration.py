@@ -4,7 +4,9 @@
 from xml.etree.ElementTree import Element, SubElement
 from xml.etree import ElementTree
 from xml.dom import minidom
+import json
 import os
+import numpy
 
 
 def prettify(elem):
@@ -22,6 +24,8 @@ def generate(configuration):
     attrs = {'duration': str(int(configuration.duration)),
              'cycles_per_ms': str(configuration.cycles_per_ms),
              'etm': str(configuration.etm)}
+    if configuration.seed is not None:
+        attrs['seed'] = str(configuration.seed)
     top = Element('simulation', attrs)
 
     generate_sched(configuration, top, configuration.scheduler_info)
@@ -30,7 +34,8 @@ def generate(configuration):
     generate_processors(
         top, configuration.proc_info_list, configuration.proc_data_fields)
     generate_tasks(
-        top, configuration.task_info_list, configuration.task_data_fields)
+        top, configuration.task_info_list, configuration.task_data_fields,
+        configuration.cur_dir)
 
     return prettify(top)
 
@@ -89,7 +94,22 @@ def generate_processors(top, proc_info_list, fields):
             SubElement(processor, 'cache', {'ref': str(cache.identifier)})
 
 
-def generate_tasks(top, task_info_list, fields):
+def generate_et_distribution(distribution, cur_dir):
+    """
+    JSON version of an `et_distribution`, the file of a 'trace' distribution
+    being made relative to the simulation file.
+    """
+    distribution = dict(distribution)
+    for key, value in distribution.items():
+        if isinstance(value, (numpy.ndarray, numpy.generic)):
+            distribution[key] = value.tolist()
+    if distribution.get('filename'):
+        distribution['filename'] = os.path.relpath(distribution['filename'],
+                                                   cur_dir)
+    return json.dumps(distribution, sort_keys=True)
+
+
+def generate_tasks(top, task_info_list, fields, cur_dir=os.curdir):
     tasks = SubElement(top, 'tasks')
 
     for name, ftype in fields.items():
@@ -116,6 +136,11 @@ def generate_tasks(top, task_info_list, fields):
                       'et_stddev': str(task.et_stddev)})
         if task.followed_by is not None:
             attrs['followed_by'] = str(task.followed_by)
+        if task.criticality_level is not None:
+            attrs['criticality_level'] = str(task.criticality_level)
+        if task.et_distribution is not None:
+            attrs['et_distribution'] = generate_et_distribution(
+                task.et_distribution, cur_dir)
         if task.stack_file:
             # XXX: what if the path contain a non-ascii character?
             attrs['stack'] = str(task.stack_file)
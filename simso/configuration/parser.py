@@ -1,11 +1,13 @@
 # coding=utf-8
 
 from xml.dom.minidom import parse
+import json
 import os.path
 from simso.core.Task import TaskInfo, task_types
 from simso.core.Processor import ProcInfo
 from simso.core.Caches import Cache_LRU
 from simso.core.Scheduler import SchedulerInfo
+from simso.utils.MixedCriticality import CritLevel
 
 
 convert_function = {
@@ -34,6 +36,7 @@ class Parser(object):
         self._parse_processors()
         self._parse_scheduler()
         self._parse_penalty()
+        self._parse_seed()
 
     def _parse_caches(self):
         self.caches_list = []
@@ -90,31 +93,53 @@ class Parser(object):
                     map(float, attr['list_activation_dates'].value.split(',')))
 
             t = TaskInfo(
-                attr['name'].value,
-                int(attr['id'].value),
-                task_type,
-                'abort_on_miss' not in attr
+                name=attr['name'].value,
+                identifier=int(attr['id'].value),
+                task_type=task_type,
+                abort_on_miss='abort_on_miss' not in attr
                 or attr['abort_on_miss'].value == 'yes',
-                float(attr['period'].value),
-                float(attr['activationDate'].value)
+                period=float(attr['period'].value),
+                activation_date=float(attr['activationDate'].value)
                 if 'activationDate' in attr else 0,
-                int(attr['instructions'].value),
-                float(attr['mix'].value),
-                (self.cur_dir + '/' + attr['stack'].value,
-                    self.cur_dir) if 'stack' in attr else ("", self.cur_dir),
-                float(attr['WCET'].value),
-                float(attr['ACET'].value) if 'ACET' in attr else 0,
-                float(attr['et_stddev'].value) if 'et_stddev' in attr else 0,
-                float(attr['deadline'].value),
-                float(attr['base_cpi'].value),
-                int(attr['followed_by'].value)
+                n_instr=int(attr['instructions'].value),
+                mix=float(attr['mix'].value),
+                stack_file=(self.cur_dir + '/' + attr['stack'].value,
+                            self.cur_dir)
+                if 'stack' in attr else ("", self.cur_dir),
+                custom_etm=None,
+                apriori_et=[],
+                wcet=float(attr['WCET'].value),
+                acet=float(attr['ACET'].value) if 'ACET' in attr else 0,
+                et_stddev=float(attr['et_stddev'].value)
+                if 'et_stddev' in attr else 0,
+                deadline=float(attr['deadline'].value),
+                base_cpi=float(attr['base_cpi'].value),
+                followed_by=int(attr['followed_by'].value)
                 if 'followed_by' in attr else None,
-                list_activation_dates,
-                int(float(attr['preemption_cost'].value))
+                list_activation_dates=list_activation_dates,
+                criticality_level=CritLevel.from_string(
+                    attr['criticality_level'].value)
+                if 'criticality_level' in attr else None,
+                preemption_cost=int(float(attr['preemption_cost'].value))
                 if 'preemption_cost' in attr else 0,
-                data)
+                data=data,
+                et_distribution=self._parse_et_distribution(attr))
             self.task_info_list.append(t)
 
+    def _parse_et_distribution(self, attr):
+        """
+        The `et_distribution` attribute holds the distribution as a JSON
+        object. The file of a 'trace' distribution is relative to the
+        simulation file.
+        """
+        if 'et_distribution' not in attr:
+            return None
+        distribution = json.loads(attr['et_distribution'].value)
+        filename = distribution.get('filename')
+        if filename and not os.path.isabs(filename):
+            distribution['filename'] = self.cur_dir + '/' + filename
+        return distribution
+
     def _parse_processors(self):
         processors_el = self._dom.getElementsByTagName('processors')[0]
         processors = self._dom.getElementsByTagName('processors')[0]
@@ -201,6 +226,13 @@ class Parser(object):
         else:
             self.penalty_migration = 100000
 
+    def _parse_seed(self):
+        simulation = self._dom.getElementsByTagName('simulation')[0]
+        if 'seed' in simulation.attributes:
+            self.seed = int(simulation.attributes['seed'].value)
+        else:
+            self.seed = None
+
     def _parse_cycles_per_ms(self):
         simulation = self._dom.getElementsByTagName('simulation')[0]
         if 'cycles_per_ms' in simulation.attributes:
@@ -1,6 +1,5 @@
 # coding=utf-8
 
-from SimPy.Simulation import Process, hold, passivate
 from simso.core.JobEvent import JobEvent
 from simso.core.etm.AbstractExecutionTimeModel \
     import MCAbstractExecutionTimeModel
@@ -8,9 +7,21 @@ from simso.core.etm.AbstractExecutionTimeModel \
 from math import (ceil, isclose)
 
 
-class Job(Process):
+# Pending event of a job.
+ACTIVATE = 1
+EXECUTE = 2
+RUN = 3
+
+
+class Job(object):
     """The Job class simulate the behavior of a real Job. This *should* only be
-    instantiated by a Task."""
+    instantiated by a Task.
+
+    A job is not a process: its only pending event (activation, start
+    of execution or end of the current execution slice) is an entry of the
+    :class:`timer service <simso.core.Timer.TimerService>`. The processor
+    running the job orders its execution and interrupts it on preemption.
+    """
 
     def __init__(self, task, name, pred, monitor, etm, sim):
         """
@@ -19,19 +30,23 @@ class Job(Process):
             - `name`: The name for this job.
             - `pred`: If the task is not periodic, pred is the job that \
             released this one.
-            - `monitor`: A monitor is an object that log in time.
+            - `monitor`: The :class:`trace <simso.core.Trace.Trace>` of the \
+            task, in which the events of the job are recorded.
             - `etm`: The execution time model.
             - `sim`: :class:`Model <simso.core.Model>` instance.
 
         :type task: GenericTask
         :type name: str
         :type pred: bool
-        :type monitor: Monitor
+        :type monitor: Trace
         :type etm: AbstractExecutionTimeModel
         :type sim: Model
         """
-        Process.__init__(self, name=name, sim=sim)
+        self.name = name
+        self.sim = sim
         self._task = task
+        # Rank of the job in task.jobs.
+        self._internal_id = task._job_count - 1
         self._pred = pred
         self.instr_count = 0  # Updated by the cache model.
         self._computation_time = 0
@@ -46,10 +61,21 @@ class Job(Process):
         self._sim = sim
         self._monitor = monitor
         self._etm = etm
+        # State of the job kept by the execution time model.
+        self.etm_state = None
         self._was_running_on = task.cpu
 
         self.context_ok = True  # The context is ready to be loaded.
 
+        self.entry = None  # Pending event in the timer service.
+        self._state = None
+        self._interrupted = False
+        self._interrupt_left = 0
+
+    def _record(self, event, cpu=-1):
+        self._monitor.record(event, self._task._internal_id, self._internal_id,
+                             cpu)
+
     def is_active(self):
         """
         Return True if the job is still active.
@@ -57,7 +83,7 @@ class Job(Process):
         return self._end_date is None
 
     def _on_activate(self):
-        self._monitor.observe(JobEvent(self, JobEvent.ACTIVATE))
+        self._record(JobEvent.ACTIVATE)
         self._sim.logger.log(self.name + " Activated.", kernel=True)
         self._etm.on_activate(self)
 
@@ -70,7 +96,7 @@ class Job(Process):
 
         self.cpu.was_running = self
 
-        self._monitor.observe(JobEvent(self, JobEvent.EXECUTE, self.cpu))
+        self._record(JobEvent.EXECUTE, self.cpu.internal_id)
         self._sim.logger.log("{} Executing on {}".format(
             self.name, self._task.cpu.name), kernel=True)
 
@@ -85,29 +111,35 @@ class Job(Process):
         self._is_preempted = True
         self._was_running_on = self.cpu
 
-        self._monitor.observe(JobEvent(self, JobEvent.PREEMPTED))
+        self._record(JobEvent.PREEMPTED)
         self._sim.logger.log(self.name + " Preempted! ret: " +
-                             str(self.interruptLeft), kernel=True)
+                             str(self._interrupt_left), kernel=True)
 
     def _on_terminated(self):
         self._on_stop_exec()
         self._etm.on_terminated(self)
 
         self._end_date = self.sim.now()
-        self._monitor.observe(JobEvent(self, JobEvent.TERMINATED))
+        self._record(JobEvent.TERMINATED)
+        self._task._unwatch_deadline(self)
         self._task.end_job(self)
         self._task.cpu.terminate(self)
         self._sim.logger.log(self.name + " Terminated.", kernel=True)
+        if self._sim._stop_on_miss and self.exceeded_deadline:
+            self._sim.on_deadline_miss(self)
 
     def _on_abort(self):
         self._on_stop_exec()
         self._etm.on_abort(self)
         self._end_date = self.sim.now()
         self._aborted = True
-        self._monitor.observe(JobEvent(self, JobEvent.ABORTED))
+        self._record(JobEvent.ABORTED)
+        self._task._unwatch_deadline(self)
         self._task.end_job(self)
         self._task.cpu.terminate(self)
         self._sim.logger.log("Job " + str(self.name) + " aborted! ret:" + str(self.ret))
+        if self._sim._stop_on_miss:
+            self._sim.on_deadline_miss(self)
 
     def is_running(self):
         """
@@ -124,6 +156,7 @@ class Job(Process):
         the job exceeds its deadline. It has not be tested from outside, such
         as from the scheduler.
         """
+        self._cancel()
         self._on_abort()
 
     @property
@@ -284,44 +317,91 @@ class Job(Process):
         """
         return self._task.deadline
 
+    @property
+    def internal_id(self):
+        """A unique, internal, id: the rank of the job in its task."""
+        return self._internal_id
+
     @property
     def pred(self):
         return self._pred
 
+    def _post(self, state, date=None):
+        """
+        Replace the pending event of the job by `state` at `date` (now by
+        default).
+        """
+        service = self._sim._timer_service
+        if self.entry is not None:
+            service.cancel(self)
+        self._state = state
+        service.arm(self, self._sim.now() if date is None else date)
+
+    def _cancel(self):
+        if self.entry is not None:
+            self._sim._timer_service.cancel(self)
+
+    def _hold(self, delay):
+        assert delay >= 0, "hold: delay time negative: {}".format(delay)
+        self._interrupted = False
+        self._post(RUN, self._sim.now() + delay)
+
+    def _execute(self):
+        """
+        Order to execute the job, sent by the processor.
+        """
+        self._interrupted = False
+        self._post(EXECUTE)
+
+    def _interrupt(self):
+        """
+        Interrupt the execution of the job, sent by the processor. Nothing
+        happens if the job has no pending event.
+        """
+        if self.entry is not None and not self._interrupted:
+            self._interrupt_left = self.entry[0] - self._sim.now()
+            self._interrupted = True
+            self._post(self._state)
+
+    def expire(self):
+        state = self._state
+        self._state = None
+        if state == ACTIVATE:
+            self._start_date = self._sim.now()
+            self._on_activate()
+            # Notify the OS.
+            self._task.cpu.activate(self)
+        elif self._interrupted:
+            self._interrupted = False
+            if state == RUN:
+                self._on_preempted()
+        elif state == EXECUTE:
+            self._on_execute()
+            self._on_run_start()
+        elif state == RUN:
+            # Executed without interruption for the duration of the hold.
+            self._on_run_elapsed()
+
+    def _on_run_start(self):
+        # ret is a duration lower than the remaining execution time.
+        self._run(self._etm.get_ret(self))
+
+    def _on_run_elapsed(self):
+        self._run(self._etm.get_ret(self))
+
+    def _run(self, ret):
+        if ret > 0:
+            self._hold(int(ceil(ret)))
+        else:
+            # End of job.
+            self._on_terminated()
+
     def activate_job(self):
-        self._start_date = self.sim.now()
-        self._on_activate()
-        # Notify the OS.
-        self._task.cpu.activate(self)
-
-        # While the job's execution is not finished.
-        while self._end_date is None:
-            # Wait an execute order.
-            yield passivate, self
-
-            # Execute the job.
-            if not self.interrupted():
-                self._on_execute()
-                # ret is a duration lower than the remaining execution time.
-                ret = self._etm.get_ret(self)
-
-                while ret > 0:
-                    yield hold, self, int(ceil(ret))
-
-                    if not self.interrupted():
-                        # If executed without interruption for ret cycles.
-                        ret = self._etm.get_ret(self)
-                    else:
-                        self._on_preempted()
-                        self.interruptReset()
-                        break
-
-                if ret <= 0:
-                    # End of job.
-                    self._on_terminated()
+        """
+        Release the job. Called by the task once the previous jobs are over.
+        """
+        self._post(ACTIVATE)
 
-            else:
-                self.interruptReset()
 
 class MCJob(Job):
     """
@@ -345,7 +425,7 @@ class MCJob(Job):
         return self._task.wcet_hi
 
     def on_drop(self):
-        self._monitor.observe(JobEvent(self, JobEvent.DROPPED))
+        self._record(JobEvent.DROPPED)
         self._sim.logger.log(self.name + " Dropped.", kernel=False)
 
     def _on_mode_switch(self, crit_level):
@@ -355,7 +435,7 @@ class MCJob(Job):
         for t in self._sim.task_list:
             t.etm.on_mode_switch(self, crit_level)
 
-        self._monitor.observe(JobEvent(self, JobEvent.OVERRUN))
+        self._record(JobEvent.OVERRUN)
         self._sim.logger.log(self.name + " Overrun! C: " + str(self.actual_computation_time) +
                             " ret: " + str(self._etm.get_ret(self) / self._sim.cycles_per_ms),
                             kernel=True)
@@ -364,56 +444,42 @@ class MCJob(Job):
                              str(self.cpu.sched.criticality_mode),
                              kernel=False)
 
-    def activate_job(self):
-        self._start_date = self.sim.now()
-        self._on_activate()
-        # Notify the OS.
-        self._task.cpu.activate(self)
-
-        # While the job's execution is not finished.
-        while self._end_date is None:
-            # Wait an execute order.
-            yield passivate, self
-
-            # Execute the job.
-            if not self.interrupted():
-                self._on_execute()
-                # ret is a duration lower than the remaining execution time.
-                ret = self._etm.get_ret(self)
-                rwcet = self._etm.get_rwcet(self)
-
-                #print(f"EXEC [{self.name}] C = {self.computation_time} ret = {ret / self._sim.cycles_per_ms} rwcet = {rwcet / self._sim.cycles_per_ms}")
-                while ret > 0:
-                    if not self.cpu.sched.has_switched_mode:
-                        closest_event = min(int(ceil(ret)), int(ceil(rwcet)))
-                    else:
-                        closest_event = int(ceil(ret))
-                    yield hold, self, closest_event 
-
-                    if not self.interrupted():
-                        # If executed without interruption for either ret or rwcet cycles.
-                        ret = self._etm.get_ret(self)
-                        rwcet = self._etm.get_rwcet(self)
-
-                        #print(f"REM [{self.name}] C = {self.computation_time} ret = {ret/self._sim.cycles_per_ms} rwcet = {rwcet/self._sim.cycles_per_ms}")
-                        if isclose(ret, 0.0):
-                            print(f"IMP: Job {self.name} has finished its execution...")
-                        elif isclose(rwcet, 0.0) and not self.cpu.sched.has_switched_mode:
-                            print(f"IMP: Job {self.name} has passed C_lo without signaling completion ==> switch to HI mode...")
-                            self._on_mode_switch('HI')
-                            rwcet = self._etm.get_rwcet(self)
-                    else:
-                        if isinstance(self._etm, MCAbstractExecutionTimeModel):
-                            print(f"PREEMPT [{self.name}] C = {self.computation_time} ret = {self._etm.get_ret(self)/self._sim.cycles_per_ms} rwcet = {self._etm.get_rwcet(self)/self._sim.cycles_per_ms}")
-                        self._on_preempted()
-                        self.interruptReset()
-                        break
-
-                if ret <= 0:
-                    # End of job.
-                    if isinstance(self._etm, MCAbstractExecutionTimeModel):
-                        print(f"TERM [{self.name}] C = {self.actual_computation_time} ret = {self._etm.get_ret(self)/self._sim.cycles_per_ms} rwcet = {self._etm.get_rwcet(self)/self._sim.cycles_per_ms}")
-                    self._on_terminated()
-
+    def _on_preempted(self):
+        if isinstance(self._etm, MCAbstractExecutionTimeModel):
+            print(f"PREEMPT [{self.name}] C = {self.computation_time} ret = {self._etm.get_ret(self)/self._sim.cycles_per_ms} rwcet = {self._etm.get_rwcet(self)/self._sim.cycles_per_ms}")
+        Job._on_preempted(self)
+
+    def _on_run_start(self):
+        # ret is a duration lower than the remaining execution time.
+        ret = self._etm.get_ret(self)
+        rwcet = self._etm.get_rwcet(self)
+
+        #print(f"EXEC [{self.name}] C = {self.computation_time} ret = {ret / self._sim.cycles_per_ms} rwcet = {rwcet / self._sim.cycles_per_ms}")
+        self._mc_run(ret, rwcet)
+
+    def _on_run_elapsed(self):
+        # If executed without interruption for either ret or rwcet cycles.
+        ret = self._etm.get_ret(self)
+        rwcet = self._etm.get_rwcet(self)
+
+        #print(f"REM [{self.name}] C = {self.computation_time} ret = {ret/self._sim.cycles_per_ms} rwcet = {rwcet/self._sim.cycles_per_ms}")
+        if isclose(ret, 0.0):
+            print(f"IMP: Job {self.name} has finished its execution...")
+        elif isclose(rwcet, 0.0) and not self.cpu.sched.has_switched_mode:
+            print(f"IMP: Job {self.name} has passed C_lo without signaling completion ==> switch to HI mode...")
+            self._on_mode_switch('HI')
+            rwcet = self._etm.get_rwcet(self)
+        self._mc_run(ret, rwcet)
+
+    def _mc_run(self, ret, rwcet):
+        if ret > 0:
+            if not self.cpu.sched.has_switched_mode:
+                closest_event = min(int(ceil(ret)), int(ceil(rwcet)))
             else:
-                self.interruptReset()
\ No newline at end of file
+                closest_event = int(ceil(ret))
+            self._hold(closest_event)
+        else:
+            # End of job.
+            if isinstance(self._etm, MCAbstractExecutionTimeModel):
+                print(f"TERM [{self.name}] C = {self.actual_computation_time} ret = {self._etm.get_ret(self)/self._sim.cycles_per_ms} rwcet = {self._etm.get_rwcet(self)/self._sim.cycles_per_ms}")
+            self._on_terminated()
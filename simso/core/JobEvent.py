@@ -1,7 +1,9 @@
 # coding=utf-8
 
 
-class JobEvent:
+class JobEvent(object):
+    __slots__ = ('event', 'job', 'cpu', 'id_')
+
     ACTIVATE = 1
     EXECUTE = 2
     PREEMPTED = 3
@@ -12,9 +14,25 @@ class JobEvent:
 
     count = 0
 
-    def __init__(self, job, event, cpu=None):
+    def __init__(self, job, event, cpu=None, id_=None):
         self.event = event
         self.job = job
         self.cpu = cpu
-        JobEvent.count += 1
-        self.id_ = JobEvent.count
+        if id_ is None:
+            JobEvent.count += 1
+            id_ = JobEvent.count
+        self.id_ = id_
+
+    @staticmethod
+    def from_trace(trace, index):
+        """
+        Rebuild the index-th event of the :class:`trace
+        <simso.core.Trace.Trace>` of a task.
+        """
+        model = trace.sim
+        task = model.task_list[trace.get('task', index)]
+        cpu = trace.get('cpu', index)
+        return JobEvent(task.jobs[trace.get('job', index)],
+                        trace.get('code', index),
+                        model.processors[cpu] if cpu >= 0 else None,
+                        trace.get('seq', index))
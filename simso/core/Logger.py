@@ -1,6 +1,6 @@
 # coding=utf-8
 
-from SimPy.Simulation import Monitor
+from simso.core.Trace import Trace
 
 
 class Logger(object):
@@ -13,7 +13,11 @@ class Logger(object):
             - `sim`: The :class:`model <simso.core.Model.Model>` object.
         """
         self.sim = sim
-        self._logs = Monitor(name="Logs", sim=sim)
+        self._logs = Trace(sim, "Logs", Logger._decode, intern=False)
+
+    @staticmethod
+    def _decode(trace, index):
+        return (trace.payload(index), bool(trace.get('code', index)))
 
     def log(self, msg, kernel=False):
         """
@@ -24,11 +28,12 @@ class Logger(object):
             - `kernel`: Allows to make a distinction between a message from \
             the core of the simulation or from the scheduler.
         """
-        self._logs.observe((msg, kernel))
+        self._logs.record(int(kernel), payload=msg)
 
     @property
     def logs(self):
         """
-        The logs, a SimPy Monitor object.
+        The logs, a :class:`Trace <simso.core.Trace.Trace>` of (message,
+        kernel) couples.
         """
         return self._logs
@@ -1,21 +1,65 @@
 # coding=utf-8
 
-from SimPy.Simulation import Simulation
+import os
+import pickle
+import random
+import types
+from copy import deepcopy
+from itertools import count
+import numpy
+import simso
+from simso.core.kernel import kernels
 from simso.core.Processor import Processor
-from simso.core.Task import Task
+from simso.core.Task import Task, GenericTask
 from simso.core.Timer import Timer
 from simso.core.etm import execution_time_models
 from simso.core.Logger import Logger
-from simso.core.results import Results
+from simso.core.results import Results, StreamingResults, DeadlineMiss
+from simso.core.Scheduler import SchedulerInfo
+from simso.core.SteadyState import SteadyState
 
 
-class Model(Simulation):
+class _Pickler(pickle.Pickler):
+    """
+    Pickler saving the classes and the functions of a scheduler loaded from
+    a file as references to their name, since they cannot be imported.
+    """
+    def __init__(self, file, module_name):
+        pickle.Pickler.__init__(self, file, pickle.HIGHEST_PROTOCOL)
+        self._module_name = module_name
+
+    def persistent_id(self, obj):
+        if (isinstance(obj, (type, types.FunctionType)) and
+                obj.__module__ == self._module_name):
+            return obj.__qualname__
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    """
+    Unpickler resolving the references saved by :class:`_Pickler` in the
+    module of the scheduler, loaded again from its file.
+    """
+    def __init__(self, file, module):
+        pickle.Unpickler.__init__(self, file)
+        self._module = module
+
+    def persistent_load(self, qualname):
+        obj = self._module
+        for name in qualname.split('.'):
+            obj = getattr(obj, name)
+        return obj
+
+
+class Model(object):
     """
     Main class for the simulation. It instantiate the various components
     required by the simulation and run it.
     """
 
-    def __init__(self, configuration, callback=None):
+    def __init__(self, configuration, callback=None, kernel='simpy',
+                 streaming=False, steady_state=False, stop_on_miss=False,
+                 job_history=None):
         """
         Args:
             - `callback`: A callback can be specified. This function will be \
@@ -23,15 +67,67 @@ class Model(Simulation):
                 progression bar).
             - `configuration`: The :class:`configuration \
                 <simso.configuration.Configuration>` of the simulation.
+            - `kernel`: Name of the discrete-event kernel running the \
+                simulation (see :mod:`simso.core.kernel`): 'simpy' (the \
+                default) or 'native'. The native kernel is required by \
+                :meth:`checkpoint` and :meth:`fork`.
+            - `streaming`: If True, the metrics are computed while the \
+                simulation runs and the events are not stored (see \
+                :class:`StreamingResults \
+                <simso.core.results.StreamingResults>`).
+            - `steady_state`: If True, the simulation of a periodic task \
+                set stops as soon as its schedule repeats and \
+                :meth:`Results.summary \
+                <simso.core.results.Results.summary>` extrapolates the \
+                metrics to the whole duration (see :class:`SteadyState \
+                <simso.core.SteadyState.SteadyState>`). The scheduler must \
+                support it (see :meth:`Scheduler.steady_state_signature \
+                <simso.core.Scheduler.Scheduler.steady_state_signature>`), \
+                otherwise the whole duration is simulated.
+            - `stop_on_miss`: If True, the simulation stops as soon as a \
+                job terminates after its deadline or is aborted. \
+                :meth:`run_model` then returns the :class:`DeadlineMiss \
+                <simso.core.results.DeadlineMiss>` and does not compute the \
+                results.
+            - `job_history`: Number of ended jobs kept by each task in \
+                :attr:`Task.jobs <simso.core.Task.GenericTask.jobs>`, None \
+                to keep all of them. The other ended jobs are released, so \
+                that the memory used does not grow with the duration of the \
+                simulation. Since the events refer to the jobs, this \
+                requires the streaming mode.
 
         Methods:
         """
-        Simulation.__init__(self)
+        self._kernel_class = kernels[kernel]
+        self._streaming = streaming
+        self._streaming_results = None
+        self._steady_state = None
+        self._started = False
+        self._stop_on_miss = stop_on_miss
+        if job_history is not None and not streaming:
+            raise ValueError("Keeping only the last jobs of the tasks "
+                             "requires the streaming mode.")
+        self._job_history = job_history
+        self.deadline_miss = None
+        self.initialize()
+        # Sequence numbers of the events recorded in the traces.
+        self._trace_seq = count()
         self._logger = Logger(self)
         task_info_list = configuration.task_info_list
         proc_info_list = configuration.proc_info_list
         self._cycles_per_ms = configuration.cycles_per_ms
+        # Seed sequence of each task, from which the execution time models
+        # derive their random streams.
+        self._seed_sequences = None
+        if configuration.seed is not None:
+            self._seed_sequences = numpy.random.SeedSequence(
+                configuration.seed).spawn(len(task_info_list))
         self.scheduler = configuration.scheduler_info.instantiate(self)
+        scheduler_info = configuration.scheduler_info
+        # File of the scheduler, if it is not loaded from a module.
+        self._scheduler_file = None
+        if scheduler_info.filename and not scheduler_info.clas:
+            self._scheduler_file = os.path.abspath(scheduler_info.filename)
 
         try:
             self._etm = execution_time_models[configuration.etm](
@@ -43,6 +139,7 @@ class Model(Simulation):
         # Init the processor class. This will in particular reinit the
         # identifiers to 0.
         Processor.init()
+        GenericTask.init()
 
         # Initialization of the caches
         for cache in configuration.caches_list:
@@ -72,6 +169,80 @@ class Model(Simulation):
         self.scheduler.task_list = self._task_list
         self.scheduler.processors = self._processors
         self.results = None
+        if steady_state:
+            self._steady_state = SteadyState(self, configuration)
+
+    def initialize(self):
+        self._kernel = self._kernel_class(self)
+        self._timer_service = self._kernel.timer_service
+        # Processors parked by Processor._wait: proc -> (seq, cond, key).
+        self._parked = {}
+        self._parked_on = {}
+        self._park_count = 0
+        self._notified = []
+
+    def park(self, proc, cond, key):
+        """
+        Park the process `proc` until `cond` becomes true. The condition is
+        only evaluated again once `key` has been notified.
+        """
+        self._park_count += 1
+        self._parked[proc] = (self._park_count, cond, key)
+        self._parked_on.setdefault(key, []).append(proc)
+
+    def notify(self, key):
+        """
+        Notify that the state associated to `key` has changed. The processes
+        parked on `key` will have their condition checked at the end of the
+        current event.
+        """
+        self._notified.append(key)
+
+    def _wake_parked(self):
+        procs = set()
+        for key in self._notified:
+            procs.update(self._parked_on.get(key, ()))
+        self._notified = []
+
+        # Check the conditions in the order the processes were parked, as
+        # SimPy does with its waituntil queue.
+        for proc in sorted(procs, key=lambda p: self._parked[p][0]):
+            _, cond, key = self._parked[proc]
+            if cond():
+                del self._parked[proc]
+                self._parked_on[key].remove(proc)
+                if not self._parked_on[key]:
+                    del self._parked_on[key]
+                self._kernel.reactivate(proc)
+
+    def now(self):
+        """
+        Current date, in cycles.
+        """
+        return self._kernel._t
+
+    def activate(self, process, generator):
+        """
+        Start the `process`, `generator` being its execution method.
+        """
+        self._kernel.activate(process, generator)
+
+    def reactivate(self, process):
+        """
+        Resume a passive `process`.
+        """
+        self._kernel.reactivate(process)
+
+    def simulate(self, until=0):
+        """
+        Run the simulation until the date `until`. The simulation is
+        started if needed. The model can then be saved with
+        :meth:`checkpoint`, e.g. to continue several variants of the
+        simulation from this date.
+        """
+        if not self._started:
+            self._start()
+        self._kernel.simulate(until)
 
     def now_ms(self):
         return float(self.now()) / self._cycles_per_ms
@@ -95,6 +266,13 @@ class Model(Simulation):
         """
         return self._cycles_per_ms
 
+    @property
+    def kernel(self):
+        """
+        Discrete-event kernel running the simulation.
+        """
+        return self._kernel
+
     @property
     def etm(self):
         """
@@ -116,6 +294,15 @@ class Model(Simulation):
         """
         return self._task_list
 
+    @property
+    def seed_sequences(self):
+        """
+        List of the `numpy.random.SeedSequence` of the tasks, by internal
+        identifier, spawned from the seed of the configuration. None if the
+        configuration has no seed.
+        """
+        return self._seed_sequences
+
     @property
     def duration(self):
         """
@@ -123,13 +310,25 @@ class Model(Simulation):
         """
         return self._duration
 
+    def on_deadline_miss(self, job):
+        """
+        Called by `job` when it misses its deadline, in `stop_on_miss` mode.
+        """
+        if self.deadline_miss is None:
+            self.deadline_miss = DeadlineMiss(self, job)
+            self._kernel.stop()
+
     def _on_tick(self):
         if self._callback:
             self._callback(self.now())
 
-    def run_model(self):
-        """ Execute the simulation."""
+    def _start(self):
         self.initialize()
+        self._streaming_results = None
+        if self._streaming:
+            self._streaming_results = StreamingResults(self)
+        if self._steady_state:
+            self._steady_state.init(self._streaming_results)
         self.scheduler.init()
         self.progress.start()
 
@@ -138,12 +337,167 @@ class Model(Simulation):
 
         for task in self._task_list:
             self.activate(task, task.execute())
+        self._started = True
 
+    def run_model(self, checkpoint=None, checkpoint_interval=None):
+        """
+        Execute the simulation, or continue it if it was started by
+        :meth:`simulate` or restored from a checkpoint.
+
+        Args:
+            - `checkpoint`: If given, the state of the simulation is saved \
+                in this file (see :meth:`checkpoint`) every \
+                `checkpoint_interval` and once the duration is reached, \
+                before the computation of the results. The simulation can \
+                then be restored to recover from a crash or to extend its \
+                duration.
+            - `checkpoint_interval`: Simulated time between two \
+                checkpoints, in ms.
+
+        In `stop_on_miss` mode, return the :class:`DeadlineMiss \
+        <simso.core.results.DeadlineMiss>` that stopped the simulation, None
+        if no job missed its deadline.
+        """
+        if not self._started:
+            self._start()
         try:
-            self.simulate(until=self._duration)
+            if checkpoint is None:
+                self.simulate(until=self._duration)
+            else:
+                self._simulate_checkpoints(checkpoint, checkpoint_interval)
         finally:
             self._etm.update()
 
-            if self.now() > 0:
-                self.results = Results(self)
+            if self.deadline_miss is not None:
+                self.results = None
+            elif self.now() > 0:
+                if self._streaming:
+                    self.results = self._streaming_results
+                else:
+                    self.results = Results(self)
+                if self._steady_state and self._steady_state.detected:
+                    self.results.steady_state = self._steady_state
                 self.results.end()
+        return self.deadline_miss
+
+    def _simulate_checkpoints(self, path, interval):
+        step = self._duration
+        if interval:
+            step = max(1, int(interval * self._cycles_per_ms))
+        while True:
+            until = min(self.now() + step, self._duration)
+            self.simulate(until)
+            if self.now() < until:
+                # No more event or stopped.
+                return
+            self.checkpoint(path)
+            if until >= self._duration:
+                return
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The callback may not be picklable and itertools.count objects
+        # cannot be pickled on recent versions of Python.
+        state['_callback'] = None
+        seq = next(self._trace_seq)
+        self._trace_seq = count(seq)
+        state['_trace_seq'] = seq
+        return state
+
+    def __setstate__(self, state):
+        state['_trace_seq'] = count(state['_trace_seq'])
+        self.__dict__.update(state)
+
+    def checkpoint(self, path):
+        """
+        Save the state of the simulation in the file `path`: the pending
+        events, the tasks and their jobs, the execution time model, the
+        internal state of the scheduler, the traces recorded so far and the
+        state of the `random` and `numpy.random` generators. The simulation
+        can then be continued with :meth:`restore`, without simulating its
+        beginning again.
+
+        The model must not be running an event: the checkpoints are taken
+        between two calls to :meth:`simulate` (or by :meth:`run_model`). The
+        native kernel is required and the scheduler must be picklable (in
+        particular, its timers must not call lambda functions).
+        """
+        header = {
+            'version': simso.__version__,
+            'scheduler_file': self._scheduler_file,
+            'random': random.getstate(),
+            'numpy': numpy.random.get_state()
+        }
+        tmp = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            with open(tmp, 'wb') as f:
+                pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+                if self._scheduler_file:
+                    _Pickler(f, type(self.scheduler).__module__).dump(self)
+                else:
+                    pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def fork(self):
+        """
+        Return a copy of the simulation at the current date, so that several
+        alternatives (e.g. admission decisions) can be evaluated from the
+        same state without simulating its beginning again. The two models
+        are then continued independently with :meth:`simulate` or
+        :meth:`run_model`; the copy can be pickled to be run in another
+        process.
+
+        The events recorded so far are shared by the traces of the two
+        models instead of being copied (see :class:`Trace
+        <simso.core.Trace.Trace>`). As for :meth:`checkpoint`, the model
+        must not be running an event and the native kernel is required.
+        The `random` and `numpy.random` generators are not part of the
+        model: they must be seeded before running each branch if the
+        execution times are random. The random streams of the tasks (when
+        the configuration has a seed) are copied with the model, so the
+        branches draw the same execution times.
+        """
+        model = deepcopy(self)
+        model._callback = self._callback
+        return model
+
+    @classmethod
+    def restore(cls, path, callback=None, duration=None):
+        """
+        Return the model saved in the file `path` by :meth:`checkpoint`.
+        The state of the `random` and `numpy.random` generators is restored
+        too. Calling :meth:`run_model` continues the simulation.
+
+        Args:
+            - `path`: The file written by :meth:`checkpoint`.
+            - `callback`: Function reporting the advance of the simulation \
+                (the callback is not saved in the checkpoint).
+            - `duration`: New duration of the simulation, in cycles (e.g. to \
+                extend it). By default, the duration is not changed.
+        """
+        with open(path, 'rb') as f:
+            header = pickle.load(f)
+            if header['version'] != simso.__version__:
+                raise ValueError(
+                    "The checkpoint {} was made by SimSo {}.".format(
+                        path, header['version']))
+            module = None
+            if header['scheduler_file']:
+                scheduler_info = SchedulerInfo()
+                scheduler_info.filename = header['scheduler_file']
+                module = scheduler_info.get_module()
+            model = _Unpickler(f, module).load()
+
+        random.setstate(header['random'])
+        numpy.random.set_state(header['numpy'])
+        model._callback = callback
+        if duration is not None:
+            if model._steady_state:
+                raise ValueError(
+                    "The duration of a simulation detecting its steady "
+                    "state cannot be changed.")
+            model._duration = duration
+        return model
@@ -2,6 +2,8 @@
 
 
 class ProcEvent(object):
+    __slots__ = ('event', 'args')
+
     RUN = 1
     IDLE = 2
     OVERHEAD = 3
@@ -10,29 +12,60 @@ class ProcEvent(object):
         self.event = event
         self.args = args
 
+    @staticmethod
+    def from_trace(trace, index):
+        """
+        Rebuild the index-th event of the :class:`trace
+        <simso.core.Trace.Trace>` of a processor. The payload of an overhead
+        is its type, or a couple (type, terminated) for the context switches.
+        """
+        code = trace.get('code', index)
+        if code == ProcEvent.RUN:
+            task = trace.sim.task_list[trace.get('task', index)]
+            return ProcRunEvent(task.jobs[trace.get('job', index)])
+        elif code == ProcEvent.IDLE:
+            return ProcIdleEvent()
+
+        payload = trace.payload(index)
+        if isinstance(payload, tuple):
+            if payload[0] == "CS":
+                return ProcCxtSaveEvent(payload[1])
+            return ProcCxtLoadEvent(payload[1])
+        return ProcOverheadEvent(payload)
+
 
 class ProcRunEvent(ProcEvent):
+    __slots__ = ()
+
     def __init__(self, job):
         ProcEvent.__init__(self, ProcEvent.RUN, job)
 
 
 class ProcIdleEvent(ProcEvent):
+    __slots__ = ()
+
     def __init__(self):
         ProcEvent.__init__(self, ProcEvent.IDLE)
 
 
 class ProcOverheadEvent(ProcEvent):
+    __slots__ = ()
+
     def __init__(self, type_overhead):
         ProcEvent.__init__(self, ProcEvent.OVERHEAD, type_overhead)
 
 
 class ProcCxtSaveEvent(ProcOverheadEvent):
+    __slots__ = ('terminated',)
+
     def __init__(self, terminated=False):
         ProcOverheadEvent.__init__(self, "CS")
         self.terminated = terminated
 
 
 class ProcCxtLoadEvent(ProcOverheadEvent):
+    __slots__ = ('terminated',)
+
     def __init__(self, terminated=False):
         ProcOverheadEvent.__init__(self, "CL")
         self.terminated = terminated
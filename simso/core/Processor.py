@@ -1,9 +1,9 @@
 # coding=utf-8
 
 from collections import deque
-from SimPy.Simulation import Process, Monitor, hold, waituntil
-from simso.core.ProcEvent import ProcRunEvent, ProcIdleEvent, \
-    ProcOverheadEvent, ProcCxtSaveEvent, ProcCxtLoadEvent
+from simso.core.kernel import Process, hold, passivate, waituntil
+from simso.core.Trace import Trace
+from simso.core.ProcEvent import ProcEvent
 
 
 RESCHED = 1
@@ -14,6 +14,10 @@ PREEMPT = 5
 SPEED = 6
 
 
+def _true():
+    return True
+
+
 class ProcInfo(object):
     def __init__(self, identifier, name, cs_overhead=0, cl_overhead=0,
                  migration_overhead=0, speed=1.0, data=None):
@@ -62,41 +66,56 @@ class Processor(Process):
         self.was_running = None
         self._evts = deque([])
         self.sched = model.scheduler
-        self.monitor = Monitor(name="Monitor" + proc_info.name, sim=model)
+        self.monitor = Trace(model, "Monitor" + proc_info.name,
+                             ProcEvent.from_trace)
         self._caches = []
         self._penalty = proc_info.penalty
         self._cs_overhead = proc_info.cs_overhead
         self._cl_overhead = proc_info.cl_overhead
         self._migration_overhead = proc_info.migration_overhead
         self.set_caches(proc_info.caches)
-        self.timer_monitor = Monitor(name="Monitor Timer" + proc_info.name,
-                                     sim=model)
+        self.timer_monitor = Trace(model, "Monitor Timer" + proc_info.name)
         self._speed = proc_info.speed
+        # State of the execution method (see run).
+        self._next = self._loop
+        self._job = None
+        self._timer = None
+        self._decisions = None
 
     def resched(self):
         """
         Add a resched event to the list of events to handle.
         """
         self._evts.append((RESCHED,))
+        self._model.notify(self)
 
     def activate(self, job):
         self._evts.append((ACTIVATE, job))
+        self._model.notify(self)
 
     def terminate(self, job):
         self._evts.append((TERMINATE, job))
         self._running = None
+        self._model.notify(self)
 
     def preempt(self, job=None):
         self._evts = deque([e for e in self._evts if e[0] != PREEMPT])
         self._evts.append((PREEMPT,))
         self._running = job
+        self._model.notify(self)
 
     def timer(self, timer):
         self._evts.append((TIMER, timer))
+        self._model.notify(self)
 
     def set_speed(self, speed):
         assert speed >= 0, "Speed must be positive."
         self._evts.append((SPEED, speed))
+        self._model.notify(self)
+
+    def _record_overhead(self, overhead):
+        self.monitor.record(ProcEvent.OVERHEAD, cpu=self._internal_id,
+                            payload=overhead)
 
     @property
     def speed(self):
@@ -143,104 +162,190 @@ class Processor(Process):
         """
         return self._running
 
+    def _wait(self, cond, key, then):
+        """
+        Wait until `cond` is true, then continue with the step `then`.
+        Instead of having the condition polled by the kernel after every
+        event, the processor is parked and only woken up when `key` is
+        notified (see :meth:`Model.notify <simso.core.Model.Model.notify>`).
+        """
+        self._next = then
+        if cond():
+            # Same as waituntil: resume first at the current date.
+            # The condition is not given again since it may have side effects
+            # (e.g. get_lock).
+            return waituntil, self, _true
+        self._model.park(self, cond, key)
+        return passivate, self
+
+    def _context_ok(self):
+        return self._job.context_ok
+
+    def _has_events(self):
+        return self._evts
+
     def run(self):
+        """
+        Execution method of the processor. Its state between two commands is
+        kept in its attributes (the next step to execute and the job it
+        deals with) instead of the frame of the generator, so that the
+        generator can be created again by :meth:`resume` when a simulation
+        is restored from a checkpoint.
+
+        Each step sets the next one and returns the command to yield, or None
+        to execute the next step immediately.
+        """
         while True:
-            if not self._evts:
-                job = self._running
-                if job:
-                    yield waituntil, self, lambda: job.context_ok
-                    self.monitor.observe(ProcCxtLoadEvent())
-                    yield hold, self, self.cl_overhead  # overhead load context
-                    self.monitor.observe(ProcCxtLoadEvent(terminated=True))
-                    job.interruptReset()
-                    self.sim.reactivate(job)
-                    self.monitor.observe(ProcRunEvent(job))
-                    job.context_ok = False
-                else:
-                    self.sim.logger.log(self.name + " idle.", kernel=True)
-                    # TODO: fix this ugly hack.
-                    if self.sched.clas in ('simso.schedulers.EDF_VD_mono'):
-                        if str(self.sched.criticality_mode) != 'LO':
-                            self.sched.criticality_mode = 'LO'
-                            self.sched.monitor_mode_switch_down(self, self.sim.now())
-                            self.sim.logger.log(self.name + " Switch back to criticality level " + \
-                                                str(self.sched.criticality_mode) + ".",
-                                                kernel=False)
-                    
-                    self.monitor.observe(ProcIdleEvent())
-
-                # Wait event.
-                yield waituntil, self, lambda: self._evts
-                if job:
-                    self.interrupt(job)
-                    self.monitor.observe(ProcCxtSaveEvent())
-                    yield hold, self, self.cs_overhead  # overhead save context
-                    self.monitor.observe(ProcCxtSaveEvent(terminated=True))
-                    job.context_ok = True
-
-            evt = self._evts.popleft()
-            if evt[0] == RESCHED:
-                if any(x[0] != RESCHED for x in self._evts):
-                    self._evts.append(evt)
-                    continue
-
-            if evt[0] == ACTIVATE:
-                self.sched.on_activate(evt[1])
-                self.monitor.observe(ProcOverheadEvent("JobActivation"))
-                self.sched.monitor_begin_activate(self)
-                yield hold, self, self.sched.overhead_activate
-                self.sched.monitor_end_activate(self)
-            elif evt[0] == TERMINATE:
-                self.sched.on_terminated(evt[1])
-                self.monitor.observe(ProcOverheadEvent("JobTermination"))
-                self.sched.monitor_begin_terminate(self)
-                yield hold, self, self.sched.overhead_terminate
-                self.sched.monitor_end_terminate(self)
-            elif evt[0] == TIMER:
-                self.timer_monitor.observe(None)
-                if evt[1].overhead > 0:
-                    print(self.sim.now(), "hold", evt[1].overhead)
-                    yield hold, self, evt[1].overhead
-                evt[1].call_handler()
-            elif evt[0] == SPEED:
-                self._speed = evt[1]
-            elif evt[0] == RESCHED:
-                self.monitor.observe(ProcOverheadEvent("Scheduling"))
-                self.sched.monitor_begin_schedule(self)
-                yield waituntil, self, self.sched.get_lock
-                decisions = self.sched.schedule(self)
-                yield hold, self, self.sched.overhead  # overhead scheduling
-                if type(decisions) is not list:
-                    decisions = [decisions]
-                decisions = [d for d in decisions if d is not None]
-
-                for job, cpu in decisions:
-                    # If there is nothing to change, simply ignore:
-                    if cpu.running == job:
-                        continue
-
-                    # If trying to execute a terminated job, warn and ignore:
-                    if job is not None and not job.is_active():
-                        print("Can't schedule a terminated job! ({})"
-                              .format(job.name))
-                        continue
-
-                    # if the job was running somewhere else, stop it.
-                    if job and job.cpu.running == job:
-                        job.cpu.preempt()
-
-                    # Send that job to processor cpu.
-                    cpu.preempt(job)
-
-                    if job:
-                        job.task.cpu = cpu
-
-                # Forbid to run a job simultaneously on 2 or more processors.
-                running_tasks = [
-                    cpu.running.name
-                    for cpu in self._model.processors if cpu.running]
-                assert len(set(running_tasks)) == len(running_tasks), \
-                    "Try to run a job on 2 processors simultaneously!"
-
-                self.sched.release_lock()
-                self.sched.monitor_end_schedule(self)
+            command = self._next()
+            if command is not None:
+                yield command
+
+    def resume(self):
+        return self.run()
+
+    def _loop(self):
+        if self._evts:
+            return self._handle_event()
+        job = self._job = self._running
+        if job:
+            return self._wait(self._context_ok, job, self._load_context)
+
+        self.sim.logger.log(self.name + " idle.", kernel=True)
+        # TODO: fix this ugly hack.
+        if self.sched.clas in ('simso.schedulers.EDF_VD_mono'):
+            if str(self.sched.criticality_mode) != 'LO':
+                self.sched.criticality_mode = 'LO'
+                self.sched.monitor_mode_switch_down(self, self.sim.now())
+                self.sim.logger.log(self.name + " Switch back to criticality level " + \
+                                    str(self.sched.criticality_mode) + ".",
+                                    kernel=False)
+
+        self.monitor.record(ProcEvent.IDLE, cpu=self._internal_id)
+        # Wait event.
+        return self._wait(self._has_events, self, self._save_context)
+
+    def _load_context(self):
+        self._record_overhead(("CL", False))
+        self._next = self._context_loaded
+        return hold, self, self.cl_overhead  # overhead load context
+
+    def _context_loaded(self):
+        job = self._job
+        self._record_overhead(("CL", True))
+        job._execute()
+        self.monitor.record(ProcEvent.RUN, job.task.internal_id,
+                            job.internal_id, self._internal_id)
+        job.context_ok = False
+        # Wait event.
+        return self._wait(self._has_events, self, self._save_context)
+
+    def _save_context(self):
+        job = self._job
+        if not job:
+            return self._handle_event()
+        job._interrupt()
+        self._record_overhead(("CS", False))
+        self._next = self._context_saved
+        return hold, self, self.cs_overhead  # overhead save context
+
+    def _context_saved(self):
+        job = self._job
+        self._record_overhead(("CS", True))
+        job.context_ok = True
+        self._model.notify(job)
+        return self._handle_event()
+
+    def _handle_event(self):
+        evt = self._evts.popleft()
+        self._next = self._loop
+        if evt[0] == RESCHED:
+            if any(x[0] != RESCHED for x in self._evts):
+                self._evts.append(evt)
+                return None
+
+        if evt[0] == ACTIVATE:
+            self.sched.on_activate(evt[1])
+            self._record_overhead("JobActivation")
+            self.sched.monitor_begin_activate(self)
+            self._next = self._activated
+            return hold, self, self.sched.overhead_activate
+        elif evt[0] == TERMINATE:
+            self.sched.on_terminated(evt[1])
+            self._record_overhead("JobTermination")
+            self.sched.monitor_begin_terminate(self)
+            self._next = self._terminated
+            return hold, self, self.sched.overhead_terminate
+        elif evt[0] == TIMER:
+            self.timer_monitor.record(cpu=self._internal_id)
+            self._timer = evt[1]
+            self._next = self._timer_handler
+            if evt[1].overhead > 0:
+                print(self.sim.now(), "hold", evt[1].overhead)
+                return hold, self, evt[1].overhead
+        elif evt[0] == SPEED:
+            self._speed = evt[1]
+        elif evt[0] == RESCHED:
+            self._record_overhead("Scheduling")
+            self.sched.monitor_begin_schedule(self)
+            return self._wait(self.sched.get_lock, self.sched,
+                              self._schedule)
+        return None
+
+    def _activated(self):
+        self.sched.monitor_end_activate(self)
+        self._next = self._loop
+
+    def _terminated(self):
+        self.sched.monitor_end_terminate(self)
+        self._next = self._loop
+
+    def _timer_handler(self):
+        timer = self._timer
+        self._timer = None
+        self._next = self._loop
+        timer.call_handler()
+
+    def _schedule(self):
+        self._decisions = self.sched.schedule(self)
+        self._next = self._apply_decisions
+        return hold, self, self.sched.overhead  # overhead scheduling
+
+    def _apply_decisions(self):
+        decisions = self._decisions
+        self._decisions = None
+        self._next = self._loop
+        if type(decisions) is not list:
+            decisions = [decisions]
+        decisions = [d for d in decisions if d is not None]
+
+        for job, cpu in decisions:
+            # If there is nothing to change, simply ignore:
+            if cpu.running == job:
+                continue
+
+            # If trying to execute a terminated job, warn and ignore:
+            if job is not None and not job.is_active():
+                print("Can't schedule a terminated job! ({})"
+                      .format(job.name))
+                continue
+
+            # if the job was running somewhere else, stop it.
+            if job and job.cpu.running == job:
+                job.cpu.preempt()
+
+            # Send that job to processor cpu.
+            cpu.preempt(job)
+
+            if job:
+                job.task.cpu = cpu
+
+        # Forbid to run a job simultaneously on 2 or more processors.
+        running_tasks = [
+            cpu.running.name
+            for cpu in self._model.processors if cpu.running]
+        assert len(set(running_tasks)) == len(running_tasks), \
+            "Try to run a job on 2 processors simultaneously!"
+
+        self.sched.release_lock()
+        self._model.notify(self.sched)
+        self.sched.monitor_end_schedule(self)
@@ -5,12 +5,8 @@ import importlib
 import pkgutil
 import inspect
 
-from simso.core.SchedulerEvent import SchedulerBeginScheduleEvent, \
-    SchedulerEndScheduleEvent, SchedulerBeginActivateEvent, \
-    SchedulerEndActivateEvent, SchedulerBeginTerminateEvent, \
-    SchedulerEndTerminateEvent, SchedulerModeSwitchUpEvent, \
-    SchedulerModeSwitchDownEvent, SchedulerDropJobEvent
-from SimPy.Simulation import Monitor
+from simso.core.SchedulerEvent import SchedulerEvent
+from simso.core.Trace import Trace
 
 
 class SchedulerInfo(object):
@@ -46,6 +42,22 @@ class SchedulerInfo(object):
             self.data[key] = value[0]
             self.fields_types[key] = value[1]
 
+    def get_module(self):
+        """
+        Load the module defined in the file of this scheduler.
+        """
+        path, name = os.path.split(self.filename)
+        module_name = os.path.splitext(name)[0]
+
+        if path not in sys.path:
+            sys.path.append(path)
+
+        spec = importlib.util.spec_from_file_location(module_name,
+                                                      self.filename)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
     def get_cls(self):
         """
         Get the class of this scheduler.
@@ -60,16 +72,8 @@ class SchedulerInfo(object):
                     module = importlib.import_module(self.clas)
                     clas = getattr(module, name)
             elif self.filename:
-                path, name = os.path.split(self.filename)
-                module_name = os.path.splitext(name)[0]
-		
-                if path not in sys.path:
-                    sys.path.append(path)
-
-                spec = importlib.util.spec_from_file_location(module_name, self.filename)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                clas = getattr(module, module_name)                    
+                module = self.get_module()
+                clas = getattr(module, module.__name__)
 
             return clas
         except Exception as e:
@@ -116,6 +120,9 @@ class Scheduler(object):
     By default, the scheduler can only run on a single processor at the same
     simulation time. It is also possible to override this behavior by
     overriding the :meth:`get_lock` and :meth:`release_lock` methods.
+
+    A scheduler that redefines :meth:`steady_state_signature` allows the
+    simulation to stop once its schedule repeats.
     """
 
     def __init__(self, sim, scheduler_info, **kwargs):
@@ -146,7 +153,8 @@ class Scheduler(object):
         self.overhead_activate = scheduler_info.overhead_activate
         self.overhead_terminate = scheduler_info.overhead_terminate
         self.data = scheduler_info.data
-        self.monitor = Monitor(name="MonitorScheduler", sim=sim)
+        self.monitor = Trace(sim, "MonitorScheduler",
+                             SchedulerEvent.from_trace)
         self.clas = scheduler_info.clas
 
     def init(self):
@@ -190,6 +198,22 @@ class Scheduler(object):
         """
         raise NotImplementedError("Function schedule to override!")
 
+    def steady_state_signature(self):
+        """
+        Return the internal state of the scheduler on which its next
+        decisions depend, used to detect that the schedule repeats (see
+        :class:`SteadyState <simso.core.SteadyState.SteadyState>`). It is
+        made of hashable values, tuples, lists, sets and dicts; the jobs,
+        tasks and processors it contains are described relatively to the
+        date of the snapshot. A scheduler without internal state returns
+        an empty tuple.
+
+        The default implementation returns None: the scheduler does not
+        support the detection of the steady state and its simulations are
+        never stopped early.
+        """
+        return None
+
     def add_task(self, task):
         """
         Add a task to the list of tasks handled by this scheduler.
@@ -226,32 +250,37 @@ class Scheduler(object):
         """
         self._lock = False
 
+    def _record(self, code, cpu, task=-1, job=-1, payload=None):
+        self.monitor.record(code, task, job,
+                            cpu.internal_id if cpu else -1, payload)
+
     def monitor_begin_schedule(self, cpu):
-        self.monitor.observe(SchedulerBeginScheduleEvent(cpu))
+        self._record(SchedulerEvent.BEGIN_SCHEDULE, cpu)
 
     def monitor_end_schedule(self, cpu):
-        self.monitor.observe(SchedulerEndScheduleEvent(cpu))
+        self._record(SchedulerEvent.END_SCHEDULE, cpu)
 
     def monitor_begin_activate(self, cpu):
-        self.monitor.observe(SchedulerBeginActivateEvent(cpu))
+        self._record(SchedulerEvent.BEGIN_ACTIVATE, cpu)
 
     def monitor_end_activate(self, cpu):
-        self.monitor.observe(SchedulerEndActivateEvent(cpu))
+        self._record(SchedulerEvent.END_ACTIVATE, cpu)
 
     def monitor_begin_terminate(self, cpu):
-        self.monitor.observe(SchedulerBeginTerminateEvent(cpu))
+        self._record(SchedulerEvent.BEGIN_TERMINATE, cpu)
 
     def monitor_end_terminate(self, cpu):
-        self.monitor.observe(SchedulerEndTerminateEvent(cpu))
+        self._record(SchedulerEvent.END_TERMINATE, cpu)
 
     def monitor_mode_switch_up(self, cpu, timestamp):
-        self.monitor.observe(SchedulerModeSwitchUpEvent(cpu, timestamp))
+        self._record(SchedulerEvent.MODE_SWITCH_UP, cpu, payload=timestamp)
 
     def monitor_mode_switch_down(self, cpu, timestamp):
-        self.monitor.observe(SchedulerModeSwitchDownEvent(cpu, timestamp))
+        self._record(SchedulerEvent.MODE_SWITCH_DOWN, cpu, payload=timestamp)
 
     def monitor_drop_job(self, cpu, job):
-        self.monitor.observe(SchedulerDropJobEvent(cpu, job))
+        self._record(SchedulerEvent.DROPPED_JOB, cpu, job.task.internal_id,
+                     job.internal_id)
 
 
 def get_schedulers():
@@ -2,6 +2,8 @@
 
 
 class SchedulerEvent(object):
+    __slots__ = ('event', 'cpu')
+
     BEGIN_SCHEDULE = 1
     END_SCHEDULE = 2
     BEGIN_ACTIVATE = 3
@@ -16,44 +18,77 @@ class SchedulerEvent(object):
         self.event = 0
         self.cpu = cpu
 
+    @staticmethod
+    def from_trace(trace, index):
+        """
+        Rebuild the index-th event of the :class:`trace
+        <simso.core.Trace.Trace>` of the scheduler. The payload of a mode
+        switch is its timestamp.
+        """
+        model = trace.sim
+        code = trace.get('code', index)
+        cpu = trace.get('cpu', index)
+        cpu = model.processors[cpu] if cpu >= 0 else None
+        if code in (SchedulerEvent.MODE_SWITCH_UP,
+                    SchedulerEvent.MODE_SWITCH_DOWN):
+            return _event_classes[code](cpu, trace.payload(index))
+        elif code == SchedulerEvent.DROPPED_JOB:
+            task = model.task_list[trace.get('task', index)]
+            return SchedulerDropJobEvent(cpu, task.jobs[trace.get('job', index)])
+        return _event_classes[code](cpu)
+
 
 class SchedulerBeginScheduleEvent(SchedulerEvent):
+    __slots__ = ()
+
     def __init__(self, cpu):
         SchedulerEvent.__init__(self, cpu)
         self.event = SchedulerEvent.BEGIN_SCHEDULE
 
 
 class SchedulerEndScheduleEvent(SchedulerEvent):
+    __slots__ = ()
+
     def __init__(self, cpu):
         SchedulerEvent.__init__(self, cpu)
         self.event = SchedulerEvent.END_SCHEDULE
 
 
 class SchedulerBeginActivateEvent(SchedulerEvent):
+    __slots__ = ()
+
     def __init__(self, cpu):
         SchedulerEvent.__init__(self, cpu)
         self.event = SchedulerEvent.BEGIN_ACTIVATE
 
 
 class SchedulerEndActivateEvent(SchedulerEvent):
+    __slots__ = ()
+
     def __init__(self, cpu):
         SchedulerEvent.__init__(self, cpu)
         self.event = SchedulerEvent.END_ACTIVATE
 
 
 class SchedulerBeginTerminateEvent(SchedulerEvent):
+    __slots__ = ()
+
     def __init__(self, cpu):
         SchedulerEvent.__init__(self, cpu)
         self.event = SchedulerEvent.BEGIN_TERMINATE
 
 
 class SchedulerEndTerminateEvent(SchedulerEvent):
+    __slots__ = ()
+
     def __init__(self, cpu):
         SchedulerEvent.__init__(self, cpu)
         self.event = SchedulerEvent.END_TERMINATE
 
 
 class SchedulerModeSwitchUpEvent(SchedulerEvent):
+    __slots__ = ('when',)
+
     def __init__(self, cpu, timestamp):
         SchedulerEvent.__init__(self, cpu)
         self.event = SchedulerEvent.MODE_SWITCH_UP
@@ -61,6 +96,8 @@ class SchedulerModeSwitchUpEvent(SchedulerEvent):
 
 
 class SchedulerModeSwitchDownEvent(SchedulerEvent):
+    __slots__ = ('when',)
+
     def __init__(self, cpu, timestamp):
         SchedulerEvent.__init__(self, cpu)
         self.event = SchedulerEvent.MODE_SWITCH_DOWN
@@ -68,7 +105,22 @@ class SchedulerModeSwitchDownEvent(SchedulerEvent):
 
 
 class SchedulerDropJobEvent(SchedulerEvent):
+    __slots__ = ('job',)
+
     def __init__(self, cpu, job):
         SchedulerEvent.__init__(self, cpu)
         self.event = SchedulerEvent.DROPPED_JOB
         self.job = job
+
+
+_event_classes = {
+    SchedulerEvent.BEGIN_SCHEDULE: SchedulerBeginScheduleEvent,
+    SchedulerEvent.END_SCHEDULE: SchedulerEndScheduleEvent,
+    SchedulerEvent.BEGIN_ACTIVATE: SchedulerBeginActivateEvent,
+    SchedulerEvent.END_ACTIVATE: SchedulerEndActivateEvent,
+    SchedulerEvent.BEGIN_TERMINATE: SchedulerBeginTerminateEvent,
+    SchedulerEvent.END_TERMINATE: SchedulerEndTerminateEvent,
+    SchedulerEvent.MODE_SWITCH_UP: SchedulerModeSwitchUpEvent,
+    SchedulerEvent.MODE_SWITCH_DOWN: SchedulerModeSwitchDownEvent,
+    SchedulerEvent.DROPPED_JOB: SchedulerDropJobEvent
+}
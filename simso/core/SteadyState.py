@@ -0,0 +1,272 @@
+# coding=utf-8
+
+from math import lcm
+from simso.core.Job import Job
+from simso.core.Processor import Processor
+from simso.core.Scheduler import Scheduler
+from simso.core.Task import GenericTask, JobHistory
+from simso.core.Timer import InstanceTimer
+from simso.core.results import ResultsSummary
+
+
+class SteadyState(object):
+    """
+    Detect that the schedule of a synchronous periodic task set became
+    periodic, in order to stop the simulation early and to extrapolate its
+    results to the whole duration.
+
+    With periodic tasks and the `wcet` execution time model, the schedule
+    repeats after at most the hyperperiod plus the largest activation date.
+    The state of the system is snapshotted after the events of every
+    boundary `offset + k * hyperperiod`: the pending events (relative to the
+    date), the active jobs (relative activation date and deadline, executed
+    time, state) and the processors. When a snapshot is equal to one of the
+    `max_periods` previous ones, the simulation is stopped and the schedule
+    between these two boundaries is assumed to repeat until the end of the
+    simulation. The period of the schedule can be a multiple of the
+    hyperperiod, e.g. when the jobs alternate between the processors.
+
+    The internal data of the scheduler is part of the snapshot through
+    :meth:`Scheduler.steady_state_signature
+    <simso.core.Scheduler.Scheduler.steady_state_signature>`. The steady
+    state is not detected, and the whole duration is simulated, if the
+    scheduler does not redefine this method or if it returns None.
+    """
+    def __init__(self, model, configuration, max_periods=8):
+        """
+        Args:
+            - `model`: The :class:`Model <simso.core.Model.Model>` object.
+            - `configuration`: Its :class:`configuration \
+            <simso.configuration.Configuration>`.
+            - `max_periods`: Maximum length of the period of the schedule, \
+            in hyperperiods.
+        """
+        self.model = model
+        self.entry = None
+        self.duration = configuration.duration
+        self.max_periods = max_periods
+        # Boundaries of the repeated period and date of this period that
+        # corresponds to the end of the simulation, once detected.
+        self.start = None
+        self.end = None
+        self.partial = None
+
+        self.hyperperiod = None
+        # The schedulers that delegate to other ones (e.g. partitioned
+        # schedulers) only tell whether they are supported once started.
+        self._supported = (
+            type(model.scheduler).steady_state_signature is not
+            Scheduler.steady_state_signature)
+        tasks = configuration.task_info_list
+        if (tasks and configuration.etm == 'wcet' and
+                all(task.task_type == 'Periodic' and
+                    task.custom_etm is None and
+                    not task.list_activation_dates and
+                    float(task.period).is_integer() for task in tasks)):
+            try:
+                hyperperiod = configuration.get_hyperperiod()
+            except TypeError:
+                # Integral periods given as floats.
+                hyperperiod = lcm(*[int(task.period) for task in tasks])
+            self.hyperperiod = int(hyperperiod * configuration.cycles_per_ms)
+            self.offset = int(max(task.activation_date for task in tasks) *
+                              configuration.cycles_per_ms)
+            self._remainder = (self.duration - self.offset) % self.hyperperiod
+
+    @property
+    def applicable(self):
+        """
+        True if the configuration allows to detect the steady state.
+        """
+        return (self.hyperperiod is not None and self._supported and
+                self.offset + self.hyperperiod < self.duration)
+
+    @property
+    def detected(self):
+        return self.end is not None
+
+    def init(self, results=None):
+        """
+        Start the detection, at the beginning of the simulation.
+
+        Args:
+            - `results`: The :class:`StreamingResults \
+            <simso.core.results.StreamingResults>` of the simulation, if the \
+            events are not stored. The summaries needed by the \
+            extrapolation are then taken while the simulation runs.
+        """
+        self._results = results
+        self.start = self.end = self.partial = None
+        self._signatures = {}
+        self._summaries = {}
+        self._cursors = dict((task, 0) for task in self.model.task_list)
+        self._boundary = self.offset
+        if self.applicable:
+            self._arm(self._boundary)
+
+    def _arm(self, date):
+        # Snapshot the state once all the events of `date` were executed,
+        # i.e. before any other event of the next cycle.
+        self._date = date
+        self.model._timer_service.arm(self, date + 1, prior=True)
+
+    def _describe(self, handle, processes):
+        if isinstance(handle, Job):
+            return ('job', handle.task.internal_id, handle._state)
+        if id(handle) in processes:
+            return ('process', processes[id(handle)])
+        if isinstance(handle, InstanceTimer):
+            return ('timer', handle.function.__qualname__,
+                    handle.cpu.internal_id if handle.cpu else -1)
+        task = getattr(handle, 'task', None)
+        if task is not None:
+            return (type(handle).__name__, task.internal_id)
+        return (type(handle).__name__,)
+
+    def _jobs(self, task):
+        """
+        Active jobs of `task`, the first jobs that ended being skipped.
+        """
+        jobs = task.jobs
+        if isinstance(jobs, JobHistory):
+            # Only the last ended jobs are kept.
+            return [job for job in jobs if job.is_active()]
+        cursor = self._cursors[task]
+        while cursor < len(jobs) and not jobs[cursor].is_active():
+            cursor += 1
+        self._cursors[task] = cursor
+        return [job for job in jobs[cursor:] if job.is_active()]
+
+    def _scheduler_state(self, value, date):
+        if isinstance(value, Job):
+            return ('job', value.task.internal_id,
+                    int(round(value.activation_date *
+                              self.model.cycles_per_ms)) - date)
+        if isinstance(value, GenericTask):
+            return ('task', value.internal_id)
+        if isinstance(value, Processor):
+            return ('cpu', value.internal_id)
+        if isinstance(value, (list, tuple)):
+            return tuple(self._scheduler_state(x, date) for x in value)
+        if isinstance(value, (set, frozenset)):
+            return tuple(sorted((self._scheduler_state(x, date)
+                                 for x in value), key=repr))
+        if isinstance(value, dict):
+            return tuple(sorted(((self._scheduler_state(k, date),
+                                  self._scheduler_state(v, date))
+                                 for k, v in value.items()), key=repr))
+        return value
+
+    def signature(self, date):
+        """
+        Snapshot of the state of the system at `date`, relative to it.
+        None if the scheduler does not support the detection.
+        """
+        model = self.model
+        scheduler = model.scheduler.steady_state_signature()
+        if scheduler is None:
+            return None
+        processes = dict((id(p._handle), p.name)
+                         for p in model.processors + model.task_list)
+        pending = sorted((event_date - date,
+                          self._describe(handle, processes))
+                         for event_date, handle in model.kernel.pending()
+                         if handle is not self and
+                         handle is not model.progress.instance)
+
+        cpm = model.cycles_per_ms
+        tasks = []
+        for task in model.task_list:
+            jobs = tuple(
+                (int(round(job.activation_date * cpm)) - date,
+                 job.absolute_deadline_cycles - date,
+                 job.computation_time_cycles,
+                 # Jobs waiting for the end of their predecessor are not
+                 # released yet.
+                 job.actual_computation_time_cycles
+                 if job._start_date is not None else None,
+                 job._state, job._interrupted, job._interrupt_left)
+                for job in self._jobs(task))
+            tasks.append((task.cpu.internal_id if task.cpu else -1, jobs))
+
+        processors = []
+        for proc in model.processors:
+            running = proc.running
+            was_running = proc.was_running
+            processors.append((
+                running.task.internal_id if running else -1,
+                was_running.task.internal_id if was_running else -1,
+                len(proc._evts)))
+
+        return (tuple(pending), tuple(tasks), tuple(processors),
+                self._scheduler_state(scheduler, date))
+
+    def _snapshot(self, date):
+        if self._results is not None:
+            self._summaries[date] = self._results.snapshot(date)
+
+    def expire(self):
+        date = self._date
+        self._snapshot(date)
+        if date != self._boundary:
+            # Date of the period corresponding to the end of the simulation.
+            self._arm(self._boundary)
+            return
+
+        signature = self.signature(date)
+        if signature is None:
+            self._supported = False
+            return
+        if signature in self._signatures:
+            self.start = self._signatures[signature]
+            self.end = date
+            self.partial = self.start + (self.duration - date) % self.period
+            self.model.kernel.stop()
+            return
+        self._signatures[signature] = date
+        oldest = date - (self.max_periods - 1) * self.hyperperiod
+        for old in [s for s, d in self._signatures.items() if d < oldest]:
+            del self._signatures[old]
+        for old in [d for d in self._summaries if d < oldest]:
+            del self._summaries[old]
+
+        self._boundary = date + self.hyperperiod
+        if self._boundary >= self.duration:
+            return
+        if self._remainder:
+            self._arm(date + self._remainder)
+        else:
+            self._arm(self._boundary)
+
+    @property
+    def period(self):
+        """
+        Period of the schedule, in cycles.
+        """
+        return self.end - self.start
+
+    @property
+    def repeats(self):
+        """
+        Number of periods after the end of the simulated period.
+        """
+        return (self.duration - self.end) // self.period
+
+    def extrapolate(self, results):
+        """
+        Return the :class:`ResultsSummary
+        <simso.core.results.ResultsSummary>` of the whole simulation,
+        extrapolated from `results`.
+        """
+        dates = (self.end, self.start, self.partial)
+        if all(date in self._summaries for date in dates):
+            summaries = [self._summaries[date] for date in dates]
+        else:
+            window = results.observation_window
+            summaries = []
+            for date in dates:
+                results.observation_window = (0, date)
+                summaries.append(ResultsSummary.from_results(results))
+            results.observation_window = window
+        return summaries[0].extrapolate(summaries[1], summaries[2],
+                                        self.repeats, self.duration)
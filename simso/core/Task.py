@@ -1,9 +1,10 @@
 # coding=utf-8
 
 from collections import deque
-from SimPy.Simulation import Process, Monitor, hold, passivate
+from simso.core.kernel import Process, hold, passivate
+from simso.core.Trace import Trace
 from simso.core.Job import (Job, MCJob)
-from simso.core.Timer import Timer
+from simso.core.JobEvent import JobEvent
 from simso.core.etm import execution_time_models
 from .CSDP import CSDP
 
@@ -21,7 +22,8 @@ class TaskInfo(object):
     def __init__(self, name, identifier, task_type, abort_on_miss, period,
                  activation_date, n_instr, mix, stack_file, custom_etm, apriori_et, wcet, acet,
                  et_stddev, deadline, base_cpi, followed_by,
-                 list_activation_dates, criticality_level, preemption_cost, data):
+                 list_activation_dates, criticality_level, preemption_cost,
+                 data, et_distribution=None):
         """
         :type name: str
         :type identifier: int
@@ -41,6 +43,7 @@ class TaskInfo(object):
         :type list_activation_dates: list
         :type preemption_cost: int
         :type data: dict
+        :type et_distribution: dict
         """
         self.name = name
         self.identifier = identifier
@@ -66,6 +69,7 @@ class TaskInfo(object):
         self.criticality_level = criticality_level
         self.data = data
         self.preemption_cost = preemption_cost
+        self.et_distribution = et_distribution
 
     @property
     def csdp(self):
@@ -106,6 +110,76 @@ class TaskInfo(object):
         return stack
 
 
+class DeadlineCheck(object):
+    """
+    Deadline of a job, checked by the :class:`timer service
+    <simso.core.Timer.TimerService>` in order to abort the job if it is still
+    running at that date.
+    """
+    __slots__ = ('task', 'job', 'date', 'seq', 'entry')
+
+    def __init__(self, task, job, date):
+        self.task = task
+        self.job = job
+        self.date = date
+        self.seq = None
+        self.entry = None
+
+    def expire(self):
+        if self.seq is None:
+            # Take the same place in the event list as the timer that was
+            # formerly started for each job.
+            self.seq = self.task.sim._timer_service.next_seq()
+            self.task._arm_deadline_check()
+        else:
+            self.task._on_deadline(self)
+
+
+class JobHistory(object):
+    """
+    Jobs of a task when only the last ones are kept (see the `job_history`
+    argument of :class:`Model <simso.core.Model.Model>`). The jobs are
+    indexed by their rank, as in a list; the jobs not ended yet and the
+    `limit` last ended jobs are kept, the other ones are released.
+
+    `len` gives the number of jobs created so far and iterating yields the
+    kept jobs, by rank.
+    """
+    def __init__(self, limit):
+        self.limit = limit
+        self._jobs = {}
+        self._ended = deque()
+        self._count = 0
+
+    def append(self, job):
+        self._jobs[self._count] = job
+        self._count += 1
+
+    def release(self, job):
+        """
+        Called when `job` ends: it is now only kept if it is one of the
+        `limit` last ended jobs.
+        """
+        self._ended.append(job._internal_id)
+        while len(self._ended) > self.limit:
+            self._jobs.pop(self._ended.popleft(), None)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        try:
+            return self._jobs[index]
+        except KeyError:
+            raise IndexError("job {} is not kept".format(index))
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for index in sorted(self._jobs):
+            yield self._jobs[index]
+
+
 class GenericTask(Process):
     """
     Abstract class for Tasks. :class:`ATask` and :class:`PTask` inherits from
@@ -120,6 +194,11 @@ class GenericTask(Process):
     available for analysis.
     """
     fields = []
+    _identifier = 0
+
+    @classmethod
+    def init(cls):
+        GenericTask._identifier = 0
 
     def __init__(self, sim, task_info):
         """
@@ -133,9 +212,11 @@ class GenericTask(Process):
         """
         Process.__init__(self, name=task_info.name, sim=sim)
         self.name = task_info.name
+        self._internal_id = GenericTask._identifier
+        GenericTask._identifier += 1
         self._task_info = task_info
-        self._monitor = Monitor(name="Monitor" + self.name + "_states",
-                                sim=sim)
+        self._monitor = Trace(sim, "Monitor" + self.name + "_states",
+                              JobEvent.from_trace)
         self._activations_fifo = deque([])
         self._sim = sim
         self.cpu = None
@@ -144,8 +225,13 @@ class GenericTask(Process):
         self._job_count = 0
         self._last_cpu = None
         self._cpi_alone = {}
-        self._jobs = []
+        if sim._job_history is None:
+            self._jobs = []
+        else:
+            self._jobs = JobHistory(sim._job_history)
+        self._last_job = None
         self.job = None
+        self._deadline_checks = deque([])
 
     def __lt__(self, other):
         return self.identifier < other.identifier
@@ -222,6 +308,15 @@ class GenericTask(Process):
     def et_stddev(self):
         return self._task_info.et_stddev
 
+    @property
+    def et_distribution(self):
+        """
+        Distribution of the execution times, used by the `acet` and \
+        `mc_acet` execution time models (see \
+        :func:`task_sampler <simso.core.etm.Sampler.task_sampler>`).
+        """
+        return self._task_info.et_distribution
+
     @property
     def period(self):
         """
@@ -236,11 +331,16 @@ class GenericTask(Process):
         """
         return self._task_info.identifier
 
+    @property
+    def internal_id(self):
+        """A unique, internal, id: the rank of the task in the model."""
+        return self._internal_id
+
     @property
     def monitor(self):
         """
-        The monitor for this Task. Similar to a log mechanism (see Monitor in
-        SimPy doc).
+        The monitor for this Task. Similar to a log mechanism (see
+        :class:`Trace <simso.core.Trace.Trace>`).
         """
         return self._monitor
 
@@ -259,12 +359,22 @@ class GenericTask(Process):
     @property
     def jobs(self):
         """
-        List of the jobs.
+        List of the jobs, or :class:`JobHistory` if only the last ones are
+        kept.
         """
         return self._jobs
 
+    @property
+    def last_job(self):
+        """
+        Last job created, None if there is none yet.
+        """
+        return self._last_job
+
     def end_job(self, job):
         self._last_cpu = self.cpu
+        if self._sim._job_history is not None:
+            self._jobs.release(job)
         if self.followed_by:
             self.followed_by.create_job(job)
 
@@ -272,14 +382,47 @@ class GenericTask(Process):
             self._activations_fifo.popleft()
         if len(self._activations_fifo) > 0:
             self.job = self._activations_fifo[0]
-            self.sim.activate(self.job, self.job.activate_job())
+            self.job.activate_job()
 
     def _job_killer(self, job):
         if job.end_date is None and job.computation_time < job.wcet:
             if self._task_info.abort_on_miss:
-                self.cancel(job)
                 job.abort()
 
+    def _watch_deadline(self, job, deadline):
+        """
+        Check `job` in `deadline` ms in order to abort it if it is still
+        running. Only the earliest pending deadline of the task is armed in
+        the timer service. If the task does not abort its jobs, nothing is
+        armed: the deadline misses are detected when the jobs complete.
+        """
+        if not self._task_info.abort_on_miss:
+            return
+        check = DeadlineCheck(
+            self, job, self.sim.now() + int(deadline * self._sim.cycles_per_ms))
+        self._deadline_checks.append(check)
+        self.sim._timer_service.arm(check, self.sim.now())
+
+    def _unwatch_deadline(self, job):
+        """
+        Cancel the deadline check of `job`. Called when the job ends.
+        """
+        checks = self._deadline_checks
+        if checks and checks[0].job is job:
+            self.sim._timer_service.cancel(checks.popleft())
+            self._arm_deadline_check()
+
+    def _arm_deadline_check(self):
+        checks = self._deadline_checks
+        if checks and checks[0].seq is not None and checks[0].entry is None:
+            self.sim._timer_service.arm(checks[0], checks[0].date,
+                                        seq=checks[0].seq)
+
+    def _on_deadline(self, check):
+        self._deadline_checks.popleft()
+        self._job_killer(check.job)
+        self._arm_deadline_check()
+
     def create_job(self, pred=None):
         """
         Create a new job from this task. This should probably not be used
@@ -291,13 +434,12 @@ class GenericTask(Process):
 
         if len(self._activations_fifo) == 0:
             self.job = job
-            self.sim.activate(job, job.activate_job())
+            job.activate_job()
         self._activations_fifo.append(job)
         self._jobs.append(job)
+        self._last_job = job
 
-        timer_deadline = Timer(self.sim, GenericTask._job_killer,
-                               (self, job), self.deadline)
-        timer_deadline.start()
+        self._watch_deadline(job, self.deadline)
 
     def _init(self):
         if self.cpu is None:
@@ -315,6 +457,10 @@ class ATask(GenericTask):
         self._init()
         yield passivate, self
 
+    def resume(self):
+        # The process is never resumed.
+        yield from ()
+
 
 class PTask(GenericTask):
     """
@@ -328,7 +474,10 @@ class PTask(GenericTask):
         # wait the activation date.
         yield hold, self, int(self._task_info.activation_date *
                               self._sim.cycles_per_ms)
+        yield from self.resume()
 
+    def resume(self):
+        # The task is always suspended until the release of its next job.
         while True:
             #print self.sim.now(), "activate", self.name
             self.create_job()
@@ -358,17 +507,6 @@ class MCPTask(PTask):
         """
         return self.CRIT_FACTOR * self._task_info.wcet
 
-    def execute(self):
-        self._init()
-        # wait the activation date.
-        yield hold, self, int(self._task_info.activation_date *
-                              self._sim.cycles_per_ms)
-
-        while True:
-            #print self.sim.now(), "activate", self.name
-            self.create_job()
-            yield hold, self, int(self.period * self._sim.cycles_per_ms)
-
     def create_job(self, pred=None):
         """
         Create a new mixed-criticality job from this task. This should probably not be used
@@ -381,23 +519,24 @@ class MCPTask(PTask):
         # By looking at the content of `Results` it is possible to compute
         # which jobs get dropped and which don't.
         self._jobs.append(job)
+        self._last_job = job
 
         if self.criticality_level >= self.cpu.sched.criticality_mode:
             if len(self._activations_fifo) == 0:
                 self.job = job
-                self.sim.activate(job, job.activate_job())
+                job.activate_job()
             self._activations_fifo.append(job)
 
             deadline = self.deadline
             # TODO: this is too EDF-VD dependant...
             if self.cpu.sched.needs_virtual_deadline():
                 deadline *= self.cpu.sched.vd_coeff
-            timer_deadline = Timer(self.sim, MCPTask._job_killer,
-                                (self, job), deadline)
-            timer_deadline.start()
+            self._watch_deadline(job, deadline)
         else:
             self.cpu.sched.monitor_drop_job(self.cpu, job)
             job.on_drop()
+            if self._sim._job_history is not None:
+                self._jobs.release(job)
 
     def _job_killer(self, job):
         # Skip jobs which have never been released
@@ -405,7 +544,6 @@ class MCPTask(PTask):
         # This is a bit of a hack...
         if job.end_date is None and (job.computation_time > 0 and job.computation_time < job.wcet_hi):
             if self._task_info.abort_on_miss:
-                self.cancel(job)
                 job.abort() 
 
 
@@ -418,10 +556,25 @@ class SporadicTask(GenericTask):
 
     def execute(self):
         self._init()
-        for ndate in self.list_activation_dates:
+        # Number of jobs released.
+        self._released = 0
+        yield from self._release_jobs(False)
+
+    def resume(self):
+        yield from self._release_jobs(True)
+
+    def _release_jobs(self, resumed):
+        dates = self.list_activation_dates
+        if resumed:
+            # Suspended until the release of the next job.
+            self.create_job()
+            self._released += 1
+        while self._released < len(dates):
+            ndate = dates[self._released]
             yield hold, self, int(ndate * self._sim.cycles_per_ms) \
                 - self._sim.now()
             self.create_job()
+            self._released += 1
 
     @property
     def list_activation_dates(self):
@@ -1,13 +1,100 @@
 # coding=utf-8
 
-from SimPy.Simulation import Process, hold
+from heapq import heappush, heappop, heapify
 
 # TODO: allow the user to specify an overhead.
 
 
-class InstanceTimer(Process):
+class TimerService(object):
+    """
+    Centralized timer service of the simulation. Instead of running one
+    process per timer, every armed timer is an entry of a single heap that is
+    drained by the :class:`kernel <simso.core.kernel.SimPyKernel>` event loop.
+    The :class:`native kernel <simso.core.kernel.NativeKernel>` extends it to
+    serve the processes too.
+
+    Arming a timer is O(log n). Cancelling marks the entry as dead; dead
+    entries are dropped when they reach the top of the heap, and the heap is
+    compacted as soon as they represent more than half of it.
+    """
+    def __init__(self, sim):
+        self.sim = sim
+        self._heap = []
+        self._cancelled = 0
+
+    def __len__(self):
+        """
+        Number of armed timers.
+        """
+        return len(self._heap) - self._cancelled
+
+    def next_seq(self, prior=False):
+        """
+        Allocate a sequence number. The entries are ordered using the same
+        sequence numbers as the processes so that the timers interleave with
+        the other events as SimPy processes would.
+        """
+        sim = self.sim
+        sim._sortpr -= 1
+        return sim._sortpr if prior else -sim._sortpr
+
+    def arm(self, instance, date, prior=False, seq=None):
+        """
+        Arm the timer `instance` so that it expires at `date`. The `instance`
+        must have an `entry` attribute and an `expire` method. A sequence
+        number previously obtained with :meth:`next_seq` can be given.
+        """
+        if seq is None:
+            seq = self.next_seq(prior)
+        entry = (date, seq, instance)
+        instance.entry = entry
+        heappush(self._heap, entry)
+
+    def cancel(self, instance):
+        """
+        Cancel the timer `instance` if it is armed.
+        """
+        if instance.entry is not None:
+            instance.entry = None
+            self._cancelled += 1
+            if self._cancelled * 2 > len(self._heap):
+                self._heap = [e for e in self._heap if e[2].entry is e]
+                heapify(self._heap)
+                self._cancelled = 0
+
+    def peek(self):
+        """
+        Return the (date, seq, instance) entry of the next timer to expire or
+        None if there is no armed timer.
+        """
+        heap = self._heap
+        while heap and heap[0][2].entry is not heap[0]:
+            heappop(heap)
+            self._cancelled -= 1
+        if heap:
+            return heap[0]
+        return None
+
+    def fire_next(self):
+        """
+        Advance the simulation to the date of the next timer and fire it.
+        """
+        date, _, instance = heappop(self._heap)
+        instance.entry = None
+        self.sim._t = date
+        instance.expire()
+
+
+class InstanceTimer(object):
+    """
+    Handle of a started timer. It stays the same for all the expirations of a
+    periodic timer.
+    """
+    __slots__ = ('service', 'function', 'args', 'delay', 'one_shot', 'cpu',
+                 'running', 'overhead', 'entry', 'activated')
+
     def __init__(self, timer):
-        Process.__init__(self, name="Timer", sim=timer.sim)
+        self.service = timer.sim._timer_service
         self.function = timer.function
         self.args = timer.args
         self.delay = timer.delay
@@ -15,23 +102,34 @@ class InstanceTimer(Process):
         self.cpu = timer.cpu
         self.running = False
         self.overhead = timer.overhead
+        self.entry = None
+        self.activated = False
 
     def call_handler(self):
         if self.running:
             self.function(*self.args)
 
-    def run(self):
+    def start(self, prior):
         self.running = True
-        while self.running:
-            yield hold, self, self.delay
-            if self.interrupted() or not self.running:
-                break
+        # Like the activation of a process, the delay starts at the
+        # first expiration, ordered with the other events of the same date.
+        self.service.arm(self, self.service.sim._t, prior)
+
+    def stop(self):
+        self.running = False
+        self.service.cancel(self)
+
+    def expire(self):
+        if not self.activated:
+            self.activated = True
+        else:
             if self.cpu:
                 self.cpu.timer(self)
             else:
                 self.call_handler()
-            if self.one_shot:
-                break
+            if self.one_shot or not self.running:
+                return
+        self.service.arm(self, self.service.sim._t + self.delay)
 
 
 class Timer(object):
@@ -89,11 +187,11 @@ class Timer(object):
         Start the timer.
         """
         self.instance = InstanceTimer(self)
-        self.sim.activate(self.instance, self.instance.run(), self.prior)
+        self.instance.start(self.prior)
 
     def stop(self):
         """
         Stop the timer.
         """
         if self.instance:
-            self.instance.running = False
+            self.instance.stop()
@@ -0,0 +1,194 @@
+# coding=utf-8
+
+from array import array
+from bisect import bisect_right
+from copy import deepcopy
+import numpy
+
+
+class Trace(object):
+    """
+    Events recorded by a component of the simulation (a task, a processor,
+    the scheduler or the logger). Instead of a list of (date, event object)
+    pairs, the events are stored in growable typed columns:
+
+        - `date` (int64): date of the event, in whole cycles (a fractional \
+        date, e.g. after an overhead that is not a whole number of cycles, \
+        is truncated).
+        - `seq` (int64): rank of the event among all the events recorded \
+        during the simulation.
+        - `code` (int8): event code (e.g. `JobEvent.EXECUTE`).
+        - `task`, `job`, `cpu` (int32): identifiers of the task, of the job \
+        and of the processor concerned by the event (see \
+        :attr:`Task.internal_id <simso.core.Task.GenericTask.internal_id>`, \
+        :attr:`Job.internal_id <simso.core.Job.Job.internal_id>` and \
+        :attr:`Processor.internal_id \
+        <simso.core.Processor.Processor.internal_id>`), -1 if none.
+        - `payload` (int32): index in :attr:`payloads` of additional data, \
+        -1 if none.
+
+    The columns are available as numpy arrays using :meth:`column` or
+    :meth:`arrays`. For compatibility with the former monitors, iterating
+    over a trace yields [date, event] pairs, the event objects being rebuilt
+    on the fly.
+
+    A copy of a trace made by `copy.deepcopy` (see :meth:`Model.fork
+    <simso.core.Model.Model.fork>`) shares the events recorded so far with
+    the original: these events are moved to read-only segments and both
+    traces record their new events in their own columns.
+    """
+    COLUMNS = (('date', 'q'), ('seq', 'q'), ('code', 'b'), ('task', 'i'),
+               ('job', 'i'), ('cpu', 'i'), ('payload', 'i'))
+
+    def __init__(self, sim, name, decode=None, intern=True):
+        """
+        Args:
+            - `sim`: The :class:`model <simso.core.Model.Model>` object.
+            - `name`: Name of the trace.
+            - `decode`: Function (trace, index) returning the event object \
+            of the index-th event. By default, the payload of the event.
+            - `intern`: If True, a payload is stored once for all the events \
+            that refer to it (it must then be hashable).
+        """
+        self.sim = sim
+        self.name = name
+        self._decode = decode
+        self._intern = intern
+        for column, typecode in self.COLUMNS:
+            setattr(self, '_' + column, array(typecode))
+        # Read-only segments of columns shared with the copies of the
+        # trace, the index of their first event and their number of events.
+        self._segments = []
+        self._starts = []
+        self._shared = 0
+        self.payloads = []
+        self._payload_index = {}
+        self._arrays = None
+
+    def record(self, code=0, task=-1, job=-1, cpu=-1, payload=None):
+        """
+        Record an event at the current date.
+        """
+        if payload is None:
+            index = -1
+        elif self._intern:
+            index = self._payload_index.get(payload)
+            if index is None:
+                index = len(self.payloads)
+                self._payload_index[payload] = index
+                self.payloads.append(payload)
+        else:
+            index = len(self.payloads)
+            self.payloads.append(payload)
+
+        self._date.append(int(self.sim.now()))
+        self._seq.append(next(self.sim._trace_seq))
+        self._code.append(code)
+        self._task.append(task)
+        self._job.append(job)
+        self._cpu.append(cpu)
+        self._payload.append(index)
+
+    def stream_to(self, sink):
+        """
+        Forward the events to `sink`, a function taking the same arguments
+        as :meth:`record` (the date being the current date), instead of
+        storing them.
+        """
+        self.record = sink
+
+    def payload_index(self, payload):
+        """
+        Index of an interned `payload`, -1 if it was never recorded.
+        """
+        return self._payload_index.get(payload, -1)
+
+    def _share(self):
+        """
+        Move the events recorded since the last call to a new read-only
+        segment.
+        """
+        if not self._date:
+            return
+        self._segments.append(dict(
+            (column, getattr(self, '_' + column))
+            for column, _ in self.COLUMNS))
+        self._starts.append(self._shared)
+        self._shared += len(self._date)
+        for column, typecode in self.COLUMNS:
+            setattr(self, '_' + column, array(typecode))
+
+    def __deepcopy__(self, memo):
+        self._share()
+        trace = Trace.__new__(Trace)
+        memo[id(self)] = trace
+        for key, value in self.__dict__.items():
+            # The segments, the payloads and the cached arrays are never
+            # modified: they are shared by the copies.
+            if key in ('_segments', '_starts', 'payloads'):
+                value = list(value)
+            elif key != '_arrays':
+                value = deepcopy(value, memo)
+            setattr(trace, key, value)
+        return trace
+
+    def column(self, name):
+        """
+        The column `name` as a numpy array.
+        """
+        return self.arrays()[name]
+
+    def arrays(self):
+        """
+        Dictionary of the columns, as numpy arrays.
+        """
+        if self._arrays is None or len(self._arrays['date']) != len(self):
+            if self._segments:
+                self._arrays = dict(
+                    (name, numpy.concatenate(
+                        [numpy.array(segment[name])
+                         for segment in self._segments] +
+                        [numpy.array(getattr(self, '_' + name))]))
+                    for name, _ in self.COLUMNS)
+            else:
+                self._arrays = dict(
+                    (name, numpy.array(getattr(self, '_' + name)))
+                    for name, _ in self.COLUMNS)
+        return self._arrays
+
+    def get(self, name, index):
+        """
+        Value of the column `name` for the index-th event.
+        """
+        shared = self._shared
+        if not shared:
+            return getattr(self, '_' + name)[index]
+        if index < 0:
+            index += len(self)
+        if index >= shared:
+            return getattr(self, '_' + name)[index - shared]
+        i = bisect_right(self._starts, index) - 1
+        return self._segments[i][name][index - self._starts[i]]
+
+    def payload(self, index):
+        """
+        Payload of the index-th event (None if there is no payload).
+        """
+        i = self.get('payload', index)
+        return self.payloads[i] if i >= 0 else None
+
+    def __len__(self):
+        return self._shared + len(self._date)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if self._decode:
+            return [self.get('date', index), self._decode(self, index)]
+        return [self.get('date', index), self.payload(index)]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
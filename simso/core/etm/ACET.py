@@ -1,32 +1,47 @@
 from simso.core.etm.AbstractExecutionTimeModel \
-    import (AbstractExecutionTimeModel, MCAbstractExecutionTimeModel)
+    import (AbstractExecutionTimeModel, MCAbstractExecutionTimeModel,
+            JobState)
+from simso.core.etm.Sampler import task_sampler
 
 import random
 
-# TODO: the seed should be specified in order to evaluate on identical systems.
-# More precisely, the computation time of the jobs should remain the same.
+# The execution times are drawn from the global random module, unless the
+# configuration has a seed or the task has its own distribution: each task
+# then has its own sampler (see Sampler).
 
 
 class ACET(AbstractExecutionTimeModel):
     def __init__(self, sim, *_):
         self.sim = sim
-        self.et = {}
-        self.executed = {}
-        self.on_execute_date = {}
+        self._samplers = {}
 
     def init(self):
         pass
 
     def update_executed(self, job):
-        if job in self.on_execute_date:
-            self.executed[job] += (self.sim.now() - self.on_execute_date[job]
-                                   ) * job.cpu.speed
+        state = job.etm_state
+        if state.exec_date is not None:
+            state.executed += (self.sim.now() - state.exec_date
+                               ) * job.cpu.speed
 
-            del self.on_execute_date[job]
+            state.exec_date = None
+
+    def _sampler(self, task):
+        sampler = self._samplers.get(task)
+        if sampler is None:
+            sampler = task_sampler(self.sim, task, task.acet * 0.05,
+                                   task.wcet)
+            self._samplers[task] = sampler
+        return sampler
 
     def on_activate(self, job):
-        self.executed[job] = 0
-        self.et[job] = min(
+        state = job.etm_state = JobState()
+        if (self.sim.seed_sequences is not None or
+                job.task.et_distribution is not None):
+            state.et = (self._sampler(job.task).next() *
+                        self.sim.cycles_per_ms)
+            return
+        state.et = min(
             job.task.wcet,
             max(
                 job.task.acet * 0.05,
@@ -35,57 +50,69 @@ class ACET(AbstractExecutionTimeModel):
         ) * self.sim.cycles_per_ms
 
     def on_execute(self, job):
-        self.on_execute_date[job] = self.sim.now()
+        job.etm_state.exec_date = self.sim.now()
 
     def on_preempted(self, job):
         self.update_executed(job)
 
     def on_terminated(self, job):
         self.update_executed(job)
-        del self.et[job]
 
     def on_abort(self, job):
         self.update_executed(job)
-        del self.et[job]
 
     def get_executed(self, job):
-        if job in self.on_execute_date:
-            c = (self.sim.now() - self.on_execute_date[job]) * job.cpu.speed
+        state = job.etm_state
+        if state.exec_date is not None:
+            c = (self.sim.now() - state.exec_date) * job.cpu.speed
         else:
             c = 0
-        return self.executed[job] + c
+        return state.executed + c
 
     def get_ret(self, job):
-        return int(self.et[job] - self.get_executed(job))
+        return int(job.etm_state.et - self.get_executed(job))
 
     def update(self):
-        for job in list(self.on_execute_date.keys()):
+        for job in list(self._executing_jobs()):
             self.update_executed(job)
 
 class MC_ACET(MCAbstractExecutionTimeModel):
     def __init__(self, sim, *_):
         MCAbstractExecutionTimeModel.__init__(self, sim)
         self.sim = sim
-        self.et = {}
-        self.on_execute_date = {}
+        self._samplers = {}
 
     def init(self):
         pass
 
     def update_executed(self, job):
-        if job in self.on_execute_date:
-            self.executed[job] += (self.sim.now() - self.on_execute_date[job]
-                                   ) * job.cpu.speed
+        state = job.etm_state
+        if state.exec_date is not None:
+            state.executed += (self.sim.now() - state.exec_date
+                               ) * job.cpu.speed
+
+            state.exec_date = None
 
-            del self.on_execute_date[job]
+    def _sampler(self, task):
+        sampler = self._samplers.get(task)
+        if sampler is None:
+            sampler = task_sampler(self.sim, task, task.acet * 0.05,
+                                   task.wcet * 0.995)
+            self._samplers[task] = sampler
+        return sampler
 
     def on_activate(self, job):
         MCAbstractExecutionTimeModel.on_activate(self, job)
-        self.executed[job] = 0
+        state = job.etm_state
         # Never make `et` touch neither 0 nor WCET
         # to avoid negative ret while the job
         # is running.
-        self.et[job] = min(
+        if (self.sim.seed_sequences is not None or
+                job.task.et_distribution is not None):
+            state.et = (self._sampler(job.task).next() *
+                        self.sim.cycles_per_ms)
+            return
+        state.et = min(
             job.task.wcet * 0.995,
             max(
                 job.task.acet * 0.05,
@@ -94,35 +121,34 @@ class MC_ACET(MCAbstractExecutionTimeModel):
         ) * self.sim.cycles_per_ms
 
     def on_execute(self, job):
-        self.on_execute_date[job] = self.sim.now()
+        job.etm_state.exec_date = self.sim.now()
 
     def on_preempted(self, job):
         self.update_executed(job)
 
     def on_mode_switch(self, job, new_crit_level):
         if new_crit_level == 'HI':
-            self.curr_wcet[job] = job.wcet_hi
+            job.etm_state.curr_wcet = job.wcet_hi
         else:
-            self.curr_wcet[job] = job.wcet
+            job.etm_state.curr_wcet = job.wcet
 
     def on_terminated(self, job):
         self.update_executed(job)
-        del self.et[job]
 
     def on_abort(self, job):
         self.update_executed(job)
-        del self.et[job]
 
     def get_executed(self, job):
-        if job in self.on_execute_date:
-            c = (self.sim.now() - self.on_execute_date[job]) * job.cpu.speed
+        state = job.etm_state
+        if state.exec_date is not None:
+            c = (self.sim.now() - state.exec_date) * job.cpu.speed
         else:
             c = 0
-        return self.executed[job] + c
+        return state.executed + c
 
     def get_ret(self, job):
-        return int(self.et[job] - self.get_executed(job))
+        return int(job.etm_state.et - self.get_executed(job))
 
     def update(self):
-        for job in list(self.on_execute_date.keys()):
-            self.update_executed(job)
\ No newline at end of file
+        for job in list(self._executing_jobs()):
+            self.update_executed(job)
@@ -1,6 +1,33 @@
 import abc
 
 
+class JobState(object):
+    """
+    State of a job kept by its execution time model, in the `etm_state` slot
+    of the job instead of dictionaries keyed by job: it is released with the
+    job. The models only use the fields they need.
+    """
+    __slots__ = ('executed', 'exec_date', 'et', 'curr_wcet', 'penalty',
+                 'was_running_on', 'instr', 'sharing')
+
+    def __init__(self):
+        # Cycles executed, weighted by the speed of the processors.
+        self.executed = 0
+        # Start of the current execution, None if the job is not running.
+        self.exec_date = None
+        # Execution time, in cycles.
+        self.et = None
+        # WCET in the current criticality mode, in ms.
+        self.curr_wcet = None
+        # Preemption and migration penalties, in cycles.
+        self.penalty = 0
+        self.was_running_on = None
+        # Instructions executed, and (caches, access factor) of the job
+        # while it runs (cache model).
+        self.instr = 0
+        self.sharing = None
+
+
 class AbstractExecutionTimeModel(object):
     __metaclass__ = abc.ABCMeta
 
@@ -39,6 +66,17 @@ class AbstractExecutionTimeModel(object):
     def get_executed(self, job):
         return job.computation_time_cycles
 
+    def _executing_jobs(self):
+        """
+        Jobs handled by this model that are being executed.
+        """
+        for task in self.sim.task_list:
+            job = task.job
+            if (job is not None and job._etm is self and
+                    job.etm_state is not None and
+                    job.etm_state.exec_date is not None):
+                yield job
+
 class MCAbstractExecutionTimeModel(AbstractExecutionTimeModel):
     """
     This class represent an abstract Mixed-Criticality Execution Time Model, i.e.
@@ -48,11 +86,10 @@ class MCAbstractExecutionTimeModel(AbstractExecutionTimeModel):
 
     def __init__(self, sim, *_):
         self.sim = sim
-        self.executed = {}
-        self.curr_wcet = {}
 
     def on_activate(self, job):
-        self.curr_wcet[job] = job.wcet
+        job.etm_state = JobState()
+        job.etm_state.curr_wcet = job.wcet
 
     @abc.abstractmethod
     def on_mode_switch(self, *_):
@@ -62,5 +99,5 @@ class MCAbstractExecutionTimeModel(AbstractExecutionTimeModel):
         """
         Returns the distance from the current-mode WCET, in cycles.
         """
-        wcet_cycles = int(self.curr_wcet[job] * self.sim.cycles_per_ms)
+        wcet_cycles = int(job.etm_state.curr_wcet * self.sim.cycles_per_ms)
         return int(wcet_cycles - self.get_executed(job))
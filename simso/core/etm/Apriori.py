@@ -7,8 +7,7 @@ class Apriori(MCAbstractExecutionTimeModel):
         MCAbstractExecutionTimeModel.__init__(self, sim)
         self.exec_times = exec_times
         self.t_idx = 0
-        self.et = {}
-        self.on_execute_date = {}
+        self._et_cycles = None
 
         assert all(map(lambda x: x > 0, self.exec_times)), \
             "All execution times must be strictly positive."
@@ -17,49 +16,51 @@ class Apriori(MCAbstractExecutionTimeModel):
         pass
 
     def update_executed(self, job):
-        if job in self.on_execute_date:
-            self.executed[job] += (self.sim.now() - self.on_execute_date[job]
-                                   ) * job.cpu.speed
+        state = job.etm_state
+        if state.exec_date is not None:
+            state.executed += (self.sim.now() - state.exec_date
+                               ) * job.cpu.speed
 
-            del self.on_execute_date[job]
+            state.exec_date = None
 
     def on_activate(self, job):
         MCAbstractExecutionTimeModel.on_activate(self, job)
-        self.executed[job] = 0
-        self.et[job] = self.exec_times[self.t_idx % len(self.exec_times)] \
-            * self.sim.cycles_per_ms
+        if self._et_cycles is None:
+            # Execution times in cycles, pulled by index.
+            self._et_cycles = [et * self.sim.cycles_per_ms
+                               for et in self.exec_times]
+        job.etm_state.et = self._et_cycles[self.t_idx % len(self._et_cycles)]
         self.t_idx += 1
 
     def on_execute(self, job):
-        self.on_execute_date[job] = self.sim.now()
+        job.etm_state.exec_date = self.sim.now()
 
     def on_preempted(self, job):
         self.update_executed(job)
 
     def on_mode_switch(self, job, new_crit_level):
         if new_crit_level == 'HI':
-            self.curr_wcet[job] = job.wcet_hi
+            job.etm_state.curr_wcet = job.wcet_hi
         else:
-            self.curr_wcet[job] = job.wcet
+            job.etm_state.curr_wcet = job.wcet
 
     def on_terminated(self, job):
         self.update_executed(job)
-        del self.et[job]
 
     def on_abort(self, job):
         self.update_executed(job)
-        del self.et[job]
 
     def get_executed(self, job):
-        if job in self.on_execute_date:
-            c = (self.sim.now() - self.on_execute_date[job]) * job.cpu.speed
+        state = job.etm_state
+        if state.exec_date is not None:
+            c = (self.sim.now() - state.exec_date) * job.cpu.speed
         else:
             c = 0
-        return self.executed[job] + c
+        return state.executed + c
 
     def get_ret(self, job):
-        return int(self.et[job] - self.get_executed(job))
+        return int(job.etm_state.et - self.get_executed(job))
 
     def update(self):
-        for job in list(self.on_execute_date.keys()):
+        for job in list(self._executing_jobs()):
             self.update_executed(job)
@@ -1,7 +1,7 @@
 # coding=utf-8
 
 from simso.core.etm.AbstractExecutionTimeModel \
-    import AbstractExecutionTimeModel
+    import AbstractExecutionTimeModel, JobState
 
 
 def calc_cpi(base_cpi, mix, miss_rates, penalties):
@@ -27,30 +27,23 @@ def cpi_alone(task, cache_sizes, penalties):
     return calc_cpi(task.base_cpi, task.mix, miss_rates, penalties)
 
 
-def calc_cache_sizes(caches, task, running_jobs):
+class CacheModel(AbstractExecutionTimeModel):
     """
-    Compute the virtual size of the cache taking into account the other running
-    tasks (FOA model).
+    Execution times derived from the number of instructions of the tasks and
+    from their CPI, which depends on the share of the caches they get (FOA
+    model).
+
+    The sum of the access factors (mix / CPI alone) of the running jobs is
+    maintained for each cache as the jobs start and stop, and the CPI of a
+    task is memoised for each set of running (task, processor) pairs, so
+    that an update costs O(running jobs) instead of O(running jobs^2 *
+    caches). The successors of these sets when a pair is added or removed
+    are memoised as well, so that a job starting or stopping does not
+    rebuild the set.
     """
-    result = []
-    for cache in caches:
-        shared_jobs = [j for j in running_jobs if j.cpu in cache.shared_with]
-        sum_af = sum(j.task.mix / j.task.get_cpi_alone() for j in shared_jobs)
-        proportion = (task.mix / task.get_cpi_alone()) / sum_af
-
-        result.append(cache.size * proportion)
-    return result
-
-
-def compute_instructions(task, running_jobs, duration):
-    caches = task.cpu.caches
-    penalties = [task.cpu.penalty_memaccess] + [c.penalty for c in caches]
-    sizes = calc_cache_sizes(caches, task, running_jobs)
-    miss_rates = [capacity_miss_LRU(task.csdp, size) for size in sizes]
-    return duration / calc_cpi(task.base_cpi, task.mix, miss_rates, penalties)
+    # Maximum number of memoised CPIs and sets of running pairs.
+    CPI_CACHE_SIZE = 1 << 16
 
-
-class CacheModel(AbstractExecutionTimeModel):
     def __init__(self, sim, nb_processors, *_):
         self.sim = sim
         self._nb_processors = nb_processors
@@ -58,11 +51,19 @@ class CacheModel(AbstractExecutionTimeModel):
     def init(self):
         self._last_update = 0
         self._running_jobs = set()
-        self._instr_jobs = {}
         self._total_preemptions_cost = 0
         self.running = {}
-        self.penalty = {}
-        self.was_running_on = {}
+        # Sum of the access factors of the running jobs using each cache and
+        # number of these jobs.
+        self._sum_af = {}
+        self._count_af = {}
+        # Set of the running (task, processor) pairs, number of running
+        # jobs for each pair, successors of the sets and CPI of the tasks for
+        # each of these sets.
+        self._signature = frozenset()
+        self._pair_count = {}
+        self._transitions = {}
+        self._cpi = {}
 
         # precompute cpi_alone for each task on each cpu
         for task in self.sim.task_list:
@@ -78,43 +79,106 @@ class CacheModel(AbstractExecutionTimeModel):
     def update(self):
         self._update_instructions()
 
+    def _task_cpi(self, task):
+        key = (task, self._signature)
+        cpi = self._cpi.get(key)
+        if cpi is None:
+            cpu = task.cpu
+            caches = cpu.caches
+            penalties = [cpu.penalty_memaccess] + [c.penalty for c in caches]
+            access_factor = task.mix / task.get_cpi_alone()
+            miss_rates = [
+                capacity_miss_LRU(task.csdp, cache.size * (
+                    access_factor / self._sum_af[cache]))
+                for cache in caches]
+            cpi = calc_cpi(task.base_cpi, task.mix, miss_rates, penalties)
+            if len(self._cpi) >= self.CPI_CACHE_SIZE:
+                self._cpi.clear()
+            self._cpi[key] = cpi
+        return cpi
+
     def _update_instructions(self):
+        duration = self.sim.now() - self._last_update
         for job in self._running_jobs:
             # Compute number of instr for self.sim.now() - last_update
-            instr = compute_instructions(job.task, self._running_jobs,
-                                         self.sim.now() - self._last_update)
+            instr = duration / self._task_cpi(job.task)
             # Update the number of instr for this job
-            self._instr_jobs[job] = self._instr_jobs.get(job, 0) + instr
+            job.etm_state.instr += instr
 
         # Update last_update
         self._last_update = self.sim.now()
 
+    def _start_sharing(self, job):
+        task = job.task
+        caches = job.cpu.caches
+        access_factor = task.mix / task.get_cpi_alone()
+        pair = (task, job.cpu)
+        job.etm_state.sharing = (caches, access_factor, pair)
+        for cache in caches:
+            self._sum_af[cache] = self._sum_af.get(cache, 0.0) + access_factor
+            self._count_af[cache] = self._count_af.get(cache, 0) + 1
+        count = self._pair_count.get(pair, 0)
+        self._pair_count[pair] = count + 1
+        if not count:
+            self._update_signature(pair, True)
+
+    def _stop_sharing(self, job):
+        caches, access_factor, pair = job.etm_state.sharing
+        job.etm_state.sharing = None
+        for cache in caches:
+            self._count_af[cache] -= 1
+            if self._count_af[cache]:
+                self._sum_af[cache] -= access_factor
+            else:
+                # Discard the rounding errors accumulated in the sum.
+                self._sum_af[cache] = 0.0
+        self._pair_count[pair] -= 1
+        if not self._pair_count[pair]:
+            del self._pair_count[pair]
+            self._update_signature(pair, False)
+
+    def _update_signature(self, pair, added):
+        key = (self._signature, pair, added)
+        signature = self._transitions.get(key)
+        if signature is None:
+            if added:
+                signature = self._signature | {pair}
+            else:
+                signature = self._signature - {pair}
+            if len(self._transitions) >= self.CPI_CACHE_SIZE:
+                self._transitions.clear()
+            self._transitions[key] = signature
+        self._signature = signature
+
     def on_activate(self, job):
-        self.penalty[job] = 0
+        job.etm_state = JobState()
 
     def on_execute(self, job):
+        state = job.etm_state
         # Compute penalty.
-        if job in self.was_running_on:
+        if state.was_running_on is not None:
             # resume on the same processor.
-            if self.was_running_on[job] is job.cpu:
+            if state.was_running_on is job.cpu:
                 if self.running[job.cpu] is not job:
-                    self.penalty[job] += job.task.preemption_cost
+                    state.penalty += job.task.preemption_cost
             else:  # migration.
-                self.penalty[job] += job.task.preemption_cost
+                state.penalty += job.task.preemption_cost
 
         self.running[job.cpu] = job
-        self.was_running_on[job] = job.cpu
+        state.was_running_on = job.cpu
 
         # Update the number of instructions executed for the running jobs.
         self._update_instructions()
         # Add the job in the list of running jobs.
         self._running_jobs.add(job)
+        self._start_sharing(job)
 
     def _stop_job(self, job):
         # Update the number of instructions executed for the running jobs.
         self._update_instructions()
         # Remove the job from the list of running jobs.
         self._running_jobs.remove(job)
+        self._stop_sharing(job)
 
     def on_preempted(self, job):
         self._stop_job(job)
@@ -127,6 +191,6 @@ class CacheModel(AbstractExecutionTimeModel):
 
     def get_ret(self, job):
         self._update_instructions()
-        penalty = self.penalty[job]
-        return (job.task.n_instr - self._instr_jobs[job]) \
-            * job.task.get_cpi_alone() + penalty
+        state = job.etm_state
+        return (job.task.n_instr - state.instr) \
+            * job.task.get_cpi_alone() + state.penalty
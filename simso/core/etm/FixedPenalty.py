@@ -1,67 +1,63 @@
 from simso.core.etm.AbstractExecutionTimeModel \
-    import AbstractExecutionTimeModel
+    import AbstractExecutionTimeModel, JobState
 
 
 class FixedPenalty(AbstractExecutionTimeModel):
     def __init__(self, sim, *_):
         self.sim = sim
         self.running = {}
-        self.penalty = {}
-        self.was_running_on = {}
-        self.executed = {}
-        self.on_execute_date = {}
 
     def init(self):
         pass
 
     def update_executed(self, job):
-        if job in self.on_execute_date:
-            self.executed[job] += (self.sim.now() - self.on_execute_date[job]
-                                   ) * job.cpu.speed
+        state = job.etm_state
+        if state.exec_date is not None:
+            state.executed += (self.sim.now() - state.exec_date
+                               ) * job.cpu.speed
 
-            del self.on_execute_date[job]
+            state.exec_date = None
 
     def on_activate(self, job):
-        self.penalty[job] = 0
-        self.executed[job] = 0
+        job.etm_state = JobState()
 
     def on_execute(self, job):
-        self.on_execute_date[job] = self.sim.now()
-        if job in self.was_running_on:
+        state = job.etm_state
+        state.exec_date = self.sim.now()
+        if state.was_running_on is not None:
             # resume on the same processor.
-            if self.was_running_on[job] is job.cpu:
+            if state.was_running_on is job.cpu:
                 if self.running[job.cpu] is not job:
-                    self.penalty[job] += self.sim.penalty_preemption
+                    state.penalty += self.sim.penalty_preemption
             else:  # migration.
-                self.penalty[job] += self.sim.penalty_migration
+                state.penalty += self.sim.penalty_migration
 
         self.running[job.cpu] = job
-        self.was_running_on[job] = job.cpu
+        state.was_running_on = job.cpu
 
     def on_preempted(self, job):
-        self.executed[job] += (self.sim.now() - self.on_execute_date[job]
-                               ) * job.cpu.speed
+        state = job.etm_state
+        state.executed += (self.sim.now() - state.exec_date) * job.cpu.speed
 
     def on_terminated(self, job):
-        if job in self.on_execute_date:
-            del self.on_execute_date[job]
+        job.etm_state.exec_date = None
 
     def on_abort(self, job):
-        if job in self.on_execute_date:
-            del self.on_execute_date[job]
+        job.etm_state.exec_date = None
 
     def get_executed(self, job):
-        if job in self.on_execute_date:
-            c = (self.sim.now() - self.on_execute_date[job]) * job.cpu.speed
+        state = job.etm_state
+        if state.exec_date is not None:
+            c = (self.sim.now() - state.exec_date) * job.cpu.speed
         else:
             c = 0
-        return self.executed[job] + c
+        return state.executed + c
 
     def get_ret(self, job):
         wcet_cycles = int(job.wcet * self.sim.cycles_per_ms)
-        penalty = self.penalty[job]
+        penalty = job.etm_state.penalty
         return int(wcet_cycles + penalty - job.computation_time_cycles)
 
     def update(self):
-        for job in list(self.on_execute_date.keys()):
+        for job in list(self._executing_jobs()):
             self.update_executed(job)
@@ -0,0 +1,279 @@
+# coding=utf-8
+
+"""
+Providers of random execution times for the execution time models.
+
+A sampler generates the execution times of a task, in ms, by blocks of
+:data:`BLOCK_SIZE` values clipped to [low, high]; the execution time model
+pulls them one by one with :meth:`Sampler.next`. The distribution of a task
+is given by its `et_distribution` (see :func:`task_sampler`), a dictionary
+holding the name of the distribution in :data:`samplers` and its
+parameters, e.g. ``{'name': 'weibull', 'shape': 1.5}`` or ``{'name':
+'trace', 'filename': 'T1.npy'}``.
+
+When the configuration has a seed, the model derives one
+`numpy.random.SeedSequence` per task from it with `SeedSequence.spawn` (see
+:attr:`Model.seed_sequences <simso.core.Model.Model.seed_sequences>`). The
+generator of a sampler is created from the sequence of its task: the
+execution times of a task do not depend on the other tasks, and the runs of
+a batch, seeded differently, get independent streams.
+"""
+
+from math import gamma
+import inspect
+import os
+import numpy
+
+BLOCK_SIZE = 4096
+
+
+def task_rng(sim, task):
+    """
+    Return a new `numpy.random.Generator` for `task`, None if the
+    configuration of the model `sim` has no seed.
+    """
+    seeds = sim.seed_sequences
+    if seeds is None:
+        return None
+    return numpy.random.default_rng(seeds[task.internal_id].spawn(1)[0])
+
+
+class Sampler(object):
+    """
+    Execution times generated by blocks and clipped to [low, high].
+    Subclasses implement :meth:`draw`.
+    """
+    def __init__(self, rng, low, high, block_size=BLOCK_SIZE):
+        self.rng = rng
+        self.low = low
+        self.high = high
+        self.block_size = block_size
+        self._values = []
+        self._index = 0
+
+    def draw(self, size):
+        """
+        Return a numpy array of `size` execution times, before clipping.
+        """
+        raise NotImplementedError
+
+    def next(self):
+        """
+        Return the next execution time.
+        """
+        index = self._index
+        if index == len(self._values):
+            self._values = numpy.clip(self.draw(self.block_size),
+                                      self.low, self.high).tolist()
+            index = 0
+        self._index = index + 1
+        return self._values[index]
+
+
+class NormalSampler(Sampler):
+    """
+    Normal distribution, the values out of [low, high] being clipped.
+    """
+    def __init__(self, rng, low, high, mean, stddev, block_size=BLOCK_SIZE):
+        Sampler.__init__(self, rng, low, high, block_size)
+        self.mean = mean
+        self.stddev = stddev
+
+    def draw(self, size):
+        return self.rng.normal(self.mean, self.stddev, size)
+
+
+class TruncatedNormalSampler(NormalSampler):
+    """
+    Normal distribution truncated to [low, high]: the values out of the
+    bounds are drawn again.
+    """
+    # Give up after this number of draws, the remaining values are clipped.
+    MAX_DRAWS = 100
+
+    def draw(self, size):
+        values = NormalSampler.draw(self, size)
+        for _ in range(self.MAX_DRAWS):
+            out = (values < self.low) | (values > self.high)
+            count = int(out.sum())
+            if not count:
+                break
+            values[out] = NormalSampler.draw(self, count)
+        return values
+
+
+class UniformSampler(Sampler):
+    """
+    Uniform distribution on [low, high].
+    """
+    def draw(self, size):
+        return self.rng.uniform(self.low, self.high, size)
+
+
+class WeibullSampler(Sampler):
+    """
+    Weibull distribution, ``loc + scale * X`` where X follows the standard
+    Weibull distribution of parameter `shape`.
+    """
+    def __init__(self, rng, low, high, shape, scale, loc=0.0,
+                 block_size=BLOCK_SIZE):
+        Sampler.__init__(self, rng, low, high, block_size)
+        self.shape = shape
+        self.scale = scale
+        self.loc = loc
+
+    def draw(self, size):
+        return self.loc + self.scale * self.rng.weibull(self.shape, size)
+
+
+class EmpiricalSampler(Sampler):
+    """
+    Empirical distribution given by a histogram, e.g. the result of
+    `numpy.histogram` on measured execution times: a bin is chosen according
+    to `counts` and the value is uniformly distributed in this bin.
+    """
+    def __init__(self, rng, low, high, counts, edges,
+                 block_size=BLOCK_SIZE):
+        Sampler.__init__(self, rng, low, high, block_size)
+        counts = numpy.asarray(counts, dtype=float)
+        self.edges = numpy.asarray(edges, dtype=float)
+        assert len(self.edges) == len(counts) + 1, \
+            "The histogram needs one more edge than bins."
+        self.probabilities = counts / counts.sum()
+
+    def draw(self, size):
+        bins = self.rng.choice(len(self.probabilities), size,
+                               p=self.probabilities)
+        start = self.edges[bins]
+        return start + self.rng.random(size) * (self.edges[bins + 1] - start)
+
+
+# Measurement files mapped in this process, shared by the samplers.
+_mapped = {}
+
+
+def map_trace(filename, dtype='float64'):
+    """
+    Return a read-only `numpy.memmap` of the samples of `filename`: a NumPy
+    `.npy` file or a raw binary file of `dtype` values. A file is mapped
+    once per process; the pages are loaded on demand and shared by the
+    processes reading the same file through the page cache. A file that
+    was modified since it was mapped is mapped again.
+    """
+    stat = os.stat(filename)
+    key = (filename, str(dtype), stat.st_size, stat.st_mtime_ns)
+    data = _mapped.get(key)
+    if data is None:
+        if filename.endswith('.npy'):
+            data = numpy.load(filename, mmap_mode='r')
+        else:
+            data = numpy.memmap(filename, dtype=dtype, mode='r')
+        _mapped[key] = data
+    return data
+
+
+class TraceSampler(Sampler):
+    """
+    Execution times read from a file of measured samples (see
+    :func:`map_trace`), multiplied by `scale` to get milliseconds. The
+    samples are read in a loop, from the beginning of the file, or drawn
+    at random if `sample` is True. Only the samples used are loaded into
+    memory.
+
+    When the sampler is pickled, e.g. to be sent to a worker process, the
+    samples are not copied: the file is mapped again by the worker.
+    """
+    def __init__(self, rng, low, high, filename, dtype='float64',
+                 sample=False, scale=1.0, block_size=BLOCK_SIZE):
+        Sampler.__init__(self, rng, low, high, block_size)
+        self.filename = os.path.abspath(filename)
+        self.dtype = dtype
+        self.sample = sample
+        self.scale = scale
+        self._position = 0
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = map_trace(self.filename, self.dtype)
+        return self._data
+
+    def draw(self, size):
+        data = self.data
+        if self.sample:
+            indexes = self.rng.integers(0, len(data), size)
+        else:
+            indexes = numpy.arange(self._position, self._position + size)
+            indexes %= len(data)
+            self._position = (self._position + size) % len(data)
+        return data[indexes].astype(float) * self.scale
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_data'] = None
+        return state
+
+
+samplers = {
+    'normal': NormalSampler,
+    'truncnorm': TruncatedNormalSampler,
+    'uniform': UniformSampler,
+    'weibull': WeibullSampler,
+    'empirical': EmpiricalSampler,
+    'trace': TraceSampler
+}
+
+
+def sampler_parameters(name):
+    """
+    Return the parameters accepted in an `et_distribution` of the
+    distribution `name` and, among them, the required ones (those for which
+    :func:`task_sampler` has no default value).
+    """
+    accepted = {'low', 'high'}
+    required = set()
+    signature = inspect.signature(samplers[name].__init__)
+    for param in signature.parameters.values():
+        if param.name in ('self', 'rng', 'low', 'high', 'block_size'):
+            continue
+        accepted.add(param.name)
+        if param.default is param.empty:
+            required.add(param.name)
+    if name in ('normal', 'truncnorm'):
+        required -= {'mean', 'stddev'}
+    elif name == 'weibull':
+        required.discard('scale')
+    return accepted, required
+
+
+def task_sampler(sim, task, low, high):
+    """
+    Return the sampler of the execution times of `task`.
+
+    The distribution is given by the `et_distribution` of the task, by
+    default a normal distribution of mean `acet` and of standard deviation
+    `et_stddev`. The execution times are bounded by `low` and `high`, unless
+    the distribution has its own 'low' and 'high' parameters. The mean of the
+    normal distributions defaults to `acet` and their standard deviation to
+    `et_stddev`; the scale of the Weibull distribution defaults to the value
+    giving a mean of `acet`.
+
+    Without seed in the configuration, the generator is seeded from the
+    global `numpy.random` generator.
+    """
+    params = dict(task.et_distribution or {'name': 'normal'})
+    name = params.pop('name')
+    low = params.pop('low', low)
+    high = params.pop('high', high)
+    if name in ('normal', 'truncnorm'):
+        params.setdefault('mean', task.acet)
+        params.setdefault('stddev', task.et_stddev)
+    elif name == 'weibull':
+        params.setdefault('scale',
+                          task.acet / gamma(1 + 1.0 / params['shape']))
+
+    rng = task_rng(sim, task)
+    if rng is None:
+        rng = numpy.random.default_rng(numpy.random.randint(1 << 31))
+    return samplers[name](rng, low, high, **params)
@@ -0,0 +1,30 @@
+from simso.core.etm.ACET import ACET
+from simso.core.etm.AbstractExecutionTimeModel import JobState
+from simso.core.etm.Sampler import task_sampler
+
+
+class TraceDriven(ACET):
+    """
+    Execution times read from files of measured samples, one per task. The
+    `et_distribution` of each task must be a 'trace' distribution (see
+    :class:`TraceSampler <simso.core.etm.Sampler.TraceSampler>`), e.g.
+    ``{'name': 'trace', 'filename': 'T1.npy', 'sample': True}``. Unlike
+    with the `acet` model, the measured execution times are not bounded by
+    the WCET of the task.
+    """
+    def _sampler(self, task):
+        sampler = self._samplers.get(task)
+        if sampler is None:
+            distribution = task.et_distribution
+            if not distribution or distribution.get('name') != 'trace':
+                raise ValueError(
+                    "The task {} has no execution time trace.".format(
+                        task.name))
+            sampler = task_sampler(self.sim, task, 0, float('inf'))
+            self._samplers[task] = sampler
+        return sampler
+
+    def on_activate(self, job):
+        job.etm_state = JobState()
+        job.etm_state.et = (self._sampler(job.task).next() *
+                            self.sim.cycles_per_ms)
@@ -1,28 +1,27 @@
 from simso.core.etm.AbstractExecutionTimeModel \
-    import AbstractExecutionTimeModel
+    import AbstractExecutionTimeModel, JobState
 
 
 class WCET(AbstractExecutionTimeModel):
     def __init__(self, sim, *_):
         self.sim = sim
-        self.executed = {}
-        self.on_execute_date = {}
 
     def init(self):
         pass
 
     def update_executed(self, job):
-        if job in self.on_execute_date:
-            self.executed[job] += (self.sim.now() - self.on_execute_date[job]
-                                   ) * job.cpu.speed
+        state = job.etm_state
+        if state.exec_date is not None:
+            state.executed += (self.sim.now() - state.exec_date
+                               ) * job.cpu.speed
 
-            del self.on_execute_date[job]
+            state.exec_date = None
 
     def on_activate(self, job):
-        self.executed[job] = 0
+        job.etm_state = JobState()
 
     def on_execute(self, job):
-        self.on_execute_date[job] = self.sim.now()
+        job.etm_state.exec_date = self.sim.now()
 
     def on_preempted(self, job):
         self.update_executed(job)
@@ -34,16 +33,17 @@ class WCET(AbstractExecutionTimeModel):
         self.update_executed(job)
 
     def get_executed(self, job):
-        if job in self.on_execute_date:
-            c = (self.sim.now() - self.on_execute_date[job]) * job.cpu.speed
+        state = job.etm_state
+        if state.exec_date is not None:
+            c = (self.sim.now() - state.exec_date) * job.cpu.speed
         else:
             c = 0
-        return self.executed[job] + c
+        return state.executed + c
 
     def get_ret(self, job):
         wcet_cycles = int(job.wcet * self.sim.cycles_per_ms)
         return int(wcet_cycles - self.get_executed(job))
 
     def update(self):
-        for job in list(self.on_execute_date.keys()):
+        for job in list(self._executing_jobs()):
             self.update_executed(job)
@@ -3,6 +3,7 @@ from .ACET import (ACET, MC_ACET)
 from .Apriori import Apriori
 from .CacheModel import CacheModel
 from .FixedPenalty import FixedPenalty
+from .TraceDriven import TraceDriven
 
 execution_time_models = {
     'wcet': WCET,
@@ -10,7 +11,8 @@ execution_time_models = {
     'mc_acet': MC_ACET,
     'apriori': Apriori,
     'cache': CacheModel,
-    'fixedpenalty': FixedPenalty
+    'fixedpenalty': FixedPenalty,
+    'trace': TraceDriven
 }
 
 execution_time_model_names = {
@@ -18,5 +20,6 @@ execution_time_model_names = {
     'ACET': 'acet',
     'MC_ACET': 'mc_acet',
     'Cache Model': 'cache',
-    'Fixed Penalty': 'fixedpenalty'
+    'Fixed Penalty': 'fixedpenalty',
+    'Trace': 'trace'
 }
@@ -0,0 +1,98 @@
+import abc
+
+# Commands yielded by the execution method of a process. The values are the
+# same as in SimPy.
+#  - `yield hold, self, delay`: resume after `delay` cycles.
+#  - `yield passivate, self`: wait until the process is reactivated.
+#  - `yield waituntil, self, cond`: wait until `cond()` is true.
+hold = 1
+passivate = 2
+waituntil = 7
+
+
+class Process(object):
+    """
+    Base class of the processes of the simulation (processors and tasks). The
+    execution method of a process is a generator yielding the commands above.
+    It is started by :meth:`Model.activate <simso.core.Model.Model.activate>`
+    and driven by the kernel of the model.
+    """
+    def __init__(self, name, sim):
+        self.name = name
+        self.sim = sim
+        self._handle = None  # Set by the kernel.
+
+    def resume(self):
+        """
+        Return a generator that continues the execution method of the
+        process from the command it is suspended on, i.e. that executes the
+        code following this command when it is first resumed. Used to
+        restore a simulation from a checkpoint.
+        """
+        raise NotImplementedError(
+            "{} cannot be restored from a checkpoint.".format(
+                type(self).__name__))
+
+
+class AbstractKernel(object):
+    """
+    A kernel runs the discrete-event simulation of a :class:`Model
+    <simso.core.Model.Model>`: it orders the events, advances the date and
+    drives the processes.
+
+    It also provides the timer service used by the timers, the jobs and the
+    deadline checks (see :class:`TimerService
+    <simso.core.Timer.TimerService>`).
+    """
+    __metaclass__ = abc.ABCMeta
+
+    def __init__(self, model):
+        self._model = model
+        self._t = 0
+        # Number of events executed.
+        self.event_count = 0
+
+    def now(self):
+        return self._t
+
+    @property
+    @abc.abstractmethod
+    def timer_service(self):
+        pass
+
+    @abc.abstractmethod
+    def activate(self, process, generator):
+        """
+        Start the `process` at the current date, `generator` being its
+        execution method.
+        """
+        pass
+
+    @abc.abstractmethod
+    def reactivate(self, process):
+        """
+        Resume the `process` at the current date.
+        """
+        pass
+
+    @abc.abstractmethod
+    def simulate(self, until):
+        """
+        Execute the events until the date `until`.
+        """
+        pass
+
+    @abc.abstractmethod
+    def stop(self):
+        """
+        Stop the simulation after the current event.
+        """
+        pass
+
+    @abc.abstractmethod
+    def pending(self):
+        """
+        Return the list of the pending events as (date, handle) couples,
+        the handle being a process handle, a job, a timer...
+        """
+        pass
@@ -0,0 +1,126 @@
+from inspect import getgeneratorstate, GEN_CREATED
+from simso.core.kernel.AbstractKernel import AbstractKernel, hold, waituntil
+from simso.core.Timer import TimerService
+
+
+class _Process(object):
+    """
+    Handle of a process in the event queue.
+    """
+    __slots__ = ('kernel', 'process', 'generator', 'entry', 'cond')
+
+    def __init__(self, kernel, process, generator):
+        self.kernel = kernel
+        self.process = process
+        self.generator = generator
+        self.entry = None
+        self.cond = None
+
+    def __getstate__(self):
+        # A generator cannot be pickled: it is created again when the
+        # handle is unpickled, either from the start or from the command it
+        # is suspended on (see Process.resume).
+        generator = self.generator
+        if generator is None:
+            method = None
+        elif getgeneratorstate(generator) == GEN_CREATED:
+            method = generator.__name__
+        else:
+            method = 'resume'
+        return (self.kernel, self.process, method, self.entry, self.cond)
+
+    def __setstate__(self, state):
+        self.kernel, self.process, method, self.entry, self.cond = state
+        self.generator = None
+        if method is not None:
+            self.generator = getattr(self.process, method)()
+
+    def expire(self):
+        kernel = self.kernel
+        try:
+            command = next(self.generator)
+        except StopIteration:
+            self.generator = None
+            return
+
+        if command[0] == hold:
+            delay = command[2] if len(command) == 3 else 0
+            assert delay >= 0, "hold: delay time negative: {}".format(delay)
+            kernel.arm(self, kernel._t + delay)
+        elif command[0] == waituntil:
+            if command[2]():
+                kernel.arm(self, kernel._t, prior=True)
+            else:
+                self.cond = command[2]
+                kernel._waiting.append(self)
+        # passivate: nothing to do until the process is reactivated.
+
+
+class NativeKernel(TimerService, AbstractKernel):
+    """
+    Discrete-event kernel specialised for SimSo. Every event (release of a
+    job by a task, job completion, timer, deadline check, end of an overhead
+    or of a wait of a processor) is an entry of a single heap ordered by
+    date and sequence number. There is no generic command dispatch and the
+    timers and the jobs are plain heap entries, not processes.
+
+    The sequence numbers are allocated in the same way as SimPy does, hence
+    this kernel produces the same simulation as the SimPy one.
+    """
+    def __init__(self, model):
+        AbstractKernel.__init__(self, model)
+        TimerService.__init__(self, self)
+        self._sortpr = 0
+        # Processes waiting for a condition.
+        self._waiting = []
+        self._stopped = False
+
+    @property
+    def timer_service(self):
+        return self
+
+    def activate(self, process, generator):
+        handle = _Process(self, process, generator)
+        process._handle = handle
+        self.arm(handle, self._t)
+
+    def reactivate(self, process):
+        handle = process._handle
+        if handle.generator is not None:
+            self.cancel(handle)
+            self.arm(handle, self._t)
+
+    def _check_conditions(self):
+        waiting = self._waiting
+        i = 0
+        while i < len(waiting):
+            handle = waiting[i]
+            if handle.cond():
+                waiting.pop(i)
+                handle.cond = None
+                self.arm(handle, self._t)
+            else:
+                i += 1
+
+    def stop(self):
+        self._stopped = True
+
+    def pending(self):
+        return [(entry[0], entry[2]) for entry in self._heap
+                if entry[2].entry is entry]
+
+    def simulate(self, until):
+        model = self._model
+        while not self._stopped:
+            entry = self.peek()
+            if entry is None:
+                return
+            if entry[0] > until:
+                self._t = until
+                return
+            self.fire_next()
+            self.event_count += 1
+            if self._waiting:
+                self._check_conditions()
+            if model._notified:
+                model._wake_parked()
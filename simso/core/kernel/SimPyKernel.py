@@ -0,0 +1,103 @@
+from heapq import heappop
+from SimPy.Simulation import Process, Simulation
+from simso.core.kernel.AbstractKernel import AbstractKernel
+from simso.core.Timer import TimerService
+
+
+class _Process(Process):
+    """
+    SimPy process running the execution method of a SimSo process.
+    """
+    def run(self, generator):
+        for command in generator:
+            yield (command[0], self) + command[2:]
+
+
+class SimPyKernel(AbstractKernel, Simulation):
+    """
+    Kernel based on SimPy 2. The processes are run by SimPy while the timers
+    are served by a :class:`TimerService <simso.core.Timer.TimerService>`
+    interleaved with the SimPy events.
+    """
+    def __init__(self, model):
+        AbstractKernel.__init__(self, model)
+        Simulation.__init__(self)
+        self._timer_service = TimerService(self)
+
+    @property
+    def timer_service(self):
+        return self._timer_service
+
+    def activate(self, process, generator):
+        handle = _Process(name=process.name, sim=self)
+        process._handle = handle
+        Simulation.activate(self, handle, handle.run(generator))
+
+    def reactivate(self, process):
+        Simulation.reactivate(self, process._handle)
+
+    def stop(self):
+        self.stopSimulation()
+
+    def __getstate__(self):
+        raise NotImplementedError(
+            "The processes of the SimPy kernel cannot be saved, use the "
+            "native kernel to checkpoint a simulation.")
+
+    def pending(self):
+        service = self._timer_service
+        return ([(entry[0], entry[2]) for entry in service._heap
+                 if entry[2].entry is entry] +
+                [(event[0], event[2]) for event in self._timestamps
+                 if not event[3]])
+
+    def _next_event(self):
+        """
+        Return a couple (date, is_timer) for the next event, is_timer being
+        True if it is a timer expiration rather than a SimPy event. Return
+        None if there is no more event.
+        """
+        timestamps = self._timestamps
+        while timestamps and timestamps[0][3]:
+            heappop(timestamps)
+        timer = self._timer_service.peek()
+        if timer is None:
+            if timestamps:
+                return timestamps[0][0], False
+            return None
+        if not timestamps or timer[0] < timestamps[0][0] or (
+                timer[0] == timestamps[0][0] and timer[1] < timestamps[0][1]):
+            return timer[0], True
+        return timestamps[0][0], False
+
+    def step(self):
+        """
+        Execute the next event and return the date of the following one.
+        """
+        event = self._next_event()
+        if event is None:
+            return None
+        if event[1]:
+            self._timer_service.fire_next()
+        else:
+            Simulation.step(self)
+        self.event_count += 1
+        if self._model._notified:
+            self._model._wake_parked()
+        event = self._next_event()
+        return event[0] if event else None
+
+    def simulate(self, until):
+        """
+        Run the simulation until the date `until` (both the SimPy events and
+        the timers are taken into account).
+        """
+        try:
+            event = self._next_event()
+            date = event[0] if event else None
+            while not self._stop and date is not None and date <= until:
+                date = self.step()
+            if not self._stop and date is not None:
+                self._t = until
+        finally:
+            self._stop = True
@@ -0,0 +1,8 @@
+from .AbstractKernel import Process, hold, passivate, waituntil
+from .NativeKernel import NativeKernel
+from .SimPyKernel import SimPyKernel
+
+kernels = {
+    'native': NativeKernel,
+    'simpy': SimPyKernel
+}
@@ -1,3 +1,9 @@
+import heapq
+import json
+import warnings
+import numpy
+from collections import deque
+from functools import partial
 from simso.core.ProcEvent import ProcEvent
 from simso.core.JobEvent import JobEvent
 from simso.core.SchedulerEvent import SchedulerEvent
@@ -8,11 +14,27 @@ class ProcessorR(object):
     Add information about a processor such as the number of CxtSave and
     CxtLoad and their total overhead.
     """
-    def __init__(self):
+    def __init__(self, start=0):
         self.context_save_overhead = 0
         self.context_save_count = 0
         self.context_load_overhead = 0
         self.context_load_count = 0
+        self._last = start
+
+    def record(self, date, payload):
+        """
+        Account for an event of the processor. Context switches are recorded
+        with a (type, terminated) payload.
+        """
+        if payload == ("CS", True):
+            self.context_save_overhead += date - self._last
+        elif payload == ("CS", False):
+            self.context_save_count += 1
+        elif payload == ("CL", True):
+            self.context_load_overhead += date - self._last
+        elif payload == ("CL", False):
+            self.context_load_count += 1
+        self._last = date
 
 
 class SchedulerR(object):
@@ -20,7 +42,7 @@ class SchedulerR(object):
     Add information about the scheduler such as the number of scheduling
     events and their total overhead.
     """
-    def __init__(self):
+    def __init__(self, task_list=(), start=0, keep_jobs=True):
         self.schedule_overhead = 0
         self.activate_overhead = 0
         self.terminate_overhead = 0
@@ -30,6 +52,49 @@ class SchedulerR(object):
         self.mc_mode_switch_count = 0
         self.mc_mode_resume_count = 0
         self.mc_dropped_job_count = {}
+        self._task_list = task_list
+        self._keep_jobs = keep_jobs
+        self._last = start
+
+    def record(self, date, code, task=-1, job=-1):
+        """
+        Account for an event of the scheduler.
+        """
+        if code == SchedulerEvent.BEGIN_SCHEDULE:
+            self.schedule_count += 1
+        elif code == SchedulerEvent.END_SCHEDULE:
+            self.schedule_overhead += date - self._last
+        elif code == SchedulerEvent.BEGIN_ACTIVATE:
+            self.activate_count += 1
+        elif code == SchedulerEvent.END_ACTIVATE:
+            self.activate_overhead += date - self._last
+        elif code == SchedulerEvent.BEGIN_TERMINATE:
+            self.terminate_count += 1
+        elif code == SchedulerEvent.END_TERMINATE:
+            self.terminate_overhead += date - self._last
+        elif code == SchedulerEvent.MODE_SWITCH_UP:
+            self.mc_mode_switch_count += 1
+        elif code == SchedulerEvent.MODE_SWITCH_DOWN:
+            self.mc_mode_resume_count += 1
+        elif code == SchedulerEvent.DROPPED_JOB:
+            self.drop_job(task, job)
+        self._last = date
+
+    def drop_job(self, task, job):
+        """
+        Account for the job `job` of the task `task` (internal identifiers)
+        dropped by a mixed-criticality scheduler. The dropped jobs of each
+        task are listed, or only counted if the jobs are not kept (streamed
+        results).
+        """
+        task = self._task_list[task]
+        if not self._keep_jobs:
+            self.mc_dropped_job_count[task.name] = \
+                self.mc_dropped_job_count.get(task.name, 0) + 1
+            return
+        if task.name not in self.mc_dropped_job_count:
+            self.mc_dropped_job_count[task.name] = []
+        self.mc_dropped_job_count[task.name].append(task.jobs[job])
 
 
 class TaskR(object):
@@ -43,9 +108,11 @@ class TaskR(object):
         self.task = task
         self.delta_preemption = delta_preemption
         self.jobs = []
-        self.waiting_jobs = []
+        self.waiting_jobs = deque()
         self.resumptions = []
         self.task_migrations = []
+        self.preemptions = []
+        self.migrations = []
         self.abort_count = 0
         self.execute_date = None
         self.preempt_date = None
@@ -63,7 +130,7 @@ class TaskR(object):
         if self.waiting_jobs:
             self.preempt(date)
             self.waiting_jobs[0].terminate(date)
-            self.waiting_jobs.pop(0)
+            self._end_job()
             if self.waiting_jobs:
                 self.waiting_jobs[0].start(date)
             self.preempt_date = None
@@ -72,12 +139,15 @@ class TaskR(object):
         if self.waiting_jobs:
             self.preempt(date)
             self.waiting_jobs[0].abort(date)
-            self.waiting_jobs.pop(0)
+            self._end_job()
             self.abort_count += 1
             if self.waiting_jobs:
                 self.waiting_jobs[0].start(date)
             self.preempt_date = None
 
+    def _end_job(self):
+        self.waiting_jobs.popleft()
+
     def execute(self, date, cpu):
         if self.waiting_jobs:
             if self.waiting_jobs[0].computation_time == 0:
@@ -87,12 +157,14 @@ class TaskR(object):
                     self.task_migrations.append((date, self.waiting_jobs[0]))
             else:
                 if self.cpu == cpu:
+                    self.preemptions.append((date, self.waiting_jobs[0]))
                     self.waiting_jobs[0].preemption_count += 1
                     if date - self.preempt_date > self.delta_preemption:
                         self.waiting_jobs[0].preemption_delta_count += 1
                     if self.other_executed:
                         self.waiting_jobs[0].preemption_inter_count += 1
                 else:
+                    self.migrations.append((date, self.waiting_jobs[0]))
                     self.waiting_jobs[0].migration_count += 1
                     if date - self.preempt_date > self.delta_preemption:
                         self.waiting_jobs[0].migration_delta_count += 1
@@ -137,6 +209,17 @@ class TaskR(object):
     def preemption_inter_count(self):
         return sum(job.preemption_inter_count for job in self.jobs)
 
+    def response_time_stats(self):
+        """
+        Return the number of jobs that ended and the sum, the minimum and
+        the maximum of their response times (None if no job ended).
+        """
+        times = [job.response_time for job in self.jobs
+                 if job.response_time is not None]
+        if not times:
+            return 0, 0, None, None
+        return len(times), sum(times), min(times), max(times)
+
     @property
     def name(self):
         return self.task.name
@@ -196,6 +279,344 @@ class JobR(object):
         return self.job.task
 
 
+class _Count(object):
+    """
+    Stand-in for a list that only counts the elements appended to it.
+    """
+    def __init__(self):
+        self.count = 0
+
+    def append(self, _):
+        self.count += 1
+
+    def __len__(self):
+        return self.count
+
+
+class TaskSummaryR(TaskR):
+    """
+    TaskR that does not keep the ended jobs: their metrics are accumulated
+    when they end, so that the memory used does not depend on the duration
+    of the simulation. The resumptions, task migrations, preemptions and
+    migrations are only counted.
+
+    The attribute jobs is always empty, the JobR of the jobs not ended yet
+    are in waiting_jobs. Response times are available through job_count, response_time_sum,
+    response_time_min and response_time_max.
+    """
+    def __init__(self, task, delta_preemption=100):
+        TaskR.__init__(self, task, delta_preemption)
+        self.resumptions = _Count()
+        self.task_migrations = _Count()
+        self.preemptions = _Count()
+        self.migrations = _Count()
+        self.job_count = 0
+        self.response_time_sum = 0
+        self.response_time_min = None
+        self.response_time_max = None
+        self._exceeded_count = 0
+        self._migration_count = 0
+        self._preemption_count = 0
+        self._preemption_inter_count = 0
+
+    def add_job(self, date, job):
+        jobr = JobR(date, job)
+        self.waiting_jobs.append(jobr)
+        if len(self.waiting_jobs) == 1:
+            jobr.start(date)
+
+    def _end_job(self):
+        jobr = self.waiting_jobs.popleft()
+        self.job_count += 1
+        self.response_time_sum += jobr.response_time
+        if self.response_time_min is None or \
+                jobr.response_time < self.response_time_min:
+            self.response_time_min = jobr.response_time
+        if self.response_time_max is None or \
+                jobr.response_time > self.response_time_max:
+            self.response_time_max = jobr.response_time
+        if jobr.exceeded_deadline:
+            self._exceeded_count += 1
+        self._migration_count += jobr.migration_count
+        self._preemption_count += jobr.preemption_count
+        self._preemption_inter_count += jobr.preemption_inter_count
+
+    def response_time_stats(self):
+        return (self.job_count, self.response_time_sum,
+                self.response_time_min, self.response_time_max)
+
+    @property
+    def exceeded_count(self):
+        return self._exceeded_count + sum(
+            1 for job in self.waiting_jobs if job.exceeded_deadline)
+
+    @property
+    def migration_count(self):
+        return self._migration_count + sum(
+            job.migration_count for job in self.waiting_jobs)
+
+    @property
+    def preemption_count(self):
+        return self._preemption_count + sum(
+            job.preemption_count for job in self.waiting_jobs)
+
+    @property
+    def preemption_inter_count(self):
+        return self._preemption_inter_count + sum(
+            job.preemption_inter_count for job in self.waiting_jobs)
+
+
+class TasksR(object):
+    """
+    Build the TaskR of the tasks from their events, fed in the order they
+    were recorded.
+
+    The attribute tasks is a dictionary of TaskR where the key is the
+    original Task.
+    """
+    def __init__(self, task_list, processors, task_class=None):
+        self.tasks = {}
+        self._task_list = task_list
+        self._processors = processors
+        self._tasks_r = []
+        for task in task_list:
+            self.tasks[task] = (task_class or TaskR)(task)
+            self._tasks_r.append(self.tasks[task])
+
+        # Tasks preempted on each processor that have not seen another task
+        # executing on it since (see TaskR.other_executed).
+        self._preempted = dict((cpu, set()) for cpu in processors)
+        self._preempted[None] = set()
+        self._preempted_on = {}
+
+    def record(self, date, code, task, job, cpu):
+        """
+        Account for an event of a task. `task`, `job` and `cpu` are the
+        internal identifiers recorded in the traces.
+        """
+        preempted = self._preempted
+        preempted_on = self._preempted_on
+        task_r = self._tasks_r[task]
+        if code == JobEvent.ACTIVATE:
+            task_r.add_job(date, self._task_list[task].jobs[job])
+        elif code == JobEvent.TERMINATED:
+            task_r.terminate_job(date)
+        elif code == JobEvent.ABORTED:
+            task_r.abort_job(date)
+        elif code == JobEvent.EXECUTE:
+            cpu = self._processors[cpu]
+            task_r.execute(date, cpu)
+        elif code == JobEvent.PREEMPTED:
+            task_r.preempt(date)
+        elif code == JobEvent.DROPPED:
+            task_r.add_job(date, self._task_list[task].jobs[job])
+
+        if task_r in preempted_on:
+            preempted[preempted_on.pop(task_r)].discard(task_r)
+        if task_r.preempt_date and not task_r.other_executed:
+            preempted[task_r.cpu].add(task_r)
+            preempted_on[task_r] = task_r.cpu
+
+        if code == JobEvent.EXECUTE:
+            for rt in preempted[cpu]:
+                rt.other_executed = True
+                del preempted_on[rt]
+            preempted[cpu].clear()
+
+
+class WindowIndex(object):
+    """
+    Prefix-sum indices over a whole simulation, used to answer queries on
+    arbitrary windows [start, end] by binary search instead of analyzing
+    the events again.
+
+    The indices of the processors (time spent running, in overhead and
+    idle) and of the tasks (execution time and event counts) are built from
+    the traces the first time they are needed. The dates of the
+    preemptions, migrations and deadline misses come from a single analysis
+    of the whole simulation: a job preempted before `start` and resumed
+    inside the window counts as a preemption of the window, even if it was
+    activated before it.
+    """
+    def __init__(self, results):
+        self._results = results
+        self._procs = None
+        self._tasks = None
+        self._counts = None
+
+    @staticmethod
+    def _time_index(dates, states):
+        """
+        Index of the time spent in a state, given the dates at which it
+        changes and a boolean array telling whether the state holds after
+        each of these dates. Return the dates, the states and the time
+        spent in the state before each date.
+        """
+        elapsed = numpy.zeros(len(dates), dtype=numpy.int64)
+        if len(dates) > 1:
+            numpy.cumsum(numpy.diff(dates) * states[:-1], out=elapsed[1:])
+        return dates, states, elapsed
+
+    @staticmethod
+    def _time_until(index, date):
+        """
+        Time spent in the state of `index` from 0 to `date`.
+        """
+        dates, states, elapsed = index
+        i = int(numpy.searchsorted(dates, date, side='right')) - 1
+        if i < 0:
+            return 0
+        return int(elapsed[i]) + (date - int(dates[i])) * bool(states[i])
+
+    @classmethod
+    def _time_between(cls, index, start, end):
+        return cls._time_until(index, end) - cls._time_until(index, start)
+
+    @staticmethod
+    def _count_between(dates, start, end):
+        """
+        Number of elements of the sorted array `dates` inside [start, end].
+        """
+        return int(numpy.searchsorted(dates, end, side='right') -
+                   numpy.searchsorted(dates, start, side='left'))
+
+    def _window(self, window):
+        if window is None:
+            return self._results.observation_window
+        return window
+
+    def _build_processors(self):
+        self._procs = {}
+        for proc in self._results.model.processors:
+            arrays = proc.monitor.arrays()
+            dates, codes = arrays['date'], arrays['code']
+            self._procs[proc] = (
+                self._time_index(dates, codes == ProcEvent.RUN),
+                self._time_index(dates, codes == ProcEvent.OVERHEAD))
+
+    def _build_tasks(self):
+        # A task executes from an EXECUTE event until the next PREEMPTED,
+        # TERMINATED or ABORTED event.
+        self._tasks = {}
+        for task in self._results.model.task_list:
+            arrays = task.monitor.arrays()
+            dates, codes = arrays['date'], arrays['code']
+            changes = ((codes == JobEvent.EXECUTE) |
+                       (codes == JobEvent.PREEMPTED) |
+                       (codes == JobEvent.TERMINATED) |
+                       (codes == JobEvent.ABORTED))
+            last_change = numpy.maximum.accumulate(
+                numpy.where(changes, numpy.arange(len(codes)), -1))
+            running = ((last_change >= 0) &
+                       (codes[last_change] == JobEvent.EXECUTE))
+            self._tasks[task] = (
+                self._time_index(dates, running),
+                dict((code, dates[codes == code])
+                     for code in numpy.unique(codes).tolist()))
+
+    def _build_counts(self):
+        results = self._results
+        window = (0, results.model.now())
+        if results._observation_window == window and results._tasks:
+            tasks = results._tasks
+        else:
+            tasks = results._analyze_tasks(window)
+
+        def dates(pairs):
+            return numpy.array(sorted(date for date, _ in pairs),
+                               dtype=numpy.int64)
+
+        self._counts = {}
+        for task, task_r in tasks.items():
+            self._counts[task] = {
+                'preemption': dates(task_r.preemptions),
+                'migration': dates(task_r.migrations),
+                'deadline_miss': dates((job.end_date, job)
+                                       for job in task_r.jobs
+                                       if job.exceeded_deadline)
+            }
+
+    def processor_time(self, proc, window=None):
+        """
+        Return the time (run, overhead, idle), in cycles, spent by the
+        processor `proc` during `window` (by default, the observation
+        window).
+        """
+        if self._procs is None:
+            self._build_processors()
+        start, end = self._window(window)
+        run, overhead = self._procs[proc]
+        run = self._time_between(run, start, end)
+        overhead = self._time_between(overhead, start, end)
+        return run, overhead, end - start - run - overhead
+
+    def load(self, proc, window=None):
+        """
+        Return the load and the overhead of the processor `proc` during
+        `window`, as fractions of its duration.
+        """
+        start, end = self._window(window)
+        if end == start:
+            return 0.0, 0.0
+        run, overhead, _ = self.processor_time(proc, (start, end))
+        return (float(run) / (end - start),
+                float(overhead) / (end - start))
+
+    def executed_time(self, task, window=None):
+        """
+        Return the time, in cycles, during which the task `task` executed
+        during `window`.
+        """
+        if self._tasks is None:
+            self._build_tasks()
+        start, end = self._window(window)
+        return self._time_between(self._tasks[task][0], start, end)
+
+    def event_count(self, code, window=None, task=None):
+        """
+        Return the number of job events of type `code` (see
+        :class:`JobEvent <simso.core.JobEvent.JobEvent>`) of the task `task`
+        (all the tasks by default) during `window`.
+        """
+        if self._tasks is None:
+            self._build_tasks()
+        start, end = self._window(window)
+        empty = numpy.zeros(0, dtype=numpy.int64)
+        tasks = [task] if task is not None else self._results.model.task_list
+        return sum(self._count_between(self._tasks[t][1].get(code, empty),
+                                       start, end) for t in tasks)
+
+    def _count(self, name, window, task):
+        if self._counts is None:
+            self._build_counts()
+        start, end = self._window(window)
+        tasks = [task] if task is not None else self._results.model.task_list
+        return sum(self._count_between(self._counts[t][name], start, end)
+                   for t in tasks)
+
+    def preemption_count(self, window=None, task=None):
+        """
+        Return the number of preemptions of the task `task` (all the tasks
+        by default) during `window`.
+        """
+        return self._count('preemption', window, task)
+
+    def migration_count(self, window=None, task=None):
+        """
+        Return the number of job migrations of the task `task` (all the
+        tasks by default) during `window`.
+        """
+        return self._count('migration', window, task)
+
+    def deadline_miss_count(self, window=None, task=None):
+        """
+        Return the number of jobs of the task `task` (all the tasks by
+        default) that ended during `window` after their deadline or that
+        were aborted.
+        """
+        return self._count('deadline_miss', window, task)
+
+
 class Results(object):
     """
     This class embeds and analyzes all the results from the simulation.
@@ -207,6 +628,14 @@ class Results(object):
         - `processors`: a dictionary of ProcessorR where the key is the \
             original Processor.
 
+    If the simulation stopped early because its schedule became periodic
+    (`steady_state` is set), the totals (:attr:`total_preemptions`,
+    :attr:`total_exceeded_count`, :attr:`total_timers`...) and the load
+    given by :meth:`calc_load` are extrapolated to the whole duration of the
+    simulation, like :meth:`summary`. The `tasks`, `scheduler` and
+    `processors` objects and the :attr:`index` only describe the simulated
+    part, (0, steady_state.end): reading them emits a RuntimeWarning.
+
     .
     """
     def __init__(self, model):
@@ -214,128 +643,189 @@ class Results(object):
         self.error = None
         self._observation_window = None
 
-        self.tasks = {}
-        self.scheduler = None
-        self.processors = {}
-        self.total_timers = 0
+        self._tasks = {}
+        self._scheduler = None
+        self._processors = {}
+        self._total_timers = 0
         self.timers = None
+        self._index = None
+        # SteadyState object if the simulation stopped once the schedule
+        # became periodic (see Model), and summary extrapolated from it.
+        self.steady_state = None
+        self._extrapolated = None
 
     def end(self):
         self._analyze()
 
+    def _warn_partial(self, name):
+        if self.steady_state is not None:
+            warnings.warn(
+                "The simulation stopped at {} once its schedule repeated: "
+                "`{}` only describes the simulated part, use summary() or "
+                "the totals for the whole duration.".format(
+                    self.steady_state.end, name),
+                RuntimeWarning, stacklevel=3)
+
+    @property
+    def tasks(self):
+        self._warn_partial('tasks')
+        return self._tasks
+
+    @tasks.setter
+    def tasks(self, tasks):
+        self._tasks = tasks
+
+    @property
+    def scheduler(self):
+        self._warn_partial('scheduler')
+        return self._scheduler
+
+    @scheduler.setter
+    def scheduler(self, scheduler):
+        self._scheduler = scheduler
+
+    @property
+    def processors(self):
+        self._warn_partial('processors')
+        return self._processors
+
+    @processors.setter
+    def processors(self, processors):
+        self._processors = processors
+
     def tasks_event(self):
         """
         Generator of the tasks events sorted by their date.
+
+        The events of each task are already sorted, they are merged using a
+        heap keyed on their sequence number (the `id_` of the events).
         """
-        monitors = {}
-        indices = {}
-        for task in self.model.task_list:
-            monitors[task] = task.monitor
-            indices[task] = 0
-
-        while True:
-            m = None
-            for task in self.model.task_list:
-                if indices[task] < len(monitors[task]):
-                    evt = monitors[task][indices[task]]
-                    if m is None or evt[1].id_ < m[0][1].id_:
-                        m = (evt, task)
-            if m is None:
-                break
-            indices[m[1]] += 1
-            yield m
+        def events(task):
+            for index, seq in enumerate(task.monitor.column('seq').tolist()):
+                yield seq, index, task
+
+        for _, index, task in heapq.merge(
+                *[events(task) for task in self.model.task_list]):
+            yield (task.monitor[index], task)
+
+    def _window(self, trace):
+        """
+        Return the columns of `trace` restricted to the events inside the
+        observation window, as numpy arrays.
+        """
+        arrays = trace.arrays()
+        date = arrays['date']
+        keep = ((date >= self.observation_window[0]) &
+                (date <= self.observation_window[1]))
+        return dict((name, column[keep]) for name, column in arrays.items())
+
+    def _elapsed(self, date):
+        """
+        Time elapsed since the previous event (or since the beginning of
+        the observation window) for each event of `date`.
+        """
+        return numpy.diff(date, prepend=self.observation_window[0])
 
     def _generate_tasks(self):
-        self.tasks = {}
+        self._tasks = self._analyze_tasks(self.observation_window)
+
+    def _analyze_tasks(self, window):
+        """
+        Return a dictionary of TaskR built from the events of the tasks
+        that occur inside `window`.
+        """
+        tasks_r = TasksR(self.model.task_list, self.model.processors)
 
-        for task in self.model.task_list:
-            self.tasks[task] = TaskR(task)
+        # Events of all the tasks, in the order they were recorded.
+        columns = [task.monitor.arrays() for task in self.model.task_list]
+        if not columns:
+            return tasks_r.tasks
+        arrays = dict((name, numpy.concatenate([c[name] for c in columns]))
+                      for name in ('date', 'seq', 'code', 'task', 'job',
+                                   'cpu'))
+        date = arrays['date']
+        keep = (date >= window[0]) & (date <= window[1])
+        order = numpy.argsort(arrays['seq'][keep], kind='stable')
+        record = tasks_r.record
+        for event in zip(*[arrays[name][keep][order].tolist()
+                           for name in ('date', 'code', 'task', 'job',
+                                        'cpu')]):
+            record(*event)
+        return tasks_r.tasks
 
-        for evt, task in self.tasks_event():
-            if (evt[0] < self.observation_window[0] or
-                    evt[0] > self.observation_window[1]):
-                # The events that start before the observation window should
-                # maybe be stored...
-                continue
-            if evt[1].event == JobEvent.ACTIVATE:
-                self.tasks[task].add_job(evt[0], evt[1].job)
-            elif evt[1].event == JobEvent.TERMINATED:
-                self.tasks[task].terminate_job(evt[0])
-            elif evt[1].event == JobEvent.ABORTED:
-                self.tasks[task].abort_job(evt[0])
-            elif evt[1].event == JobEvent.EXECUTE:
-                self.tasks[task].execute(evt[0], evt[1].cpu)
-                for rt in self.tasks.values():
-                    if rt.preempt_date and evt[1].cpu == rt.cpu:
-                        rt.other_executed = True
-            elif evt[1].event == JobEvent.PREEMPTED:
-                self.tasks[task].preempt(evt[0])
-            elif evt[1].event == JobEvent.DROPPED:
-                self.tasks[task].add_job(evt[0], evt[1].job)
+    @staticmethod
+    def _payload_mask(trace, payload, value):
+        """
+        Mask of the events of the `payload` column of `trace` whose payload
+        is `value`.
+        """
+        index = trace.payload_index(value)
+        if index < 0:
+            return numpy.zeros(len(payload), dtype=bool)
+        return payload == index
 
     def _generate_scheduler(self):
-        self.scheduler = SchedulerR()
-        last = self.observation_window[0]
-        for t, evt in self.model.scheduler.monitor:
-            if (t < self.observation_window[0] or
-                    t > self.observation_window[1]):
-                continue
+        self._scheduler = SchedulerR(self.model.task_list,
+                                     self.observation_window[0])
+        columns = self._window(self.model.scheduler.monitor)
+        code = columns['code']
+        elapsed = self._elapsed(columns['date'])
+
+        # The overhead of an operation is the time elapsed between its
+        # BEGIN and END events.
+        for name, begin, end in (
+                ('schedule', SchedulerEvent.BEGIN_SCHEDULE,
+                 SchedulerEvent.END_SCHEDULE),
+                ('activate', SchedulerEvent.BEGIN_ACTIVATE,
+                 SchedulerEvent.END_ACTIVATE),
+                ('terminate', SchedulerEvent.BEGIN_TERMINATE,
+                 SchedulerEvent.END_TERMINATE)):
+            setattr(self._scheduler, name + '_count',
+                    int(numpy.count_nonzero(code == begin)))
+            setattr(self._scheduler, name + '_overhead',
+                    int(elapsed[code == end].sum()))
+        self._scheduler.mc_mode_switch_count = int(numpy.count_nonzero(
+            code == SchedulerEvent.MODE_SWITCH_UP))
+        self._scheduler.mc_mode_resume_count = int(numpy.count_nonzero(
+            code == SchedulerEvent.MODE_SWITCH_DOWN))
 
-            if evt.event == SchedulerEvent.BEGIN_SCHEDULE:
-                self.scheduler.schedule_count += 1
-            elif evt.event == SchedulerEvent.END_SCHEDULE:
-                self.scheduler.schedule_overhead += t - last
-            elif evt.event == SchedulerEvent.BEGIN_ACTIVATE:
-                self.scheduler.activate_count += 1
-            elif evt.event == SchedulerEvent.END_ACTIVATE:
-                self.scheduler.activate_overhead += t - last
-            elif evt.event == SchedulerEvent.BEGIN_TERMINATE:
-                self.scheduler.terminate_count += 1
-            elif evt.event == SchedulerEvent.END_TERMINATE:
-                self.scheduler.terminate_overhead += t - last
-            elif evt.event == SchedulerEvent.MODE_SWITCH_UP:
-                self.scheduler.mc_mode_switch_count += 1
-            elif evt.event == SchedulerEvent.MODE_SWITCH_DOWN:
-                self.scheduler.mc_mode_resume_count += 1
-            elif evt.event == SchedulerEvent.DROPPED_JOB:
-                if evt.job._task.name not in self.scheduler.mc_dropped_job_count:
-                    self.scheduler.mc_dropped_job_count[evt.job._task.name] = []
-                self.scheduler.mc_dropped_job_count[evt.job._task.name].append(evt.job)
-            last = t
+        dropped = code == SchedulerEvent.DROPPED_JOB
+        for task, job in zip(columns['task'][dropped].tolist(),
+                             columns['job'][dropped].tolist()):
+            self._scheduler.drop_job(task, job)
 
     def _generate_processors(self):
-        self.processors = {}
+        self._processors = {}
         for proc in self.model.processors:
-            proc_r = ProcessorR()
-            self.processors[proc] = proc_r
-            last = self.observation_window[0]
-            for t, evt in proc.monitor:
-                if (t < self.observation_window[0] or
-                        t > self.observation_window[1]):
-                    continue
-                if evt.event == ProcEvent.OVERHEAD and evt.args == "CS":
-                    if evt.terminated:
-                        proc_r.context_save_overhead += t - last
-                    else:
-                        proc_r.context_save_count += 1
-                if evt.event == ProcEvent.OVERHEAD and evt.args == "CL":
-                    if evt.terminated:
-                        proc_r.context_load_overhead += t - last
-                    else:
-                        proc_r.context_load_count += 1
-                last = t
+            proc_r = ProcessorR(self.observation_window[0])
+            self._processors[proc] = proc_r
+            columns = self._window(proc.monitor)
+            elapsed = self._elapsed(columns['date'])
+
+            # Context switches are recorded with a (type, terminated)
+            # payload.
+            def events(value):
+                return self._payload_mask(proc.monitor, columns['payload'],
+                                          value)
+
+            proc_r.context_save_overhead = int(
+                elapsed[events(("CS", True))].sum())
+            proc_r.context_save_count = int(
+                numpy.count_nonzero(events(("CS", False))))
+            proc_r.context_load_overhead = int(
+                elapsed[events(("CL", True))].sum())
+            proc_r.context_load_count = int(
+                numpy.count_nonzero(events(("CL", False))))
 
     def _compute_timers(self):
-        self.total_timers = 0
+        self._total_timers = 0
         self.timers = {}
         for proc in self.model.processors:
-            self.timers[proc] = 0
-            for t, evt in proc.timer_monitor:
-                if (t < self.observation_window[0] or
-                        t > self.observation_window[1]):
-                    continue
-                self.total_timers += 1
-                self.timers[proc] += 1
+            date = proc.timer_monitor.column('date')
+            self.timers[proc] = int(numpy.count_nonzero(
+                (date >= self.observation_window[0]) &
+                (date <= self.observation_window[1])))
+            self._total_timers += self.timers[proc]
 
     def _analyze(self):
         self._generate_tasks()
@@ -348,7 +838,11 @@ class Results(object):
         Get the observation window.
         """
         if self._observation_window is None:
-            self._observation_window = (0, self.model.now())
+            if self.steady_state is not None:
+                # The simulation stopped just after this date.
+                self._observation_window = (0, self.steady_state.end)
+            else:
+                self._observation_window = (0, self.model.now())
         return self._observation_window
 
     def set_observation_window(self, window):
@@ -362,75 +856,549 @@ class Results(object):
     observation_window = property(get_observation_window,
                                   set_observation_window)
 
+    @property
+    def index(self):
+        """
+        The :class:`WindowIndex` of the simulation, to get the load of the
+        processors or the number of preemptions, migrations and deadline
+        misses on any window without changing the observation window.
+        """
+        self._warn_partial('index')
+        return self._window_index()
+
+    def _window_index(self):
+        if self._index is None:
+            self._index = WindowIndex(self)
+        return self._index
+
     @property
     def observation_window_duration(self):
         return self.observation_window[1] - self.observation_window[0]
 
     @property
     def total_migrations(self):
-        migrations = 0
-        for task in self.tasks.values():
-            migrations += task.migration_count
-        return migrations
+        if self.steady_state is not None:
+            return self.summary().total_migrations
+        return sum(task.migration_count for task in self._tasks.values())
 
     @property
     def total_preemptions(self):
-        preemptions = 0
-        for task in self.tasks.values():
-            preemptions += task.preemption_count
-        return preemptions
+        if self.steady_state is not None:
+            return self.summary().total_preemptions
+        return sum(task.preemption_count for task in self._tasks.values())
 
     @property
     def total_task_migrations(self):
-        migrations = 0
-        for task in self.tasks.values():
-            migrations += task.task_migration_count
-        return migrations
+        if self.steady_state is not None:
+            return self.summary().total_task_migrations
+        return sum(task.task_migration_count
+                   for task in self._tasks.values())
 
     @property
     def total_task_resumptions(self):
-        resumptions = 0
-        for task in self.tasks.values():
-            resumptions += task.resumption_count
-        return resumptions
+        if self.steady_state is not None:
+            return self.summary().total_task_resumptions
+        return sum(task.resumption_count for task in self._tasks.values())
 
     @property
     def total_exceeded_count(self):
-        count = 0
-        for task in self.tasks.values():
-            count += task.exceeded_count
-        return count
+        if self.steady_state is not None:
+            return self.summary().total_exceeded_count
+        return sum(task.exceeded_count for task in self._tasks.values())
 
-    def calc_load(self):
+    @property
+    def total_timers(self):
+        if self.steady_state is not None:
+            return self.summary().total_timers
+        return self._total_timers
+
+    def summary(self):
+        """
+        Return a :class:`ResultsSummary` of these results, detached from the
+        model. If the simulation stopped early because the schedule became
+        periodic, the metrics are extrapolated to the whole duration of the
+        simulation (see :class:`SteadyState
+        <simso.core.SteadyState.SteadyState>`).
+        """
+        if self.steady_state is not None:
+            if self._extrapolated is None:
+                self._extrapolated = self.steady_state.extrapolate(self)
+            return self._extrapolated
+        return ResultsSummary.from_results(self)
+
+    def _extrapolated_load(self):
+        processors = self.summary().processors
+        for proc in self.model.processors:
+            metrics = processors[proc.identifier]
+            yield (proc, metrics['load'], metrics['overhead'])
+
+    def calc_load(self, window=None):
         """
-        Yield a tuple (proc, load, overhead) for each processor.
+        Yield a tuple (proc, load, overhead) for each processor, over
+        `window` (by default, the observation window, or the whole
+        duration extrapolated if the simulation stopped early).
         """
+        if window is None and self.steady_state is not None:
+            return self._extrapolated_load()
+        return self._calc_load(window or self.observation_window)
+
+    def _calc_load(self, window):
         for proc in self.model.processors:
-            sum_run = 0
-            sum_overhead = 0
-            last_event = ProcEvent.IDLE
-            x1 = self.observation_window[0]
-            for evt in proc.monitor:
-                current_date = evt[0]
-                if current_date < self.observation_window[0]:
-                    last_event = evt[1].event
-                    continue
-                if current_date >= self.observation_window[1]:
-                    break
-
-                if last_event == ProcEvent.RUN:
-                    sum_run += current_date - x1
-                elif last_event == ProcEvent.OVERHEAD:
-                    sum_overhead += current_date - x1
-
-                x1 = current_date
-                last_event = evt[1].event
-
-            if last_event == ProcEvent.RUN:
-                sum_run += self.observation_window[1] - x1
-            elif last_event == ProcEvent.OVERHEAD:
-                sum_overhead += self.observation_window[1] - x1
-
-            yield (proc,
-                   float(sum_run) / self.observation_window_duration,
-                   float(sum_overhead) / self.observation_window_duration)
+            load, overhead = self._window_index().load(proc, window)
+            yield (proc, load, overhead)
+
+
+class StreamingResults(Results):
+    """
+    Results computed while the simulation runs, for long simulations where
+    only the aggregated metrics are needed. The events of the tasks, of the
+    processors and of the scheduler are fed to the TaskSummaryR, ProcessorR
+    and SchedulerR objects as they are recorded and the traces (and the
+    logs) are not stored, so that the memory used does not depend on the
+    duration of the simulation.
+
+    The metrics are the same as the ones computed by :class:`Results` on
+    the whole simulation, but the observation window cannot be changed and
+    the events cannot be iterated.
+    """
+    def __init__(self, model):
+        Results.__init__(self, model)
+        self._tasks_r = TasksR(model.task_list, model.processors,
+                               TaskSummaryR)
+        self._tasks = self._tasks_r.tasks
+        # The dropped jobs are counted, not kept alive.
+        self._scheduler = SchedulerR(model.task_list, keep_jobs=False)
+        self._processors = {}
+        self.timers = {}
+        # Processor -> [state, date of the last event, run time, overhead].
+        self._load = {}
+
+        for task in model.task_list:
+            task.monitor.stream_to(self._record_task)
+        for proc in model.processors:
+            self._processors[proc] = ProcessorR()
+            self.timers[proc] = 0
+            self._load[proc] = [ProcEvent.IDLE, 0, 0, 0]
+            proc.monitor.stream_to(partial(self._record_processor, proc))
+            proc.timer_monitor.stream_to(partial(self._record_timer, proc))
+        model.scheduler.monitor.stream_to(self._record_scheduler)
+        model.logs.stream_to(self._discard)
+
+    # The sinks of the traces are methods so that the results can be saved
+    # with the model (see Model.checkpoint).
+    def _record_task(self, code=0, task=-1, job=-1, cpu=-1, payload=None):
+        self._tasks_r.record(self.model.now(), code, task, job, cpu)
+
+    def _record_scheduler(self, code=0, task=-1, job=-1, cpu=-1,
+                          payload=None):
+        self._scheduler.record(self.model.now(), code, task, job)
+
+    def _record_processor(self, proc, code=0, task=-1, job=-1, cpu=-1,
+                          payload=None):
+        date = self.model.now()
+        self._processors[proc].record(date, payload)
+        load = self._load[proc]
+        self._account(load, date)
+        load[0] = code
+
+    def _record_timer(self, proc, code=0, task=-1, job=-1, cpu=-1,
+                      payload=None):
+        self.timers[proc] += 1
+
+    @staticmethod
+    def _discard(code=0, task=-1, job=-1, cpu=-1, payload=None):
+        pass
+
+    @staticmethod
+    def _account(load, date):
+        if load[0] == ProcEvent.RUN:
+            load[2] += date - load[1]
+        elif load[0] == ProcEvent.OVERHEAD:
+            load[3] += date - load[1]
+        load[1] = date
+
+    def end(self):
+        self._observation_window = None
+        self._total_timers = sum(self.timers.values())
+
+    def snapshot(self, date):
+        """
+        Return the :class:`ResultsSummary` of the events recorded so far,
+        the observation window ending at `date` (the date of the last
+        event or later). Used while the simulation runs.
+        """
+        window = self._observation_window
+        self._observation_window = (0, date)
+        try:
+            return ResultsSummary.from_results(self)
+        finally:
+            self._observation_window = window
+
+    def set_observation_window(self, window):
+        raise NotImplementedError(
+            "The observation window of streamed results cannot be changed.")
+
+    observation_window = property(Results.get_observation_window,
+                                  set_observation_window)
+
+    def tasks_event(self):
+        raise NotImplementedError("The events were not stored.")
+
+    @property
+    def index(self):
+        raise NotImplementedError("The events were not stored.")
+
+    def calc_load(self, window=None):
+        """
+        Yield a tuple (proc, load, overhead) for each processor (see
+        :meth:`Results.calc_load`).
+        """
+        if window is None and self.steady_state is not None:
+            return self._extrapolated_load()
+        return self._calc_load(window)
+
+    def _calc_load(self, window):
+        if window is not None and tuple(window) != self.observation_window:
+            raise NotImplementedError(
+                "The load of streamed results is only available on the "
+                "whole simulation.")
+        end = self.observation_window[1]
+        duration = self.observation_window_duration
+        for proc in self.model.processors:
+            state, last, run, overhead = self._load[proc]
+            if state == ProcEvent.RUN:
+                run += end - last
+            elif state == ProcEvent.OVERHEAD:
+                overhead += end - last
+            if not duration:
+                yield proc, 0.0, 0.0
+                continue
+            yield (proc, float(run) / duration, float(overhead) / duration)
+
+
+class ResultsSummary(object):
+    """
+    Main metrics of a simulation, as plain numbers. Unlike :class:`Results`,
+    a summary holds no reference to the model, so it can be pickled, sent
+    to another process or stored (see :meth:`save_json` and
+    :meth:`save_npz`).
+
+    Attributes:
+        - `observation_window`: (start, end) of the observation window, in \
+        cycles.
+        - `cycles_per_ms`: Number of cycles per millisecond.
+        - `tasks`: Dictionary of the metrics of each task, keyed by task \
+        identifier (see :attr:`TASK_FIELDS`).
+        - `processors`: Dictionary of the metrics of each processor, keyed \
+        by processor identifier (see :attr:`PROCESSOR_FIELDS`).
+        - `scheduler`: Dictionary of the counters of the scheduler (see \
+        :attr:`SCHEDULER_FIELDS`).
+        - `mc_dropped_job_count`: Number of jobs dropped by a \
+        mixed-criticality scheduler, keyed by task name.
+    """
+    TASK_FIELDS = ('preemption_count', 'preemption_inter_count',
+                   'migration_count', 'exceeded_count', 'abort_count',
+                   'resumption_count', 'task_migration_count', 'job_count',
+                   'response_time_sum', 'response_time_min',
+                   'response_time_max')
+    PROCESSOR_FIELDS = ('load', 'overhead', 'context_save_overhead',
+                        'context_save_count', 'context_load_overhead',
+                        'context_load_count', 'timers')
+    SCHEDULER_FIELDS = ('schedule_overhead', 'activate_overhead',
+                        'terminate_overhead', 'schedule_count',
+                        'activate_count', 'terminate_count',
+                        'mc_mode_switch_count', 'mc_mode_resume_count')
+
+    def __init__(self, observation_window, cycles_per_ms, tasks, processors,
+                 scheduler, mc_dropped_job_count=None):
+        self.observation_window = tuple(observation_window)
+        self.cycles_per_ms = cycles_per_ms
+        self.tasks = tasks
+        self.processors = processors
+        self.scheduler = scheduler
+        self.mc_dropped_job_count = mc_dropped_job_count or {}
+
+    @classmethod
+    def from_results(cls, results):
+        """
+        Build the summary of a :class:`Results` object. Raise a ValueError
+        if several tasks or several processors have the same identifier.
+        """
+        tasks = {}
+        for task, task_r in results._tasks.items():
+            if task.identifier in tasks:
+                raise ValueError("Several tasks have the identifier {}."
+                                 .format(task.identifier))
+            metrics = {'name': task.name}
+            for field in cls.TASK_FIELDS[:7]:
+                metrics[field] = getattr(task_r, field)
+            (metrics['job_count'], metrics['response_time_sum'],
+             metrics['response_time_min'], metrics['response_time_max']) = \
+                task_r.response_time_stats()
+            tasks[task.identifier] = metrics
+
+        processors = {}
+        for proc, load, overhead in results.calc_load(
+                results.observation_window):
+            if proc.identifier in processors:
+                raise ValueError("Several processors have the identifier {}."
+                                 .format(proc.identifier))
+            proc_r = results._processors[proc]
+            metrics = {'name': proc.name, 'load': load, 'overhead': overhead,
+                       'timers': results.timers[proc]}
+            for field in cls.PROCESSOR_FIELDS[2:6]:
+                metrics[field] = getattr(proc_r, field)
+            processors[proc.identifier] = metrics
+
+        scheduler = dict((field, getattr(results._scheduler, field))
+                         for field in cls.SCHEDULER_FIELDS)
+        dropped = dict(
+            (name, jobs if isinstance(jobs, int) else len(jobs))
+            for name, jobs in
+            results._scheduler.mc_dropped_job_count.items())
+
+        return cls(results.observation_window, results.model.cycles_per_ms,
+                   tasks, processors, scheduler, dropped)
+
+    @property
+    def observation_window_duration(self):
+        return self.observation_window[1] - self.observation_window[0]
+
+    def extrapolate(self, previous, partial, repeats, end):
+        """
+        Return the summary of a simulation ending at `end` whose schedule
+        between the ends of `previous` and of this summary repeats `repeats`
+        more times, then until the date that corresponds to the end of
+        `partial`. All the observation windows must start at 0.
+
+        Args:
+            - `previous`: Summary at the beginning of the repeated period.
+            - `partial`: Summary at the date of the repeated period that \
+            corresponds to `end`.
+            - `repeats`: Number of full periods after this summary.
+            - `end`: Date of the end of the simulation.
+        """
+        summaries = (self, previous, partial)
+
+        def combine(current, before, part):
+            return current + repeats * (current - before) + part - before
+
+        def combine_fields(items, fields):
+            result = dict(items[0])
+            for field in fields:
+                result[field] = combine(*[x[field] for x in items])
+            return result
+
+        tasks = {}
+        for ident in self.tasks:
+            tasks[ident] = combine_fields(
+                [s.tasks[ident] for s in summaries],
+                [f for f in self.TASK_FIELDS
+                 if f not in ('response_time_min', 'response_time_max')])
+
+        processors = {}
+        for ident in self.processors:
+            items = [s.processors[ident] for s in summaries]
+            processors[ident] = combine_fields(
+                items, [f for f in self.PROCESSOR_FIELDS
+                        if f not in ('load', 'overhead')])
+            for field in ('load', 'overhead'):
+                # Durations, in cycles, rather than fractions of the windows.
+                times = [int(round(x[field] * s.observation_window_duration))
+                         for x, s in zip(items, summaries)]
+                processors[ident][field] = float(combine(*times)) / end
+
+        scheduler = combine_fields([s.scheduler for s in summaries],
+                                   self.SCHEDULER_FIELDS)
+        dropped = dict(
+            (name, combine(*[s.mc_dropped_job_count.get(name, 0)
+                             for s in summaries]))
+            for name in set(self.mc_dropped_job_count) |
+            set(partial.mc_dropped_job_count))
+
+        return ResultsSummary((0, end), self.cycles_per_ms, tasks,
+                              processors, scheduler, dropped)
+
+    @property
+    def total_migrations(self):
+        return sum(task['migration_count'] for task in self.tasks.values())
+
+    @property
+    def total_preemptions(self):
+        return sum(task['preemption_count'] for task in self.tasks.values())
+
+    @property
+    def total_task_migrations(self):
+        return sum(task['task_migration_count']
+                   for task in self.tasks.values())
+
+    @property
+    def total_task_resumptions(self):
+        return sum(task['resumption_count'] for task in self.tasks.values())
+
+    @property
+    def total_exceeded_count(self):
+        return sum(task['exceeded_count'] for task in self.tasks.values())
+
+    @property
+    def total_timers(self):
+        return sum(proc['timers'] for proc in self.processors.values())
+
+    def to_dict(self):
+        """
+        Return the summary as a dictionary that can be serialized to JSON
+        (the identifiers of the tasks and processors become strings).
+        """
+        return {
+            'observation_window': list(self.observation_window),
+            'cycles_per_ms': self.cycles_per_ms,
+            'tasks': dict((str(k), v) for k, v in self.tasks.items()),
+            'processors': dict((str(k), v)
+                               for k, v in self.processors.items()),
+            'scheduler': self.scheduler,
+            'mc_dropped_job_count': self.mc_dropped_job_count
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a summary from the output of :meth:`to_dict`.
+        """
+        return cls(data['observation_window'], data['cycles_per_ms'],
+                   dict((int(k), v) for k, v in data['tasks'].items()),
+                   dict((int(k), v) for k, v in data['processors'].items()),
+                   data['scheduler'], data['mc_dropped_job_count'])
+
+    def save_json(self, filename):
+        """
+        Save the summary to a JSON file.
+        """
+        with open(filename, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load_json(cls, filename):
+        """
+        Load a summary saved with :meth:`save_json`.
+        """
+        with open(filename) as f:
+            return cls.from_dict(json.load(f))
+
+    def save_npz(self, filename):
+        """
+        Save the summary to a numpy .npz file, with one array per metric
+        (e.g. `task_preemption_count`, indexed like `task_id`). A missing
+        response time (task without any ended job) is stored as -1.
+        """
+        arrays = {
+            'observation_window': numpy.array(self.observation_window),
+            'cycles_per_ms': numpy.array(self.cycles_per_ms),
+            'mc_dropped_task': numpy.array(
+                list(self.mc_dropped_job_count.keys()), dtype=str),
+            'mc_dropped_job_count': numpy.array(
+                list(self.mc_dropped_job_count.values()), dtype=numpy.int64)
+        }
+        for prefix, items, fields in (
+                ('task', self.tasks, self.TASK_FIELDS),
+                ('processor', self.processors, self.PROCESSOR_FIELDS)):
+            ids = sorted(items)
+            arrays[prefix + '_id'] = numpy.array(ids, dtype=numpy.int64)
+            arrays[prefix + '_name'] = numpy.array(
+                [items[i]['name'] for i in ids], dtype=str)
+            for field in fields:
+                values = [items[i][field] for i in ids]
+                if field in ('load', 'overhead'):
+                    arrays[prefix + '_' + field] = numpy.array(
+                        values, dtype=float)
+                else:
+                    arrays[prefix + '_' + field] = numpy.array(
+                        [-1 if v is None else v for v in values],
+                        dtype=numpy.int64)
+        for field in self.SCHEDULER_FIELDS:
+            arrays['scheduler_' + field] = numpy.array(self.scheduler[field])
+        numpy.savez(filename, **arrays)
+
+    @classmethod
+    def load_npz(cls, filename):
+        """
+        Load a summary saved with :meth:`save_npz`.
+        """
+        with numpy.load(filename) as data:
+            items = {}
+            for prefix, fields in (('task', cls.TASK_FIELDS),
+                                   ('processor', cls.PROCESSOR_FIELDS)):
+                items[prefix] = {}
+                columns = dict((field, data[prefix + '_' + field].tolist())
+                               for field in fields)
+                for i, ident in enumerate(data[prefix + '_id'].tolist()):
+                    metrics = {'name': str(data[prefix + '_name'][i])}
+                    for field in fields:
+                        metrics[field] = columns[field][i]
+                    items[prefix][ident] = metrics
+            for metrics in items['task'].values():
+                for field in ('response_time_min', 'response_time_max'):
+                    if metrics[field] == -1:
+                        metrics[field] = None
+            scheduler = dict((field, data['scheduler_' + field].item())
+                             for field in cls.SCHEDULER_FIELDS)
+            dropped = dict(zip(data['mc_dropped_task'].tolist(),
+                               data['mc_dropped_job_count'].tolist()))
+            return cls(data['observation_window'].tolist(),
+                       data['cycles_per_ms'].item(), items['task'],
+                       items['processor'], scheduler, dropped)
+
+
+class DeadlineMiss(object):
+    """
+    First deadline miss of a simulation run with `stop_on_miss` (see
+    :class:`Model <simso.core.Model.Model>`): a job that terminated after
+    its deadline or that was aborted.
+
+    Attributes:
+        - `job`: The :class:`job <simso.core.Job.Job>` that missed its \
+        deadline.
+        - `date`: Date of the miss (end or abort of the job), in cycles.
+        - `job_count`: Number of jobs released until then, all the tasks \
+        included.
+    """
+    def __init__(self, model, job):
+        self.job = job
+        self.date = model.now()
+        self.cycles_per_ms = model.cycles_per_ms
+        self.job_count = sum(task._job_count for task in model.task_list)
+
+    @property
+    def task(self):
+        """
+        The task of the job.
+        """
+        return self.job.task
+
+    @property
+    def date_ms(self):
+        """
+        Date of the miss, in ms.
+        """
+        return float(self.date) / self.cycles_per_ms
+
+    def summary(self):
+        """
+        The miss as a dictionary of plain values, which can be pickled or
+        stored.
+        """
+        job = self.job
+        return {
+            'task': job.task.name,
+            'task_identifier': job.task.identifier,
+            'job': job.name,
+            'aborted': job.aborted,
+            'date': self.date_ms,
+            'activation_date': job.activation_date,
+            'absolute_deadline': job.absolute_deadline,
+            'computation_time': job.computation_time,
+            'job_count': self.job_count
+        }
+
+    def __repr__(self):
+        return "DeadlineMiss(job={}, date={})".format(self.job.name,
+                                                      self.date_ms)
@@ -14,6 +14,10 @@ class EDF(Scheduler):
     def on_terminated(self, job):
         job.cpu.resched()
 
+    def steady_state_signature(self):
+        # The decisions only depend on the jobs.
+        return ()
+
     def schedule(self, cpu):
         # List of ready jobs not currently running:
         ready_jobs = [t.job for t in self.task_list
@@ -10,10 +10,6 @@ from fractions import Fraction
 from math import ceil
 from simso.schedulers import scheduler
 
-migrating_tasks = {}
-
-# Mapping processor to scheduler.
-map_cpu_sched = {}
 
 class EDF_modified(Scheduler):
     """
@@ -52,9 +48,10 @@ class EDF_modified(Scheduler):
 
     def end_migrating_job(self, i):
         self.processors[0].resched()
+        migrating_tasks = self.edhs.migrating_tasks
         if self.migrating_job and i < len(migrating_tasks[self.migrating_job.task]) - 1:
             ncpu, nbudget = migrating_tasks[self.migrating_job.task][i + 1]
-            sched = map_cpu_sched[ncpu]
+            sched = self.edhs.map_cpu_sched[ncpu]
             sched.accept_migrating_job(i + 1, self.migrating_job, nbudget)
         self.migrating_job = None
 
@@ -74,6 +71,10 @@ class EDHS(Scheduler):
     def init(self):
         # Mapping task to scheduler.
         self.map_task_sched = {}
+        # Mapping processor to scheduler.
+        self.map_cpu_sched = {}
+        # Mapping migrating task to its list of (processor, budget).
+        self.migrating_tasks = {}
 
         cpus = []
         for cpu in self.processors:
@@ -82,11 +83,12 @@ class EDHS(Scheduler):
 
             # Instantiate a scheduler.
             sched = EDF_modified(self.sim, SchedulerInfo())
+            sched.edhs = self
             sched.add_processor(cpu)
             sched.init()
 
             # Affect the scheduler to the processor.
-            map_cpu_sched[cpu] = sched
+            self.map_cpu_sched[cpu] = sched
 
         # First Fit
         for task in self.task_list:
@@ -95,13 +97,13 @@ class EDHS(Scheduler):
             while cpus[j][1] + Fraction(task.wcet) / Fraction(task.period) > 1.0:
                 j += 1
                 if j >= len(self.processors):
-                    migrating_tasks[task] = []
+                    self.migrating_tasks[task] = []
                     break
             if j == len(self.processors):
                 continue
 
             # Get the scheduler for this processor.
-            sched = map_cpu_sched[cpus[j][0]]
+            sched = self.map_cpu_sched[cpus[j][0]]
 
             # Affect it to the task.
             self.map_task_sched[task.identifier] = sched
@@ -114,7 +116,7 @@ class EDHS(Scheduler):
             # Update utilization.
             cpus[j][1] += Fraction(task.wcet) / Fraction(task.period)
 
-        for task, l in migrating_tasks.items():
+        for task, l in self.migrating_tasks.items():
             rem = Fraction(task.wcet) / Fraction(task.period)
             for cpu, cpu_u in cpus:
                 if cpu_u < 1 and rem > 0:
@@ -127,19 +129,19 @@ class EDHS(Scheduler):
         return True
 
     def schedule(self, cpu):
-        return map_cpu_sched[cpu].schedule(cpu)
+        return self.map_cpu_sched[cpu].schedule(cpu)
 
     def on_activate(self, job):
         try:
             self.map_task_sched[job.task.identifier].on_activate(job)
         except KeyError:
-            cpu, budget = migrating_tasks[job.task][0]
-            sched = map_cpu_sched[cpu]
+            cpu, budget = self.migrating_tasks[job.task][0]
+            sched = self.map_cpu_sched[cpu]
             sched.accept_migrating_job(0, job, budget)
 
     def on_terminated(self, job):
         try:
             self.map_task_sched[job.task.identifier].on_terminated(job)
         except KeyError:
-            sched = map_cpu_sched[job.task.cpu]
+            sched = self.map_cpu_sched[job.task.cpu]
             sched.on_terminated(job)
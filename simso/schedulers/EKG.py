@@ -82,8 +82,8 @@ class Group(object):
         self.sim = sim
 
     def compute_next_deadline(self):
-        return min([task.jobs[-1].absolute_deadline
-                    for task in self.tasks if task.jobs]) \
+        return min([task.last_job.absolute_deadline
+                    for task in self.tasks if task.last_job]) \
             * self.sim.cycles_per_ms
 
 @scheduler("simso.schedulers.EKG", 
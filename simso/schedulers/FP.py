@@ -21,6 +21,9 @@ class FP(Scheduler):
     def on_terminated(self, job):
         job.cpu.resched()
 
+    def steady_state_signature(self):
+        return self.ready_list
+
     def schedule(self, cpu):
         if self.ready_list:
             # Get a free processor or a processor running a low priority job.
@@ -24,6 +24,9 @@ class G_FL(Scheduler):
         else:
             job.cpu.resched()
 
+    def steady_state_signature(self):
+        return self.ready_list
+
     def schedule(self, cpu):
         ready_jobs = [j for j in self.ready_list if j.is_active()]
 
@@ -17,6 +17,9 @@ class RM(Scheduler):
         else:
             job.cpu.resched()
 
+    def steady_state_signature(self):
+        return self.ready_list
+
     def schedule(self, cpu):
         decision = None
         if self.ready_list:
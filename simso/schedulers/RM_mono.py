@@ -17,6 +17,9 @@ class RM_mono(Scheduler):
         self.ready_list.remove(job)
         job.cpu.resched()
 
+    def steady_state_signature(self):
+        return self.ready_list
+
     def schedule(self, cpu):
         if self.ready_list:
             # job with the highest priority
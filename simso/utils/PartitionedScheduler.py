@@ -221,3 +221,11 @@ class PartitionedScheduler(Scheduler):
 
     def on_terminated(self, job):
         self.map_task_sched[job.task.identifier].on_terminated(job)
+
+    def steady_state_signature(self):
+        signatures = tuple(
+            self.map_cpu_sched[cpu.identifier].steady_state_signature()
+            for cpu in self.processors)
+        if None in signatures:
+            return None
+        return signatures
@@ -0,0 +1,90 @@
+# coding=utf-8
+
+"""
+Helpers shared by the tests: small random configurations and a textual
+fingerprint of a simulation, so that two runs can be compared.
+"""
+
+import contextlib
+import io
+import random
+
+from simso.configuration import Configuration
+from simso.core import Model
+
+
+def configuration(scheduler, n_proc=2, etm='wcet', seed=1, duration=200,
+                  load=0.75, abort_on_miss=True, overhead=0):
+    """
+    Return a configuration of 3 * `n_proc` + 1 periodic tasks of total
+    utilization `load` * `n_proc`, drawn from `seed`, scheduled by
+    `simso.schedulers.<scheduler>` during `duration` ms.
+    """
+    rnd = random.Random(seed)
+    conf = Configuration()
+    conf.etm = etm
+    conf.duration = duration * conf.cycles_per_ms
+    n_tasks = 3 * n_proc + 1
+    for i in range(n_tasks):
+        period = rnd.choice([5, 8, 10, 20, 25, 40])
+        wcet = max(0.1, round(
+            load * n_proc / n_tasks * period * rnd.uniform(0.6, 1.4), 3))
+        conf.add_task(name="T{}".format(i), identifier=i + 1, period=period,
+                      activation_date=rnd.choice([0, 0, 1]), wcet=wcet,
+                      acet=wcet * 0.7, et_stddev=wcet * 0.1,
+                      deadline=period if i % 3 else period * 0.8,
+                      abort_on_miss=abort_on_miss,
+                      data={'priority': n_tasks - i})
+    for i in range(n_proc):
+        conf.add_processor(name="CPU {}".format(i), identifier=i + 1,
+                           cs_overhead=overhead, cl_overhead=overhead)
+    conf.scheduler_info.clas = "simso.schedulers." + scheduler
+    conf.scheduler_info.overhead = overhead
+    conf.check_all()
+    return conf
+
+
+def run(model, **kwargs):
+    """
+    Run `model`, some schedulers printing their decisions, and return it.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        model.run_model(**kwargs)
+    return model
+
+
+def simulate(model, until):
+    """
+    Simulate `model` until the date `until` (in cycles) and return it.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        model.simulate(until)
+    return model
+
+
+def run_configuration(conf, **kwargs):
+    """
+    Build the model of `conf` with the arguments `kwargs` and run it.
+    """
+    return run(Model(conf, **kwargs))
+
+
+def fingerprint(model):
+    """
+    Textual description of a simulation: its logs, the jobs of the tasks,
+    the summary of its results and the load of the processors.
+    """
+    lines = ["{} {} {}".format(date, msg, kernel)
+             for date, (msg, kernel) in model.logs]
+    results = model.results
+    if results is not None:
+        for task in model.task_list:
+            for job in results.tasks[task].jobs:
+                lines.append("{} {} {} {} {} {} {}".format(
+                    job.name, job.activation_date, job.end_date,
+                    job.computation_time, job.preemption_count,
+                    job.migration_count, job.aborted))
+        lines.append(repr(sorted(results.summary().to_dict().items())))
+        lines.extend("{} {!r} {!r}".format(proc.name, load, overhead)
+                     for proc, load, overhead in results.calc_load())
+    return "\n".join(lines)
@@ -0,0 +1,139 @@
+# coding=utf-8
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from simso.batch import simulate
+from simso.cache import ResultCache, configuration_hash
+
+from .support import configuration, run_configuration
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = ResultCache(os.path.join(self.directory, 'cache'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def summary(self, scheduler="RM"):
+        return run_configuration(configuration(scheduler)).results.summary()
+
+    def test_put_get(self):
+        key = self.cache.key(configuration("RM"))
+        self.assertNotIn(key, self.cache)
+        self.assertIsNone(self.cache.get(key))
+        summary = self.summary()
+        self.cache.put(key, summary)
+        self.assertIn(key, self.cache)
+        self.assertEqual(self.cache.get(key).to_dict(), summary.to_dict())
+
+    def test_simulate(self):
+        conf = configuration("G_FL", 3)
+        summary = simulate(conf, cache=self.cache)
+        key = self.cache.key(conf)
+        self.assertEqual(self.cache.get(key).to_dict(), summary.to_dict())
+        # The second run reads the stored result.
+        self.cache.put(key, self.summary("EDF_mono"))
+        self.assertEqual(simulate(conf, cache=self.cache).to_dict(),
+                         self.summary("EDF_mono").to_dict())
+
+    def test_evict(self):
+        summary = self.summary()
+        self.cache.put('00', summary)
+        entry_size = self.cache.size
+        self.cache.max_size = 5 * entry_size
+        for i in range(1, 20):
+            key = '{:02d}'.format(i)
+            self.cache.put(key, summary)
+            # Each result is used at a different date.
+            os.utime(self.cache._path(key), (i, i))
+            self.assertLessEqual(self.cache.size, self.cache.max_size)
+        self.assertIn('19', self.cache)
+        self.assertNotIn('01', self.cache)
+
+    def test_evict_least_recently_used(self):
+        summary = self.summary()
+        for i, key in enumerate(['aa', 'bb', 'cc']):
+            self.cache.put(key, summary)
+            os.utime(self.cache._path(key), (i + 1, i + 1))
+        self.cache.max_size = self.cache.size
+        # Reading 'aa' makes 'bb' the least recently used result.
+        self.cache.get('aa')
+        self.cache.put('dd', summary)
+        self.assertIn('aa', self.cache)
+        self.assertNotIn('bb', self.cache)
+        self.assertIn('dd', self.cache)
+
+    def test_clear(self):
+        self.cache.put('aa', self.summary())
+        self.cache.clear()
+        self.assertEqual(self.cache.size, 0)
+        self.assertNotIn('aa', self.cache)
+
+
+class KeyTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_same_configuration(self):
+        self.assertEqual(configuration_hash(configuration("RM")),
+                         configuration_hash(configuration("RM")))
+
+    def test_changes(self):
+        key = configuration_hash(configuration("RM"))
+        self.assertNotEqual(configuration_hash(configuration("RM"), seed=1),
+                            key)
+        self.assertNotEqual(configuration_hash(configuration("EDF")), key)
+        self.assertNotEqual(configuration_hash(configuration("RM", seed=2)),
+                            key)
+        conf = configuration("RM")
+        conf.task_info_list[0].wcet += 0.001
+        self.assertNotEqual(configuration_hash(conf), key)
+        conf = configuration("RM")
+        conf.etm = 'acet'
+        self.assertNotEqual(configuration_hash(conf), key)
+        conf = configuration("RM")
+        conf.seed = 1
+        self.assertNotEqual(configuration_hash(conf), key)
+
+    def test_trace_content(self):
+        filename = os.path.join(self.directory, 'T0.npy')
+        numpy.save(filename, numpy.array([1.0, 2.0, 3.0]))
+        conf = configuration("RM")
+        conf.etm = 'trace'
+        for task in conf.task_info_list:
+            task.et_distribution = {'name': 'trace', 'filename': filename}
+        conf.check_all()
+        key = configuration_hash(conf)
+
+        # Same file, same content.
+        numpy.save(filename, numpy.array([1.0, 2.0, 3.0]))
+        self.assertEqual(configuration_hash(conf), key)
+        # Same file, same size, other content.
+        numpy.save(filename, numpy.array([1.0, 2.0, 4.0]))
+        self.assertNotEqual(configuration_hash(conf), key)
+
+    def test_scheduler_source(self):
+        filename = os.path.join(self.directory, 'Sched.py')
+        with open(filename, 'w') as f:
+            f.write("# version 1\n")
+        conf = configuration("RM")
+        conf.scheduler_info.clas = ''
+        conf.scheduler_info.filename = filename
+        key = configuration_hash(conf)
+        with open(filename, 'w') as f:
+            f.write("# version 2\n")
+        self.assertNotEqual(configuration_hash(conf), key)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# coding=utf-8
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from simso.core import Model
+
+from .support import (configuration, fingerprint, run, run_configuration,
+                      simulate)
+
+SCHEDULERS = [("RM", 2), ("EDF_mono", 1), ("G_FL", 3), ("P_EDF", 2),
+              ("PD2", 2)]
+
+
+class CheckpointTest(unittest.TestCase):
+    """
+    A simulation restored from a checkpoint must end as if it had not been
+    interrupted.
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'checkpoint.pkl')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def reference(self, conf, seed):
+        random.seed(seed)
+        return fingerprint(run_configuration(conf, kernel='native'))
+
+    def test_restore(self):
+        for scheduler, n_proc in SCHEDULERS:
+            with self.subTest(scheduler=scheduler):
+                conf = configuration(scheduler, n_proc)
+                random.seed(1)
+                model = simulate(Model(conf, kernel='native'),
+                                 int(conf.duration * 0.37))
+                model.checkpoint(self.path)
+                model = Model.restore(self.path)
+                self.assertEqual(fingerprint(run(model)),
+                                 self.reference(conf, 1))
+
+    def test_random_state(self):
+        # Unseeded random execution times: the state of the `random`
+        # module is saved with the model.
+        conf = configuration("G_FL", 3, etm='acet', abort_on_miss=False)
+        random.seed(2)
+        model = simulate(Model(conf, kernel='native'),
+                         int(conf.duration * 0.5))
+        model.checkpoint(self.path)
+        random.seed(12345)
+        model = Model.restore(self.path)
+        self.assertEqual(fingerprint(run(model)), self.reference(conf, 2))
+
+    def test_periodic_checkpoints(self):
+        conf = configuration("RM", 2, etm='acet', abort_on_miss=False)
+        conf.seed = 3
+        model = run(Model(conf, kernel='native'), checkpoint=self.path,
+                    checkpoint_interval=50)
+        self.assertEqual(fingerprint(model), self.reference(conf, 3))
+        # The last checkpoint is taken at the end of the simulation.
+        model = Model.restore(self.path)
+        self.assertEqual(model.now(), conf.duration)
+
+    def test_extend(self):
+        conf = configuration("EDF_mono", 1, duration=100)
+        run(Model(conf, kernel='native'), checkpoint=self.path)
+        conf.duration = 200 * conf.cycles_per_ms
+        model = run(Model.restore(self.path, duration=conf.duration))
+        self.assertEqual(fingerprint(model), self.reference(conf, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# coding=utf-8
+
+import pickle
+import unittest
+
+from simso.core import Model
+
+from .support import (configuration, fingerprint, run, run_configuration,
+                      simulate)
+
+SCHEDULERS = [("RM", 2), ("EDF_mono", 1), ("G_FL", 3), ("P_EDF", 2),
+              ("PD2", 2)]
+
+
+class ForkTest(unittest.TestCase):
+    """
+    Each branch of a forked simulation must end as if the simulation had
+    not been forked, whatever the order in which the branches are run.
+    """
+    def test_branches(self):
+        for scheduler, n_proc in SCHEDULERS:
+            with self.subTest(scheduler=scheduler):
+                conf = configuration(scheduler, n_proc)
+                reference = fingerprint(
+                    run_configuration(conf, kernel='native'))
+                model = simulate(Model(conf, kernel='native'),
+                                 int(conf.duration * 0.37))
+                branch = model.fork()
+                # The events recorded by a branch must not appear in the
+                # traces shared with the other one.
+                self.assertEqual(fingerprint(run(branch)), reference)
+                self.assertEqual(fingerprint(run(model)), reference)
+
+    def test_seeded_execution_times(self):
+        conf = configuration("G_FL", 3, etm='acet', abort_on_miss=False)
+        conf.seed = 5
+        reference = fingerprint(run_configuration(conf, kernel='native'))
+        model = simulate(Model(conf, kernel='native'),
+                         int(conf.duration * 0.5))
+        branches = [model.fork(), model.fork()]
+        self.assertEqual(fingerprint(run(model)), reference)
+        for branch in branches:
+            self.assertEqual(fingerprint(run(branch)), reference)
+
+    def test_nested_forks(self):
+        conf = configuration("RM", 2)
+        reference = fingerprint(run_configuration(conf, kernel='native'))
+        model = simulate(Model(conf, kernel='native'),
+                         int(conf.duration * 0.25))
+        branch = simulate(model.fork(), int(conf.duration * 0.5))
+        sub_branch = branch.fork()
+        for m in (sub_branch, model, branch):
+            self.assertEqual(fingerprint(run(m)), reference)
+
+    def test_pickle(self):
+        conf = configuration("P_EDF", 2)
+        reference = fingerprint(run_configuration(conf, kernel='native'))
+        model = simulate(Model(conf, kernel='native'),
+                         int(conf.duration * 0.37))
+        branch = pickle.loads(pickle.dumps(model.fork()))
+        self.assertEqual(fingerprint(run(branch)), reference)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+# coding=utf-8
+
+import unittest
+
+from .support import configuration, fingerprint, run_configuration
+
+SCHEDULERS = [("RM", 2), ("EDF_mono", 1), ("G_FL", 3), ("P_EDF", 2),
+              ("LLF", 2), ("PD2", 2), ("EDZL", 2)]
+
+
+class KernelTest(unittest.TestCase):
+    """
+    The native kernel must run the simulations exactly as SimPy does.
+    """
+    def check(self, scheduler, n_proc, **kwargs):
+        conf = configuration(scheduler, n_proc, **kwargs)
+        self.assertEqual(
+            fingerprint(run_configuration(conf, kernel='native')),
+            fingerprint(run_configuration(conf, kernel='simpy')))
+
+    def test_schedulers(self):
+        for scheduler, n_proc in SCHEDULERS:
+            with self.subTest(scheduler=scheduler):
+                self.check(scheduler, n_proc)
+
+    def test_overheads(self):
+        for scheduler, n_proc in SCHEDULERS:
+            with self.subTest(scheduler=scheduler):
+                self.check(scheduler, n_proc, seed=2, overhead=5000)
+
+    def test_random_execution_times(self):
+        for scheduler, n_proc in SCHEDULERS:
+            with self.subTest(scheduler=scheduler):
+                conf = configuration(scheduler, n_proc, etm='acet', seed=3,
+                                     abort_on_miss=False)
+                conf.seed = 42
+                self.assertEqual(
+                    fingerprint(run_configuration(conf, kernel='native')),
+                    fingerprint(run_configuration(conf, kernel='simpy')))
+
+    def test_unknown_kernel(self):
+        conf = configuration("RM")
+        with self.assertRaises(KeyError):
+            run_configuration(conf, kernel='unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+# coding=utf-8
+
+import unittest
+
+import numpy
+
+from simso.core.etm.Sampler import (
+    BLOCK_SIZE, EmpiricalSampler, NormalSampler, samplers)
+
+from .support import configuration, run_configuration
+
+DISTRIBUTIONS = [
+    ('normal', {'mean': 2.0, 'stddev': 1.0}),
+    ('truncnorm', {'mean': 2.0, 'stddev': 1.0}),
+    ('uniform', {}),
+    ('weibull', {'shape': 1.5, 'scale': 2.0}),
+    ('empirical', {'counts': [1, 3, 2], 'edges': [1.0, 2.0, 3.0, 4.0]})]
+
+
+def draw(name, params, seed, count, low=0.5, high=3.5):
+    sampler = samplers[name](numpy.random.default_rng(seed), low, high,
+                             **params)
+    return numpy.array([sampler.next() for _ in range(count)])
+
+
+def execution_times(model):
+    """
+    Computation times of the ended jobs of each task of `model`.
+    """
+    return dict((task.name, [job.computation_time
+                             for job in model.results.tasks[task].jobs
+                             if job.end_date is not None])
+                for task in model.task_list)
+
+
+class SamplerTest(unittest.TestCase):
+    def test_bounds(self):
+        for name, params in DISTRIBUTIONS:
+            with self.subTest(distribution=name):
+                values = draw(name, params, 1, 2 * BLOCK_SIZE + 10)
+                self.assertGreaterEqual(values.min(), 0.5)
+                self.assertLessEqual(values.max(), 3.5)
+
+    def test_reproducible(self):
+        for name, params in DISTRIBUTIONS:
+            with self.subTest(distribution=name):
+                values = draw(name, params, 1, 1000)
+                numpy.testing.assert_array_equal(
+                    values, draw(name, params, 1, 1000))
+                self.assertFalse(numpy.array_equal(
+                    values, draw(name, params, 2, 1000)))
+
+    def test_block_size(self):
+        # The values do not depend on the number of values drawn at once.
+        values = draw('normal', {'mean': 2.0, 'stddev': 1.0}, 3, 100)
+        sampler = NormalSampler(numpy.random.default_rng(3), 0.5, 3.5,
+                                2.0, 1.0, block_size=10)
+        numpy.testing.assert_array_equal(
+            values, [sampler.next() for _ in range(100)])
+
+    def test_truncated_normal(self):
+        # The values out of the bounds are drawn again, not clipped.
+        values = draw('truncnorm', {'mean': 3.0, 'stddev': 1.0}, 4, 10000)
+        self.assertLess(numpy.mean(values == 3.5), 0.001)
+        clipped = draw('normal', {'mean': 3.0, 'stddev': 1.0}, 4, 10000)
+        self.assertGreater(numpy.mean(clipped == 3.5), 0.2)
+
+    def test_uniform(self):
+        values = draw('uniform', {}, 5, 10000, low=1.0, high=3.0)
+        self.assertAlmostEqual(values.mean(), 2.0, delta=0.05)
+
+    def test_weibull(self):
+        values = draw('weibull', {'shape': 2.0, 'scale': 1.0, 'loc': 1.0},
+                      6, 10000, low=0, high=100)
+        # Mean of 1 + W(2, 1): 1 + Gamma(1.5).
+        self.assertAlmostEqual(values.mean(), 1.886, delta=0.02)
+        self.assertGreaterEqual(values.min(), 1.0)
+
+    def test_empirical(self):
+        values = draw('empirical',
+                      {'counts': [1, 3, 0, 4], 'edges': [1, 2, 3, 4, 5]},
+                      7, 10000, low=0, high=10)
+        counts, _ = numpy.histogram(values, [1, 2, 3, 4, 5])
+        numpy.testing.assert_allclose(counts / 10000.0,
+                                      [0.125, 0.375, 0, 0.5], atol=0.02)
+        with self.assertRaises(AssertionError):
+            EmpiricalSampler(None, 0, 1, [1, 2], [0, 1])
+
+
+class TaskStreamTest(unittest.TestCase):
+    """
+    With a seed in the configuration, each task draws its execution times
+    from its own stream.
+    """
+    def configuration(self, seed, distribution=None):
+        conf = configuration("G_FL", 2, etm='acet', load=0.4,
+                             abort_on_miss=False)
+        conf.seed = seed
+        for task in conf.task_info_list:
+            task.et_distribution = distribution
+        return conf
+
+    def test_reproducible(self):
+        for name, params in DISTRIBUTIONS:
+            with self.subTest(distribution=name):
+                distribution = dict(params, name=name)
+                times = execution_times(run_configuration(
+                    self.configuration(1, distribution)))
+                self.assertEqual(times, execution_times(run_configuration(
+                    self.configuration(1, distribution))))
+                self.assertNotEqual(times, execution_times(run_configuration(
+                    self.configuration(2, distribution))))
+
+    def test_independent_tasks(self):
+        # Adding a task or a processor does not change the execution times
+        # of the other tasks.
+        times = execution_times(run_configuration(self.configuration(3)))
+        conf = self.configuration(3)
+        conf.add_task(name="Extra", identifier=100, period=7, wcet=2,
+                      acet=1.5, et_stddev=0.3, deadline=7)
+        conf.add_processor(name="Extra", identifier=100)
+        other = execution_times(run_configuration(conf))
+        for name, values in times.items():
+            with self.subTest(task=name):
+                # The schedule changes: a job may end in one simulation
+                # only.
+                count = min(len(values), len(other[name]))
+                self.assertGreater(count, 0)
+                self.assertEqual(other[name][:count], values[:count])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# coding=utf-8
+
+import unittest
+import warnings
+
+from simso.configuration import Configuration
+
+from .support import run_configuration
+
+# Hyperperiod: 120 ms.
+TASKS = [(2, 10), (3, 15), (5, 20), (4, 30), (6, 40)]
+
+
+def configuration(scheduler, n_proc, duration=600):
+    conf = Configuration()
+    conf.duration = duration * conf.cycles_per_ms
+    scale = n_proc * 1.2
+    for i, (wcet, period) in enumerate(TASKS):
+        conf.add_task(name="T{}".format(i), identifier=i + 1, period=period,
+                      activation_date=0, wcet=wcet * scale, deadline=period,
+                      abort_on_miss=True)
+    for i in range(n_proc):
+        conf.add_processor(name="CPU {}".format(i), identifier=i + 1)
+    conf.scheduler_info.clas = "simso.schedulers." + scheduler
+    conf.check_all()
+    return conf
+
+
+def metrics(model):
+    results = model.results
+    return (results.summary().to_dict(),
+            (results.total_migrations, results.total_preemptions,
+             results.total_task_migrations, results.total_task_resumptions,
+             results.total_exceeded_count, results.total_timers),
+            [(proc.identifier, load, overhead)
+             for proc, load, overhead in results.calc_load()])
+
+
+class SteadyStateTest(unittest.TestCase):
+    """
+    The results extrapolated once the schedule repeats must be those of the
+    whole simulation.
+    """
+    def check(self, scheduler, n_proc, detected):
+        conf = configuration(scheduler, n_proc)
+        reference = metrics(run_configuration(conf))
+        for streaming in (False, True):
+            with self.subTest(scheduler=scheduler, streaming=streaming):
+                model = run_configuration(conf, steady_state=True,
+                                          streaming=streaming)
+                self.assertEqual(model.results.steady_state is not None,
+                                 detected)
+                if detected:
+                    self.assertLess(model.now(), conf.duration)
+                self.assertEqual(metrics(model), reference)
+
+    def test_stateless_schedulers(self):
+        for scheduler, n_proc in [("RM", 2), ("EDF_mono", 1), ("G_FL", 2),
+                                  ("P_RM", 2)]:
+            self.check(scheduler, n_proc, True)
+
+    def test_stateful_scheduler(self):
+        # PD2 does not describe its state: the whole duration is simulated.
+        self.check("PD2", 2, False)
+
+    def test_partial_results(self):
+        model = run_configuration(configuration("RM", 2),
+                                  steady_state=True)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            model.results.tasks
+        self.assertTrue(any(issubclass(warning.category, RuntimeWarning)
+                            for warning in caught))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# coding=utf-8
+
+import unittest
+
+from .support import configuration, fingerprint, run_configuration
+
+SCHEDULERS = [("RM", 2), ("EDF_mono", 1), ("G_FL", 3), ("P_EDF", 2),
+              ("PD2", 2)]
+# P_EDF cannot partition an overloaded task set.
+OVERLOADED_SCHEDULERS = [("RM", 2), ("EDF_mono", 1), ("G_FL", 3),
+                         ("P_RM", 2), ("PD2", 2)]
+
+
+def misses(model):
+    """
+    Names of the jobs of `model` that missed their deadline, by end date.
+    """
+    result = {}
+    for task in model.task_list:
+        for job in task.jobs:
+            if job.end_date is not None and job.exceeded_deadline:
+                result.setdefault(job.end_date, set()).add(job.name)
+    return result
+
+
+class StopOnMissTest(unittest.TestCase):
+    def test_schedulable(self):
+        # Without miss, the simulation and its results are unchanged.
+        for scheduler, n_proc in SCHEDULERS:
+            with self.subTest(scheduler=scheduler):
+                conf = configuration(scheduler, n_proc, load=0.4)
+                model = run_configuration(conf, stop_on_miss=True)
+                self.assertIsNone(model.deadline_miss)
+                self.assertEqual(fingerprint(model),
+                                 fingerprint(run_configuration(conf)))
+
+    def check_first_miss(self, conf):
+        full = misses(run_configuration(conf))
+        model = run_configuration(conf, stop_on_miss=True)
+        miss = model.deadline_miss
+        self.assertIsNotNone(miss)
+        self.assertIsNone(model.results)
+
+        date = min(full)
+        self.assertEqual(miss.date, date)
+        self.assertEqual(model.now(), date)
+        self.assertIn(miss.job.name, full[date])
+        self.assertTrue(miss.job.exceeded_deadline)
+        self.assertEqual(miss.date_ms, date / conf.cycles_per_ms)
+
+    def test_first_miss(self):
+        for scheduler, n_proc in OVERLOADED_SCHEDULERS:
+            with self.subTest(scheduler=scheduler):
+                self.check_first_miss(
+                    configuration(scheduler, n_proc, load=1.2))
+
+    def test_first_late_job(self):
+        # Without abort, the miss is detected when the late job ends.
+        for scheduler, n_proc in OVERLOADED_SCHEDULERS:
+            with self.subTest(scheduler=scheduler):
+                conf = configuration(scheduler, n_proc, load=1.2,
+                                     abort_on_miss=False)
+                self.check_first_miss(conf)
+                self.assertFalse(run_configuration(
+                    conf, stop_on_miss=True).deadline_miss.job.aborted)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# coding=utf-8
+
+import unittest
+
+from simso.configuration import Configuration
+
+from .support import configuration, run_configuration
+
+SCHEDULERS = [("RM", 2), ("EDF_mono", 1), ("G_FL", 3), ("P_EDF", 2),
+              ("PD2", 2)]
+
+
+def metrics(model):
+    results = model.results
+    return (results.summary().to_dict(),
+            (results.total_migrations, results.total_preemptions,
+             results.total_task_migrations, results.total_task_resumptions,
+             results.total_exceeded_count, results.total_timers),
+            [(proc.identifier, load, overhead)
+             for proc, load, overhead in results.calc_load()])
+
+
+def mixed_criticality_configuration(seed):
+    conf = Configuration()
+    conf.duration = 1000 * conf.cycles_per_ms
+    conf.etm = 'mc_acet'
+    conf.seed = seed
+    for i, (period, wcet, level) in enumerate(
+            [(10, 2, 'HI'), (15, 3, 'LO'), (20, 4, 'HI'), (30, 5, 'LO')]):
+        # Some jobs exceed their WCET so that the mode switches.
+        conf.add_task(name="T{}".format(i), identifier=i + 1,
+                      task_type='MCPeriodic', period=period, wcet=wcet,
+                      acet=wcet, et_stddev=wcet * 0.8, deadline=period,
+                      criticality_level=level,
+                      et_distribution={'name': 'normal', 'high': wcet * 1.5})
+    conf.add_processor(name="CPU 1", identifier=1)
+    conf.scheduler_info.clas = "simso.schedulers.EDF_VD_mono"
+    return conf
+
+
+class StreamingTest(unittest.TestCase):
+    """
+    The metrics computed while the simulation runs must be those computed
+    on the stored traces.
+    """
+    def check(self, conf, **kwargs):
+        self.assertEqual(
+            metrics(run_configuration(conf, streaming=True, **kwargs)),
+            metrics(run_configuration(conf)))
+
+    def test_schedulers(self):
+        for scheduler, n_proc in SCHEDULERS:
+            with self.subTest(scheduler=scheduler):
+                self.check(configuration(scheduler, n_proc))
+
+    def test_overheads_and_random_execution_times(self):
+        for scheduler, n_proc in SCHEDULERS:
+            with self.subTest(scheduler=scheduler):
+                conf = configuration(scheduler, n_proc, etm='acet', seed=3,
+                                     abort_on_miss=False, overhead=1000)
+                conf.seed = 7
+                self.check(conf)
+
+    def test_job_history(self):
+        conf = configuration("G_FL", 3)
+        model = run_configuration(conf, streaming=True, job_history=2)
+        self.assertEqual(metrics(model), metrics(run_configuration(conf)))
+        for task in model.task_list:
+            # The two last ended jobs and the current one.
+            self.assertLessEqual(len(list(task.jobs)), 2 + 1)
+
+    def test_job_history_requires_streaming(self):
+        with self.assertRaises(ValueError):
+            run_configuration(configuration("RM"), job_history=2)
+
+    def test_dropped_jobs(self):
+        for seed in (1, 2, 3):
+            with self.subTest(seed=seed):
+                conf = mixed_criticality_configuration(seed)
+                offline = run_configuration(conf).results
+                streamed = run_configuration(conf, streaming=True).results
+                self.assertTrue(offline.scheduler.mc_dropped_job_count)
+                self.assertEqual(streamed.summary().to_dict(),
+                                 offline.summary().to_dict())
+                # The streamed results count the dropped jobs instead of
+                # keeping them.
+                self.assertEqual(
+                    streamed.scheduler.mc_dropped_job_count,
+                    dict((name, len(jobs)) for name, jobs in
+                         offline.scheduler.mc_dropped_job_count.items()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+# coding=utf-8
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from simso.configuration import Configuration
+from simso.core.etm.Sampler import TraceSampler, map_trace
+
+from .support import configuration, run_configuration
+
+
+class TraceSamplerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'T0.npy')
+        numpy.save(self.filename, numpy.arange(1.0, 6.0))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def sampler(self, **kwargs):
+        return TraceSampler(numpy.random.default_rng(1), 0, 100,
+                            self.filename, block_size=3, **kwargs)
+
+    def test_loop(self):
+        sampler = self.sampler(scale=2.0)
+        self.assertEqual([sampler.next() for _ in range(12)],
+                         [2, 4, 6, 8, 10, 2, 4, 6, 8, 10, 2, 4])
+
+    def test_sample(self):
+        values = [self.sampler(sample=True).next() for _ in range(3)]
+        self.assertEqual(values, [self.sampler(sample=True).next()
+                                  for _ in range(3)])
+        sampler = self.sampler(sample=True)
+        values = set(sampler.next() for _ in range(100))
+        self.assertEqual(values, {1.0, 2.0, 3.0, 4.0, 5.0})
+
+    def test_raw_file(self):
+        filename = os.path.join(self.directory, 'T0.bin')
+        numpy.arange(1, 4, dtype='int32').tofile(filename)
+        sampler = TraceSampler(None, 0, 100, filename, dtype='int32')
+        self.assertEqual([sampler.next() for _ in range(4)], [1, 2, 3, 1])
+
+    def test_pickle(self):
+        sampler = self.sampler()
+        sampler.next()
+        copy = pickle.loads(pickle.dumps(sampler))
+        self.assertIsNone(copy._data)
+        self.assertEqual([copy.next() for _ in range(5)],
+                         [sampler.next() for _ in range(5)])
+
+    def test_modified_file(self):
+        self.assertEqual(list(map_trace(self.filename)), [1, 2, 3, 4, 5])
+        numpy.save(self.filename, numpy.arange(1.0, 8.0))
+        self.assertEqual(list(map_trace(self.filename)),
+                         [1, 2, 3, 4, 5, 6, 7])
+
+
+class TraceDrivenTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def configuration(self):
+        conf = configuration("EDF_mono", 1, load=0.4, abort_on_miss=False)
+        conf.etm = 'trace'
+        for task in conf.task_info_list:
+            filename = os.path.join(self.directory,
+                                    '{}.npy'.format(task.name))
+            numpy.save(filename, [task.wcet * 0.5, task.wcet * 1.5])
+            task.et_distribution = {'name': 'trace', 'filename': filename}
+        conf.check_all()
+        return conf
+
+    def test_execution_times(self):
+        model = run_configuration(self.configuration())
+        for task in model.task_list:
+            jobs = [job for job in model.results.tasks[task].jobs
+                    if job.end_date is not None]
+            self.assertTrue(jobs)
+            # The samples are not bounded by the WCET.
+            for i, job in enumerate(jobs):
+                self.assertAlmostEqual(
+                    job.computation_time / model.cycles_per_ms,
+                    task.wcet * (0.5, 1.5)[i % 2], places=5)
+
+    def test_missing_trace(self):
+        conf = self.configuration()
+        conf.task_info_list[0].et_distribution = None
+        with self.assertRaises(ValueError):
+            run_configuration(conf)
+
+
+class DistributionConfigurationTest(unittest.TestCase):
+    """
+    The execution time distributions of the tasks are saved in, and read
+    from, the XML files, and checked by `check_all`.
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.trace = os.path.join(self.directory, 'traces', 'T0.npy')
+        os.mkdir(os.path.dirname(self.trace))
+        numpy.save(self.trace, numpy.arange(1.0, 3.0, 0.1))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def configuration(self):
+        conf = configuration("EDF_mono", 1, etm='acet', load=0.5,
+                             abort_on_miss=False)
+        conf.seed = 1
+        distributions = [
+            {'name': 'trace', 'filename': self.trace, 'sample': True},
+            {'name': 'weibull', 'shape': numpy.float64(1.5)},
+            {'name': 'empirical', 'counts': numpy.array([1, 2]),
+             'edges': numpy.array([0.5, 1.0, 1.5])},
+            {'name': 'truncnorm', 'low': 0.5}]
+        for task, distribution in zip(conf.task_info_list, distributions):
+            task.et_distribution = distribution
+        return conf
+
+    def test_round_trip(self):
+        conf = self.configuration()
+        conf.check_all()
+        filename = os.path.join(self.directory, 'conf', 'simulation.xml')
+        os.mkdir(os.path.dirname(filename))
+        conf.save(filename)
+        with open(filename) as f:
+            # The trace is relative to the simulation file.
+            self.assertIn('../traces/T0.npy', f.read())
+
+        loaded = Configuration(filename)
+        loaded.check_all()
+        for task, loaded_task in zip(conf.task_info_list,
+                                     loaded.task_info_list):
+            self.assertEqual(loaded_task.et_distribution is None,
+                             task.et_distribution is None)
+        self.assertEqual(
+            os.path.abspath(
+                loaded.task_info_list[0].et_distribution['filename']),
+            self.trace)
+        self.assertEqual(loaded.task_info_list[2].et_distribution,
+                         {'name': 'empirical', 'counts': [1, 2],
+                          'edges': [0.5, 1.0, 1.5]})
+        self.assertEqual(
+            run_configuration(loaded).results.summary().to_dict(),
+            run_configuration(conf).results.summary().to_dict())
+
+    def check_invalid(self, distribution, etm='acet'):
+        conf = self.configuration()
+        conf.etm = etm
+        conf.task_info_list[1].et_distribution = distribution
+        with self.assertRaises(AssertionError):
+            conf.check_all()
+
+    def test_invalid(self):
+        self.check_invalid({'name': 'gamma'})
+        self.check_invalid({'name': 'normal', 'sigma': 1.0})
+        self.check_invalid({'name': 'weibull'})
+        self.check_invalid({'name': 'empirical', 'counts': [1]})
+        self.check_invalid({'name': 'trace'})
+        self.check_invalid({'name': 'trace', 'filename': os.path.join(
+            self.directory, 'missing.npy')})
+        # Every task needs a trace with the trace-driven model.
+        self.check_invalid({'name': 'normal'}, etm='trace')
+        self.check_invalid(None, etm='trace')
+
+
+if __name__ == '__main__':
+    unittest.main()